@@ -0,0 +1,149 @@
+import mmap
+import struct
+import sys
+from array import array
+from itertools import islice
+
+# Binary altitude map layout: a 16 bytes header followed by height * width little-endian int32 altitudes, by flat index (index = (X * width) + Y).
+#   magic   (4 bytes): b"DALT"
+#   version  (uint32): BINARY_VERSION
+#   height   (uint32): Grid's height.
+#   width    (uint32): Grid's width.
+BINARY_MAGIC = b"DALT"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sIII")
+
+
+def is_binary_altitude_file(path):
+    """
+    Checks if file at "path" is a binary altitude map.
+
+    Args:
+        path (str): Altitude map's path.
+
+    Returns:
+        bool: True if file starts with the binary altitude map magic. False otherwise.
+    """
+
+    with open(path, 'rb') as arquivo:
+        return arquivo.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def read_text_altitudes(path, height, width):
+    """
+    Reads a text altitude map (one altitude per line, by flat index).
+
+    Args:
+        path   (str): Altitude map's path.
+        height (int): Grid's height.
+        width  (int): Grid's width.
+
+    Returns:
+        array[int]: Altitude of every cell, by flat index.
+
+    Raises:
+        ValueError: If file has less altitudes than the Grid's cells.
+    """
+
+    with open(path, 'r') as arquivo:
+        altitudes = array('i', map(int, islice(arquivo, height * width)))
+
+    if len(altitudes) != (height * width):
+        raise ValueError(f"ERROR in read_text_altitudes. {path} has {len(altitudes)} altitudes, Grid needs {height * width}.")
+
+    return altitudes
+
+
+def load_binary_altitudes(path, height, width):
+    """
+    Maps a binary altitude map in memory. Nothing is parsed, pages are only read when their cells are accessed.
+    Mapping is copy-on-write, changing an altitude never changes the file.
+
+    Args:
+        path   (str): Altitude map's path.
+        height (int): Grid's height.
+        width  (int): Grid's width.
+
+    Returns:
+        memoryview: int32 view over the altitudes of every cell, by flat index.
+
+    Raises:
+        ValueError: If file is not a valid binary altitude map or its size is different from the Grid's.
+    """
+
+    with open(path, 'rb') as arquivo:
+        header = arquivo.read(BINARY_HEADER.size)
+        if len(header) != BINARY_HEADER.size:
+            raise ValueError(f"ERROR in load_binary_altitudes. {path} is not a binary altitude map.")
+
+        magic, version, file_height, file_width = BINARY_HEADER.unpack(header)
+        if (magic != BINARY_MAGIC) or (version != BINARY_VERSION):
+            raise ValueError(f"ERROR in load_binary_altitudes. {path} is not a binary altitude map.")
+        if (file_height != height) or (file_width != width):
+            raise ValueError(f"ERROR in load_binary_altitudes. {path} is {file_height}x{file_width}, Grid is {height}x{width}.")
+
+        altitudes_map = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    if len(altitudes_map) != BINARY_HEADER.size + (4 * height * width):
+        raise ValueError(f"ERROR in load_binary_altitudes. {path} is truncated.")
+
+    # Stored as little-endian, big-endian machines need a swapped copy
+    if sys.byteorder != "little":
+        altitudes = array('i', altitudes_map[BINARY_HEADER.size:])
+        altitudes.byteswap()
+        return memoryview(altitudes)
+
+    return memoryview(altitudes_map)[BINARY_HEADER.size:].cast('i')
+
+
+def write_binary_altitudes(path, height, width, altitudes):
+    """
+    Writes a binary altitude map.
+
+    Args:
+        path                (str): Altitude map's path.
+        height              (int): Grid's height.
+        width               (int): Grid's width.
+        altitudes (iterable[int]): Altitude of every cell, by flat index.
+
+    Raises:
+        ValueError: If "altitudes" has a different size than the Grid's cells.
+    """
+
+    altitudes = array('i', altitudes)
+    if len(altitudes) != (height * width):
+        raise ValueError(f"ERROR in write_binary_altitudes. Got {len(altitudes)} altitudes, Grid needs {height * width}.")
+
+    if sys.byteorder != "little":
+        altitudes.byteswap()
+
+    with open(path, 'wb') as arquivo:
+        arquivo.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, height, width))
+        altitudes.tofile(arquivo)
+
+
+def convert_text_to_binary(text_path, binary_path, height, width):
+    """
+    Converts a text altitude map to the binary format, so it can be memory-mapped by Grid.
+
+    Args:
+        text_path   (str): Text altitude map's path.
+        binary_path (str): Binary altitude map's path.
+        height      (int): Grid's height.
+        width       (int): Grid's width.
+    """
+
+    write_binary_altitudes(binary_path, height, width, read_text_altitudes(text_path, height, width))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Converts a text altitude map to the binary (memory-mappable) format.")
+    parser.add_argument("text_path")
+    parser.add_argument("binary_path")
+    parser.add_argument("height", type=int)
+    parser.add_argument("width", type=int)
+    args = parser.parse_args()
+
+    convert_text_to_binary(args.text_path, args.binary_path, args.height, args.width)
@@ -0,0 +1,228 @@
+from AltitudeMap import write_binary_altitudes
+from Fleet import Fleet
+from Instrumentation import summarize_timings
+import main as simulation
+
+from array import array
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+
+# Generated drones' (maximum_altitude, maximum_weight, maximum_velocity). The terrain is generated below their maximum altitude,
+# so altitude aware runs (see PathFinder.select_drone_class) have no no-fly cells
+DRONE = (2000.0, 20.0, 50.0)
+
+# (heuristic, heuristic_weight, tie_breaking, jump_points) configurations whose A* expansions are compared on the same routes
+SEARCH_MODES = (("manhattan", 1.0, "index", False), ("octile", 1.0, "index", False), ("octile", 1.0, "deepest", False), ("octile", 1.5, "deepest", False), ("octile", 1.0, "deepest", True))
+
+def generate_altitudes(height, width, rng, minimum=500, maximum=3000, cell_size=64):
+    """
+    Generates a smooth synthetic terrain: random altitudes on a coarse lattice, bilinearly interpolated between lattice points.
+
+    Args:
+        height            (int): Grid's height.
+        width             (int): Grid's width.
+        rng     (random.Random): Random number generator.
+        minimum           (int): Lowest altitude.
+        maximum           (int): Highest altitude.
+        cell_size         (int): Cells between lattice points.
+
+    Returns:
+        array[int]: Altitude of every cell, by flat index.
+    """
+
+    lattice_height = (height // cell_size) + 2
+    lattice_width = (width // cell_size) + 2
+    lattice = [[rng.randint(minimum, maximum) for _ in range(lattice_width)] for _ in range(lattice_height)]
+
+    # Horizontal weights are the same for every row, so they are computed once
+    columns = [(y // cell_size, (y % cell_size) / cell_size) for y in range(width)]
+
+    altitudes = array('i')
+    for x in range(height):
+        top = lattice[x // cell_size]
+        bottom = lattice[(x // cell_size) + 1]
+        weight_x = (x % cell_size) / cell_size
+        row = [(1 - weight_x) * top[i] + weight_x * bottom[i] for i in range(lattice_width)]
+        altitudes.extend([int(row[i] + (row[i + 1] - row[i]) * weight_y) for i, weight_y in columns])
+
+    return altitudes
+
+def generate_scenario(directory, height, width, clients, orders, drones, client_radius, seed):
+    """
+    Writes a synthetic scenario (binary altitude map, clients, orders and drones files) to "directory", which is created if needed.
+    Clients are placed within "client_radius" cells (Chebyshev) of base, at Grid's center, so drones can reach them. Every cell
+    is below the drones' maximum altitude, so they can fly anywhere.
+
+    Args:
+        directory     (str): Scenario's directory.
+        height        (int): Grid's height.
+        width         (int): Grid's width.
+        clients       (int): Number of clients.
+        orders        (int): Number of orders.
+        drones        (int): Number of drones.
+        client_radius (int): Maximum distance from base to a client, in cells.
+        seed          (int): Random seed.
+
+    Returns:
+        dict: Scenario's files paths and base coords.
+    """
+
+    rng = random.Random(seed)
+    base = (height // 2, width // 2)
+    paths = {name: os.path.join(directory, file_name) for name, file_name in (("altitude_path", "altitude.bin"), ("clients_path", "clients.txt"), ("orders_path", "orders.txt"), ("drones_path", "drones.txt"))}
+
+    os.makedirs(directory, exist_ok=True)
+    write_binary_altitudes(paths["altitude_path"], height, width, generate_altitudes(height, width, rng, maximum=int(DRONE[0])))
+
+    # Every cell around base but base itself
+    area = [(x, y) for x in range(max(0, base[0] - client_radius), min(height, base[0] + client_radius + 1))
+                   for y in range(max(0, base[1] - client_radius), min(width, base[1] + client_radius + 1)) if (x, y) != base]
+
+    names = [f"Client{i}" for i in range(clients)]
+    with open(paths["clients_path"], 'w') as arquivo:
+        arquivo.writelines(f"{name},{x} {y}\n" for name, (x, y) in zip(names, (rng.choice(area) for _ in names)))
+
+    with open(paths["orders_path"], 'w') as arquivo:
+        for _ in range(orders):
+            products = ",".join(f"Product{rng.randrange(1000)} {rng.uniform(1.0, 100.0):.2f} {rng.uniform(0.1, 5.0):.2f}" for _ in range(rng.randint(1, 3)))
+            arquivo.write(f"{rng.choice(names)},{products}\n")
+
+    with open(paths["drones_path"], 'w') as arquivo:
+        arquivo.writelines(f"{DRONE[0]} {DRONE[1]} {DRONE[2]}\n" for _ in range(drones))
+
+    paths["base"] = base
+    return paths
+
+def run_benchmark(height=256, width=256, clients=200, orders=1000, drones=10, queries=200, client_radius=2, seed=0, directory=None):
+    """
+    Generates a synthetic scenario and times the simulation's phases on it: build, a_star, calculate_battery_for_route and dispatch.
+
+    Args:
+        height        (int): Grid's height.
+        width         (int): Grid's width.
+        clients       (int): Number of clients.
+        orders        (int): Number of orders.
+        drones        (int): Number of drones.
+        queries       (int): Number of random (start, goal) pairs timed with a_star.
+        client_radius (int): Maximum distance from base to a client, in cells.
+        seed          (int): Random seed.
+        directory     (str): Where the scenario is written. A temporary directory, if None.
+
+    Returns:
+        dict: Benchmark's configuration, environment and results.
+    """
+
+    config = {"height": height, "width": width, "clients": clients, "orders": orders, "drones": drones, "queries": queries, "client_radius": client_radius, "seed": seed}
+    results = {}
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = directory or temporary_directory
+
+        start_time = time.perf_counter()
+        scenario = generate_scenario(directory, height, width, clients, orders, drones, client_radius, seed)
+        results["generate_seconds"] = time.perf_counter() - start_time
+
+        # build: Grid (memory-mapped altitudes, neighbor table) and every drone, client and order
+        start_time = time.perf_counter()
+        simulation.setup(height, width, scenario["altitude_path"], scenario["base"])
+        simulation.build(scenario["drones_path"], scenario["clients_path"], scenario["orders_path"])
+        results["build_seconds"] = time.perf_counter() - start_time
+
+        # a_star and calculate_battery_for_route, on random pairs of cells anywhere in Grid
+        rng = random.Random(seed + 1)
+        grid = simulation.grid
+        drone = simulation.drones[0]
+        pairs = [(grid.get_position_in_grid(rng.randrange(height), rng.randrange(width)), grid.get_position_in_grid(rng.randrange(height), rng.randrange(width))) for _ in range(queries)]
+
+        routes = []
+        timings = []
+        for start, goal in pairs:
+            start_time = time.perf_counter()
+            routes.append(simulation.a_star(start, goal, drone))
+            timings.append(time.perf_counter() - start_time)
+        results["a_star"] = summarize_timings(timings)
+        found = [len(route) for route in routes if route is not None]
+        results["a_star"]["mean_route_cells"] = statistics.fmean(found) if found else 0.0
+
+        timings = []
+        for route in routes:
+            if route is None:
+                continue
+            start_time = time.perf_counter()
+            simulation.calculate_battery_for_route(route, drone.current_weight, drone.velocity)
+            timings.append(time.perf_counter() - start_time)
+        results["calculate_battery_for_route"] = summarize_timings(timings)
+
+        # score_routes: every route found above, scored in a single call
+        batch = [[grid.get_position_index(position) for position in route] for route in routes if route is not None]
+        start_time = time.perf_counter()
+        simulation.cost_model.score_routes(batch, [drone.current_weight] * len(batch), [drone.velocity] * len(batch))
+        elapsed = time.perf_counter() - start_time
+        results["score_routes"] = {"routes": len(batch), "seconds": elapsed, "routes_per_second": (len(batch) / elapsed) if elapsed > 0 else 0.0}
+
+        # Search modes, searched directly (no cache) on the same pairs
+        results["search_modes"] = {}
+        path_finder = simulation.path_finder
+        velocity = drone.update_drone_velocity()
+        indexes = [(grid.get_position_index(start), grid.get_position_index(goal)) for start, goal in pairs]
+        for heuristic, heuristic_weight, tie_breaking, jump_points in SEARCH_MODES:
+            path_finder.configure(heuristic, heuristic_weight, tie_breaking, jump_points)
+            searches, expansions, heap_pushes = path_finder.searches, path_finder.total_expansions, path_finder.total_heap_pushes
+
+            timings = []
+            distance = 0
+            for start, goal in indexes:
+                start_time = time.perf_counter()
+                path = path_finder.search(start, goal, velocity)
+                timings.append(time.perf_counter() - start_time)
+                if path is not None:
+                    distance += simulation.cost_model.score_route(path)[0]
+
+            mode = summarize_timings(timings)
+            mode["mean_expansions"] = (path_finder.total_expansions - expansions) / max(1, path_finder.searches - searches)
+            mode["mean_heap_pushes"] = (path_finder.total_heap_pushes - heap_pushes) / max(1, path_finder.searches - searches)
+            mode["total_distance"] = distance
+            results["search_modes"][f"{heuristic}-{heuristic_weight}-{tie_breaking}" + ("-jump_points" if jump_points else "")] = mode
+        path_finder.configure()
+
+        # dispatch: the whole order queue, headless
+        simulation.fleet = Fleet(simulation.drones)
+        start_time = time.perf_counter()
+        simulation.dispatch()
+        results["dispatch_seconds"] = time.perf_counter() - start_time
+        results["dispatch_summary"] = simulation.summarize()
+
+    return {
+        "config": config,
+        "environment": {"python": platform.python_version(), "implementation": platform.python_implementation(), "machine": platform.machine()},
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks pathfinding and dispatch on a synthetic scenario.")
+    parser.add_argument("--height", type=int, default=256, help="Grid's height (up to 4096).")
+    parser.add_argument("--width", type=int, default=256, help="Grid's width (up to 4096).")
+    parser.add_argument("--clients", type=int, default=200, help="Number of clients.")
+    parser.add_argument("--orders", type=int, default=1000, help="Number of orders (up to 100000).")
+    parser.add_argument("--drones", type=int, default=10, help="Number of drones.")
+    parser.add_argument("--queries", type=int, default=200, help="Number of random routes timed with a_star and calculate_battery_for_route.")
+    parser.add_argument("--client-radius", type=int, default=2, help="Maximum distance from base to a client, in cells. Drones' battery only covers a few cells.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--scenario-dir", metavar="PATH", help="Keep the generated scenario in PATH instead of a temporary directory.")
+    parser.add_argument("--output", metavar="PATH", help="Write the results as JSON to PATH instead of stdout.")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.height, args.width, args.clients, args.orders, args.drones, args.queries, args.client_radius, args.seed, args.scenario_dir)
+
+    if args.output is not None:
+        with open(args.output, 'w') as arquivo:
+            json.dump(report, arquivo, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
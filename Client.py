@@ -10,6 +10,8 @@ class Client:
         products (list[Products]): Client's Product.
     """
 
+    __slots__ = ("name", "position", "products")
+
     def __init__(self, name, position):
         """
         Initiates a new Client instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
@@ -84,7 +86,7 @@ class Client:
         Returns:
             dict: Client's attributes as a dictionary.
         """
-        return self.__dict__
+        return {"name": self.name, "position": self.position, "products": self.products}
 
     def __str__(self):
         """
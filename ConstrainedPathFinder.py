@@ -0,0 +1,220 @@
+from PathFinder import PathFinder
+from CostModel import CostModel
+
+import heapq
+
+class ConstrainedPathFinder:
+    """
+    ConstrainedPathFinder class. Battery constrained A*: the fastest path between two cells whose battery consumption fits in a budget.
+
+    With constant weight and velocity, a route's battery is ((BASE_CONSUMPTION + WEIGHT_FACTOR * weight) * distance +
+    ALTITUDE_FACTOR * altitude_distance) / velocity (see CostModel). The search works in "energy" (battery * velocity), so
+    every label is a partial path's (distance, energy). The fastest path is the shortest one, but a shorter path over high
+    terrain can cost more battery than a longer one around it, so each cell keeps every label not dominated by another one
+    (no more distance and no more energy). A partial path is pruned as soon as its energy plus a lower bound of the energy
+    left to the goal (manhattan distance at Grid's lowest altitude) goes over the budget.
+    In PathFinder's altitude aware mode, a label's distance is priced with PathFinder's slot_costs (the fastest path is then the
+    cheapest one, not the shortest), its energy still with plain distances, and no-fly cells are never entered.
+
+    Attributes:
+        path_finder      (PathFinder): Search engine whose Grid and neighbor table are searched.
+        minimum_altitude        (int): Grid's lowest altitude, used by the lower bound.
+        terrain_version         (int): Grid's terrain_version "minimum_altitude" was computed at.
+        searches                (int): Number of searches.
+        expansions              (int): Labels expanded by every search.
+        pruned                  (int): Partial paths pruned for going over the budget, by every search.
+        dominated               (int): Partial paths discarded for being dominated, by every search.
+        infeasible              (int): Searches that found no path within the budget.
+    """
+
+    def __init__(self, path_finder):
+        """
+        Initiates a new ConstrainedPathFinder instance. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            path_finder (PathFinder): Search engine whose Grid and neighbor table are searched.
+
+        Raises:
+            ValueError: If "path_finder" is None.
+            TypeError: If "path_finder" is not an instance of PathFinder.
+        """
+
+        # Sanity Check #
+        if (path_finder is None):
+            raise ValueError("ERROR in __init__ in ConstrainedPathFinder. Your ConstrainedPathFinder must have a valid path_finder.")
+        if (not isinstance(path_finder, PathFinder)):
+            raise TypeError("ERROR in __init__ in ConstrainedPathFinder. Your path_finder must be an instance of PathFinder.")
+
+        self.path_finder = path_finder
+        self.minimum_altitude = None
+        self.terrain_version = None
+        self.searches = 0
+        self.expansions = 0
+        self.pruned = 0
+        self.dominated = 0
+        self.infeasible = 0
+
+    def get_minimum_altitude(self):
+        """
+        Gets Grid's lowest altitude, computed again only after the terrain changes. It may be negative (below sea level),
+        and flying there then costs less than the flat part of the energy.
+        """
+
+        grid = self.path_finder.grid
+        if self.terrain_version != grid.terrain_version:
+            self.minimum_altitude = min(grid.altitudes)
+            self.terrain_version = grid.terrain_version
+
+        return self.minimum_altitude
+
+    def get_lower_bound(self, start, goal, velocity, weight):
+        """
+        Gets a lower bound of the battery consumed between cells "start" and "goal": their manhattan distance (the shortest
+        possible, see Grid.neighbor_distances) flown at Grid's lowest altitude.
+
+        Args:
+            start      (int): Start cell's index.
+            goal       (int): Goal cell's index.
+            velocity (float): Drone's velocity.
+            weight   (float): Drone's weight.
+
+        Returns:
+            float: Battery lower bound.
+        """
+
+        width = self.path_finder.grid.width
+        start_x, start_y = divmod(start, width)
+        goal_x, goal_y = divmod(goal, width)
+        distance = abs(start_x - goal_x) + abs(start_y - goal_y)
+
+        return ((CostModel.BASE_CONSUMPTION + (CostModel.WEIGHT_FACTOR * weight) + (CostModel.ALTITUDE_FACTOR * self.get_minimum_altitude())) * distance) / velocity
+
+    def search(self, start, goal, velocity, weight, battery):
+        """
+        Searches the fastest path between cells "start" and "goal" that consumes at most "battery".
+
+        Args:
+            start      (int): Start cell's index.
+            goal       (int): Goal cell's index.
+            velocity (float): Drone's velocity during the whole search.
+            weight   (float): Drone's weight during the whole search.
+            battery  (float): Battery budget.
+
+        Returns:
+            list[int]: Indexes of path's cells, from "start" to "goal". None, if no path fits in "battery".
+        """
+
+        self.path_finder.refresh_altitude_tables()
+        grid = self.path_finder.grid
+        width = grid.width
+        altitudes = grid.altitudes
+        neighbor_offsets = grid.neighbor_offsets
+        neighbor_directions = grid.neighbor_directions
+        neighbor_steps = grid.neighbor_steps
+        neighbor_distances = grid.neighbor_distances
+        slot_costs = self.path_finder.slot_costs
+        inf = float('inf')
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        self.searches += 1
+
+        # Energy per unit of distance: flat part (BASE_CONSUMPTION + WEIGHT_FACTOR * weight), then ALTITUDE_FACTOR per altitude unit
+        flat_energy = CostModel.BASE_CONSUMPTION + (CostModel.WEIGHT_FACTOR * weight)
+        altitude_energy = CostModel.ALTITUDE_FACTOR
+        bound_energy = flat_energy + (altitude_energy * self.get_minimum_altitude())
+        budget = battery * velocity
+
+        goal_x, goal_y = divmod(goal, width)
+        start_x, start_y = divmod(start, width)
+        start_h = abs(start_x - goal_x) + abs(start_y - goal_y)
+
+        if (bound_energy * start_h) > budget:
+            self.pruned += 1
+            self.infeasible += 1
+            return None
+
+        # Labels by id: cell, distance, energy and previous label. Each cell keeps the ids of its non dominated labels
+        label_cells = [start]
+        label_distances = [0]
+        label_energies = [0.0]
+        label_parents = [-1]
+        discarded = set()
+        cell_labels = {start: [0]}
+
+        # Entries are (f, energy, label): shortest estimate first, then the one with more battery left
+        open_set = [(start_h, 0.0, 0)]
+        expansions = 0
+
+        while open_set:
+            _, _, label = heappop(open_set)
+            if label in discarded:
+                continue
+
+            current = label_cells[label]
+
+            # Client found
+            if current == goal:
+                self.expansions += expansions
+                path = []
+                while label != -1:
+                    path.append(label_cells[label])
+                    label = label_parents[label]
+                return path[::-1]
+
+            expansions += 1
+            current_distance = label_distances[label]
+            current_energy = label_energies[label]
+            step_energy = flat_energy + (altitude_energy * altitudes[current])
+
+            for slot in range(neighbor_offsets[current], neighbor_offsets[current + 1]):
+                neighbor = current + neighbor_steps[neighbor_directions[slot]]
+                distance = current_distance + slot_costs[slot]
+                energy = current_energy + (neighbor_distances[slot] * step_energy)
+
+                neighbor_x, neighbor_y = divmod(neighbor, width)
+                h = abs(neighbor_x - goal_x) + abs(neighbor_y - goal_y)
+
+                # Not even the cheapest possible rest of the path fits in the budget (or "neighbor" is a no-fly cell)
+                if (energy + (bound_energy * h) > budget) or (distance == inf):
+                    self.pruned += 1
+                    continue
+
+                labels = cell_labels.get(neighbor)
+                if labels is None:
+                    labels = cell_labels[neighbor] = []
+                elif any((label_distances[other] <= distance) and (label_energies[other] <= energy) for other in labels):
+                    self.dominated += 1
+                    continue
+                else:
+                    # The new label dominates some of the cell's: they are dropped, and skipped if still in the open set
+                    kept = []
+                    for other in labels:
+                        if (distance <= label_distances[other]) and (energy <= label_energies[other]):
+                            discarded.add(other)
+                            self.dominated += 1
+                        else:
+                            kept.append(other)
+                    labels[:] = kept
+
+                new_label = len(label_cells)
+                label_cells.append(neighbor)
+                label_distances.append(distance)
+                label_energies.append(energy)
+                label_parents.append(label)
+                labels.append(new_label)
+                heappush(open_set, (distance + h, energy, new_label))
+
+        self.expansions += expansions
+        self.infeasible += 1
+        return None
+
+    def get_constrained_path_finder_info(self):
+        """
+        Gets ConstrainedPathFinder's counters.
+
+        Returns:
+            dict: ConstrainedPathFinder's searches, expansions, pruned and dominated partial paths and infeasible searches as a dictionary.
+        """
+
+        return {"searches": self.searches, "expansions": self.expansions, "pruned": self.pruned, "dominated": self.dominated, "infeasible": self.infeasible}
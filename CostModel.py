@@ -0,0 +1,157 @@
+from Grid import Grid
+
+from array import array
+from itertools import accumulate, chain, repeat
+from operator import add, floordiv, mod, mul, sub
+
+class CostModel:
+    """
+    CostModel class. Scores whole routes (as flat cell indexes) at once: distance, altitude factor, flight time and battery consumption.
+
+    Battery consumption of a segment is (distance / velocity) * (BASE_CONSUMPTION + ALTITUDE_FACTOR * altitude + WEIGHT_FACTOR * weight),
+    with the altitude of the segment's first cell. Summed over a route, with constant weight and velocity, it becomes
+    ((BASE_CONSUMPTION + WEIGHT_FACTOR * weight) * distance + ALTITUDE_FACTOR * altitude_distance) / velocity,
+    where altitude_distance is the sum of (segment distance * segment altitude). So a route is scored once and then priced for any load.
+
+    Attributes:
+        grid (Grid): Grid the routes are in.
+    """
+
+    BASE_CONSUMPTION = 10
+    ALTITUDE_FACTOR = 0.0001
+    WEIGHT_FACTOR = 0.1
+
+    def __init__(self, grid):
+        """
+        Initiates a new CostModel instance for "grid". Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            grid (Grid): Grid the routes are in.
+
+        Raises:
+            ValueError: If "grid" is None.
+            TypeError: If "grid" is not an instance of Grid.
+        """
+
+        # Sanity Check #
+        if (grid is None):
+            raise ValueError("ERROR in __init__ in CostModel. Your CostModel must have a valid grid.")
+        if (not isinstance(grid, Grid)):
+            raise TypeError("ERROR in __init__ in CostModel. Your grid must be an instance of Grid.")
+
+        self.grid = grid
+
+    def get_segment_distances(self, route):
+        """
+        Gets the manhattan distance of every segment of "route".
+
+        Args:
+            route (list[int]): Indexes of route's cells.
+
+        Returns:
+            list[int]: Distance of every segment, len(route) - 1 values.
+        """
+
+        width = self.grid.width
+        rows = list(map(floordiv, route, repeat(width)))
+        columns = list(map(mod, route, repeat(width)))
+
+        return list(map(add, map(abs, map(sub, rows[1:], rows[:-1])), map(abs, map(sub, columns[1:], columns[:-1]))))
+
+    def score_route(self, route):
+        """
+        Gets the load independent terms of "route"'s cost.
+
+        Args:
+            route (list[int]): Indexes of route's cells.
+
+        Returns:
+            tuple[int, float]: Route's total distance and altitude_distance (sum of segment distance * segment first cell's altitude).
+        """
+
+        distances = self.get_segment_distances(route)
+        altitude_distance = sum(map(mul, distances, map(self.grid.altitudes.__getitem__, route[:-1])))
+
+        return sum(distances), altitude_distance
+
+    def score_route_time(self, route, penalties):
+        """
+        Gets "route"'s flight time at velocity 1 when entering each cell costs its distance times the cell's penalty (see PathFinder.cell_penalties).
+
+        Args:
+            route          (list[int]): Indexes of route's cells.
+            penalties (array[float]): Cost factor of entering each cell, by flat index.
+
+        Returns:
+            float: Route's penalized distance.
+        """
+
+        return sum(map(mul, self.get_segment_distances(route), map(penalties.__getitem__, route[1:])))
+
+    def get_battery(self, distance, altitude_distance, weight, velocity):
+        """
+        Prices a scored route.
+
+        Args:
+            distance            (float): Route's total distance.
+            altitude_distance   (float): Route's altitude_distance.
+            weight              (float): Drone's weight during the whole route.
+            velocity            (float): Drone's velocity during the whole route.
+
+        Returns:
+            float: Battery consumed.
+        """
+
+        return (((CostModel.BASE_CONSUMPTION + (CostModel.WEIGHT_FACTOR * weight)) * distance) + (CostModel.ALTITUDE_FACTOR * altitude_distance)) / velocity
+
+    def get_route_battery(self, route, weight, velocity):
+        """
+        Gets the battery consumed along "route".
+
+        Args:
+            route (list[int]): Indexes of route's cells.
+            weight    (float): Drone's weight during the whole route.
+            velocity  (float): Drone's velocity during the whole route.
+
+        Returns:
+            float: Battery consumed.
+        """
+
+        distance, altitude_distance = self.score_route(route)
+        return self.get_battery(distance, altitude_distance, weight, velocity)
+
+    def score_routes(self, routes, weights, velocities):
+        """
+        Scores many routes in one call. Every route's cells are joined, so segment distances and altitude terms are computed in
+        a single pass, and the segments joining two routes are left out of both.
+
+        Args:
+            routes (list[list[int]]): Routes, as indexes of their cells.
+            weights    (list[float]): Drone's weight on each route.
+            velocities (list[float]): Drone's velocity on each route.
+
+        Returns:
+            tuple[array[float], array[float], array[float]]: Distance, flight time and battery consumed of every route.
+        """
+
+        routes = [list(route) for route in routes]
+        cells = list(chain.from_iterable(routes))
+        segment_distances = self.get_segment_distances(cells)
+        altitude_distances = list(map(mul, segment_distances, map(self.grid.altitudes.__getitem__, cells[:-1])))
+
+        distances = array('d')
+        times = array('d')
+        batteries = array('d')
+
+        get_battery = self.get_battery
+        starts = accumulate((len(route) for route in routes), initial=0)
+        for start, route, weight, velocity in zip(starts, routes, weights, velocities):
+            # Segments of a route start at its first cell and end before the one joining it to the next route
+            end = start + max(len(route) - 1, 0)
+            distance = sum(segment_distances[start:end])
+            altitude_distance = sum(altitude_distances[start:end])
+            distances.append(distance)
+            times.append(distance / velocity)
+            batteries.append(get_battery(distance, altitude_distance, weight, velocity))
+
+        return distances, times, batteries
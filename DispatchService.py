@@ -0,0 +1,414 @@
+from Fleet import Fleet
+from Grid import DEFAULT_ALTITUDE_PATH
+from Instrumentation import summarize_timings
+from OrderPacker import OrderPacker
+import main as simulation
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+class DispatchService:
+    """
+    DispatchService class. Live dispatch loop: orders arrive continuously, from tailed files, a local socket or a replay at a
+    given arrival rate, and are flown by whichever drones are idle at base.
+
+    Every source parses its lines into Orders and puts them in an asyncio queue. The intake task moves them to the simulation's
+    order pool, and the dispatcher packs a load for each idle Drone as soon as there are pending orders. Each trip is planned and
+    flown (see main.fly_load) in a single worker thread, so the event loop keeps taking orders while routes are searched. Lines are
+    parsed in that same thread, as parsing adds products to the Clients trips are flying to, so the simulation's state is only
+    ever changed by one trip or one order at a time. A Drone is busy for its trip's duration times "time_scale" seconds, then idle again.
+
+    Attributes:
+        time_scale                      (float): Wall clock seconds per simulated time unit a Drone stays busy after a trip.
+        plan_tours                       (bool): Reorder each load's clients with the TourPlanner.
+        executor           (ThreadPoolExecutor): Worker thread parsing orders, and planning and flying trips.
+        orders                  (asyncio.Queue): Parsed Orders, not yet in the order pool. None ends the intake.
+        changed                 (asyncio.Event): Set when orders arrive, a Drone becomes idle or intake ends.
+        idle                       (list[Drone]): Drones at base, waiting for a load.
+        trips            (set[asyncio.Task]): Trips being planned or flown.
+        arrivals          (dict{Order: float}): Time (time.perf_counter) at which each pending Order was received.
+        closed                           (bool): True once every source finished.
+        error                       (Exception): Error raised by a trip. None, if every trip went fine.
+        received                          (int): Orders received.
+        invalid                           (int): Lines that couldn't be parsed into an Order.
+        dispatched                        (int): Orders flown.
+        queue_waits              (list[float]): Seconds between each Order's arrival and its load being assigned to a Drone.
+        latencies                (list[float]): Seconds between each Order's arrival and its trip being planned (order-to-dispatch).
+        planning_times           (list[float]): Seconds spent planning and flying each trip in the worker thread.
+        started_at                      (float): Time (time.perf_counter) the service started.
+    """
+
+    def __init__(self, time_scale=0.0, plan_tours=True):
+        """
+        Initiates a new DispatchService instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            time_scale (float): Wall clock seconds per simulated time unit a Drone stays busy after a trip.
+            plan_tours  (bool): Reorder each load's clients with the TourPlanner.
+
+        Raises:
+            ValueError: If "time_scale" is either None or invalid (Negative value).
+            TypeError: If "time_scale" is not an instance of int or float.
+        """
+
+        # Sanity Check #
+        if (time_scale is None):
+            raise ValueError("ERROR in __init__ in DispatchService. Your DispatchService must have a valid time_scale.")
+        if (not isinstance(time_scale, (int, float))):
+            raise TypeError("ERROR in __init__ in DispatchService. Your DispatchService's time_scale must be an instance of int or float.")
+        if (time_scale < 0):
+            raise ValueError("ERROR in __init__ in DispatchService. Your DispatchService's time_scale can't be negative.")
+
+        self.time_scale = time_scale
+        self.plan_tours = plan_tours
+        self.executor = None
+        self.orders = None
+        self.changed = None
+        self.idle = []
+        self.trips = set()
+        self.arrivals = {}
+        self.closed = False
+        self.error = None
+        self.received = 0
+        self.invalid = 0
+        self.dispatched = 0
+        self.queue_waits = []
+        self.latencies = []
+        self.planning_times = []
+        self.started_at = None
+
+    async def submit(self, line):
+        """
+        Parses an order line in the worker thread and queues its Order.
+
+        Args:
+            line (str): Order's line ("client,product price weight,...").
+
+        Returns:
+            bool: True if the line was queued. False if it is blank or invalid.
+        """
+
+        line = line.strip()
+        if line == "":
+            return False
+
+        arrived_at = time.perf_counter()
+        try:
+            order = await asyncio.get_running_loop().run_in_executor(self.executor, simulation.parse_order, line, simulation.clients_by_name)
+        except ValueError:
+            self.invalid += 1
+            return False
+
+        self.arrivals[order] = arrived_at
+        self.received += 1
+        self.orders.put_nowait(order)
+        return True
+
+    async def tail_file(self, path, poll_interval=0.5, idle_timeout=None):
+        """
+        Source following "path" like "tail -f": every line already in it, then every line appended to it.
+
+        Args:
+            path           (str): Orders file's path.
+            poll_interval (float): Seconds between checks for new lines.
+            idle_timeout  (float): Stop after this many seconds without new lines. None, to follow "path" forever.
+        """
+
+        with open(path, 'r') as arquivo:
+            partial = ""
+            last_line_at = time.perf_counter()
+            while True:
+                line = arquivo.readline()
+
+                # A line still being written is kept until its end arrives
+                if line.endswith("\n"):
+                    await self.submit(partial + line)
+                    partial = ""
+                    last_line_at = time.perf_counter()
+                    continue
+                partial += line
+
+                if (idle_timeout is not None) and (time.perf_counter() - last_line_at >= idle_timeout):
+                    await self.submit(partial)
+                    return
+                await asyncio.sleep(poll_interval)
+
+    async def serve_socket(self, host="127.0.0.1", port=8765):
+        """
+        Source listening on a local TCP socket. Every line received is an order, answered with "accepted" or "rejected".
+
+        Args:
+            host (str): Address to listen on.
+            port (int): Port to listen on.
+        """
+
+        async def handle_connection(reader, writer):
+            async for line in reader:
+                accepted = await self.submit(line.decode())
+                writer.write(b"accepted\n" if accepted else b"rejected\n")
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def replay_file(self, path, arrival_rate=None, seed=0):
+        """
+        Source replaying the orders in "path" as a Poisson process: exponentially distributed gaps averaging "arrival_rate" orders per second.
+
+        Args:
+            path          (str): Orders file's path.
+            arrival_rate (float): Mean orders per second. None, to submit them all at once.
+            seed           (int): Random seed of the gaps.
+        """
+
+        rng = random.Random(seed)
+        with open(path, 'r') as arquivo:
+            for line in arquivo:
+                if line.strip() == "":
+                    continue
+                if arrival_rate:
+                    await asyncio.sleep(rng.expovariate(arrival_rate))
+                await self.submit(line)
+
+    async def intake(self):
+        """
+        Moves queued Orders to the simulation's order pool until the None sentinel.
+        """
+
+        while True:
+            order = await self.orders.get()
+            if order is None:
+                self.closed = True
+            else:
+                simulation.order_pool.add_orders([order])
+            self.changed.set()
+
+            if self.closed:
+                return
+
+    def fly_trip(self, drone, load):
+        """
+        Plans and flies "drone"'s trip in the worker thread.
+
+        Returns:
+            float: Trip's duration, in simulated time units.
+        """
+
+        start_time = simulation.fleet.get_time(drone)
+        simulation.fly_load(drone, load, simulation.grid.get_position_in_grid(simulation.X_base, simulation.Y_base), self.plan_tours)
+        return simulation.fleet.get_time(drone) - start_time
+
+    def reject_orders(self, orders):
+        """
+        Rejects "orders", which no Drone can carry. Runs in the worker thread, as every event emission does.
+        """
+
+        for order in orders:
+            simulation.events.emit("order_rejected", client=order.client.name, weight=order.total_weight)
+
+    async def trip(self, drone, load):
+        """
+        Plans and flies "drone"'s "load" without blocking the event loop, then keeps "drone" busy for the trip's scaled duration.
+        """
+
+        assigned_at = time.perf_counter()
+        for order in load:
+            self.queue_waits.append(assigned_at - self.arrivals[order])
+
+        duration = await asyncio.get_running_loop().run_in_executor(self.executor, self.fly_trip, drone, load)
+
+        dispatched_at = time.perf_counter()
+        self.planning_times.append(dispatched_at - assigned_at)
+        for order in load:
+            self.latencies.append(dispatched_at - self.arrivals.pop(order))
+        self.dispatched += len(load)
+
+        await asyncio.sleep(duration * self.time_scale)
+
+        self.idle.append(drone)
+
+    def finish_trip(self, task):
+        """
+        Forgets a finished trip and wakes the dispatcher. A trip that raised stops the dispatcher with the same error.
+        """
+
+        self.trips.discard(task)
+        if (not task.cancelled()) and (task.exception() is not None):
+            self.error = task.exception()
+        self.changed.set()
+
+    def assign_loads(self):
+        """
+        Packs a load for every idle Drone that can carry a pending order, and starts its trip.
+        """
+
+        order_pool = simulation.order_pool
+
+        # First drone in Fleet's order (more battery, then more free capacity) gets the first load
+        self.idle.sort(key=lambda drone: (-drone.battery, -(drone.maximum_weight - drone.current_weight), drone.id))
+
+        for drone in list(self.idle):
+            if len(order_pool) == 0:
+                return
+
+            if (drone.maximum_weight - drone.current_weight) < order_pool.get_lightest_weight():
+                continue
+
+            self.idle.remove(drone)
+            load = order_pool.next_load(drone.maximum_weight - drone.current_weight)
+
+            task = asyncio.create_task(self.trip(drone, load))
+            self.trips.add(task)
+            task.add_done_callback(self.finish_trip)
+
+    async def dispatcher(self):
+        """
+        Assigns loads to idle Drones whenever something changes, until intake ended and every order was flown or rejected.
+        """
+
+        order_pool = simulation.order_pool
+
+        while True:
+            self.changed.clear()
+            if self.error is not None:
+                raise self.error
+            self.assign_loads()
+
+            # Orders not even an empty drone can carry are rejected. The others wait for a drone to be back at base
+            if (len(order_pool) > 0) and (order_pool.get_lightest_weight() > simulation.fleet.get_maximum_capacity()):
+                orders = order_pool.take_all()
+                for order in orders:
+                    self.arrivals.pop(order, None)
+                await asyncio.get_running_loop().run_in_executor(self.executor, self.reject_orders, orders)
+
+            if self.closed and (len(order_pool) == 0) and (len(self.trips) == 0):
+                return
+
+            await self.changed.wait()
+
+    async def run(self, sources, duration=None):
+        """
+        Runs the service until every source finished (or "duration" seconds passed) and every received order was flown.
+
+        Args:
+            sources (list[coroutine]): Order sources (e.g. self.tail_file(path), self.serve_socket(), self.replay_file(path, rate)).
+            duration          (float): Seconds after which sources are stopped. None, to wait for them to finish.
+        """
+
+        self.orders = asyncio.Queue()
+        self.changed = asyncio.Event()
+        self.idle = list(simulation.fleet.drones)
+        self.started_at = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.executor = executor
+            intake = asyncio.create_task(self.intake())
+            dispatcher = asyncio.create_task(self.dispatcher())
+            producers = [asyncio.create_task(source) for source in sources]
+
+            try:
+                if producers:
+                    # A source raising stops the others right away, instead of waiting for sources that may never end
+                    done, pending = await asyncio.wait(producers, timeout=duration, return_when=asyncio.FIRST_EXCEPTION)
+                    for producer in pending:
+                        producer.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+                    # Sources raising is an error, unlike being stopped. Every error is retrieved, the first one is raised
+                    errors = [producer.exception() for producer in done if (not producer.cancelled()) and (producer.exception() is not None)]
+                    if errors:
+                        raise errors[0]
+
+                self.orders.put_nowait(None)
+                await intake
+                await dispatcher
+            finally:
+                # Whatever failed, no task is left running (or with an exception nobody retrieves) once the service stops
+                tasks = [intake, dispatcher, *producers, *self.trips]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_service_info(self):
+        """
+        Gets DispatchService's counters and latencies.
+
+        Returns:
+            dict: Orders received, invalid, dispatched, measured arrival rate, and order-to-dispatch, queue wait and planning timings as a dictionary.
+        """
+
+        elapsed = (time.perf_counter() - self.started_at) if self.started_at is not None else 0.0
+
+        return {
+            "received": self.received,
+            "invalid": self.invalid,
+            "dispatched": self.dispatched,
+            "elapsed_seconds": elapsed,
+            "arrival_rate": (self.received / elapsed) if elapsed > 0 else 0.0,
+            "order_to_dispatch": summarize_timings(self.latencies),
+            "queue_wait": summarize_timings(self.queue_waits),
+            "trip_planning": summarize_timings(self.planning_times),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live order intake and dispatch.")
+    parser.add_argument("--tail", metavar="PATH", action="append", default=[], help="Follow PATH, like tail -f, and dispatch every order appended to it.")
+    parser.add_argument("--socket", metavar="HOST:PORT", help="Accept orders, one per line, on a local TCP socket.")
+    parser.add_argument("--replay", metavar="PATH", help="Replay the orders in PATH at --arrival-rate.")
+    parser.add_argument("--arrival-rate", metavar="R", type=float, help="Mean orders per second replayed (Poisson arrivals). All at once, if omitted.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of replayed arrivals.")
+    parser.add_argument("--idle-timeout", metavar="S", type=float, help="Stop following tailed files after S seconds without new orders.")
+    parser.add_argument("--duration", metavar="S", type=float, help="Stop taking orders after S seconds.")
+    parser.add_argument("--time-scale", metavar="S", type=float, default=0.0, help="Seconds a drone stays busy per simulated time unit of its trip.")
+    parser.add_argument("--packing", choices=OrderPacker.STRATEGIES, default="first_fit_decreasing", help="How pending orders are packed into drone loads.")
+    parser.add_argument("--no-tour-planning", action="store_true", help="Visit a load's clients in the order they were loaded.")
+    parser.add_argument("--altitude-path", metavar="PATH", default=DEFAULT_ALTITUDE_PATH, help="Altitude map: a text file (one altitude per line) or a binary altitude map.")
+    parser.add_argument("--height", metavar="N", type=int, default=5, help="Grid's height.")
+    parser.add_argument("--width", metavar="N", type=int, default=5, help="Grid's width.")
+    parser.add_argument("--base", metavar=("X", "Y"), type=int, nargs=2, default=(2, 2), help="Base's coords.")
+    parser.add_argument("--drones", metavar="PATH", default="./archives/drones.txt", help="Drones file.")
+    parser.add_argument("--clients", metavar="PATH", default="./archives/clients1.txt", help="Clients file.")
+    parser.add_argument("--base-distance-field", action="store_true", help="Read routes back to base from one shortest path tree rooted at base, instead of one A* per route.")
+    parser.add_argument("--event-log", metavar="PATH", help="Write every simulation event to PATH, one JSON object per line.")
+    args = parser.parse_args()
+
+    if not ((0 <= args.base[0] < args.height) and (0 <= args.base[1] < args.width)):
+        parser.error("--base must be inside the Grid.")
+
+    # Drones and clients are loaded up front. Orders only come from the sources
+    simulation.setup(args.height, args.width, args.altitude_path, tuple(args.base))
+    simulation.use_base_distance_field = args.base_distance_field
+    simulation.order_pool = OrderPacker(args.packing, simulation.grid.get_position_in_grid(simulation.X_base, simulation.Y_base))
+    simulation.build(args.drones, args.clients, os.devnull)
+    simulation.fleet = Fleet(simulation.drones)
+
+    service = DispatchService(args.time_scale, not args.no_tour_planning)
+    sources = [service.tail_file(path, idle_timeout=args.idle_timeout) for path in args.tail]
+    if args.socket is not None:
+        host, port = args.socket.rsplit(":", 1)
+        sources.append(service.serve_socket(host, int(port)))
+    if args.replay is not None:
+        sources.append(service.replay_file(args.replay, args.arrival_rate, args.seed))
+
+    if len(sources) == 0:
+        parser.error("atleast one order source (--tail, --socket or --replay) is required.")
+
+    try:
+        asyncio.run(service.run(sources, args.duration))
+    except KeyboardInterrupt:
+        pass
+
+    summary = simulation.summarize()
+    summary["service"] = service.get_service_info()
+    print(json.dumps(summary, indent=4))
+
+    if args.event_log is not None:
+        simulation.events.write(args.event_log)
@@ -0,0 +1,171 @@
+from PathFinder import PathFinder
+from CostModel import CostModel
+
+from array import array
+import heapq
+
+class DistanceField:
+    """
+    DistanceField class. Shortest path tree rooted at a fixed cell (usually the drones' base), computed once with Dijkstra.
+
+    Moving between two cells costs distance / velocity, so a single tree in distance units serves every velocity.
+    Any cell's route to the root, its flight time and its battery consumption are then read from the tree.
+    In PathFinder's altitude aware mode, moves cost their distance times the entered cell's penalty (see PathFinder.reverse_slot_costs),
+    so the tree is the fastest one for its drone class, and its routes' distances are kept apart for their battery.
+
+    Attributes:
+        path_finder       (PathFinder): PathFinder whose Grid and cost model the tree is computed for.
+        cost_model         (CostModel): Prices the tree's routes.
+        root                     (int): Root cell's index.
+        drone_class            (float): Drone class whose altitude tables price the moves (see PathFinder.drone_class). None, for plain distances.
+        cost            (array[float]): Cost from each cell to the root along the tree, at velocity 1. Infinite if unreachable.
+        distance        (array[float]): Distance from each cell to the root along the tree. Infinite if unreachable.
+        altitude_distance (array[float]): Sum of (segment distance * segment start altitude) from each cell to the root along the tree.
+        next_hop          (array[int]): Next cell towards the root. -1 for the root and unreachable cells.
+        version      (tuple[int, int]): Grid's terrain_version and PathFinder's cost_model_version the tree was computed with.
+    """
+
+    def __init__(self, path_finder, root, drone_class=None):
+        """
+        Initiates a new DistanceField instance and computes its tree. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            path_finder (PathFinder): PathFinder whose Grid and cost model the tree is computed for.
+            root               (int): Root cell's index.
+            drone_class      (float): Drone class whose altitude tables price the moves. None, for plain distances.
+
+        Raises:
+            ValueError: If attributes "path_finder", "root" are either None or invalid (outside Grid), or "drone_class" is negative.
+            TypeError: If attributes "path_finder", "root", "drone_class" have incorrect types.
+        """
+
+        # Sanity Check #
+        if (path_finder is None):
+            raise ValueError("ERROR in __init__ in DistanceField. Your DistanceField must have a valid path_finder.")
+        if (not isinstance(path_finder, PathFinder)):
+            raise TypeError("ERROR in __init__ in DistanceField. Your path_finder must be an instance of PathFinder.")
+
+        if (root is None) or (root < 0) or (root >= path_finder.grid.height * path_finder.grid.width):
+            raise ValueError("ERROR in __init__ in DistanceField. Your DistanceField must have a valid root inside Grid.")
+        if (not isinstance(root, int)):
+            raise TypeError("ERROR in __init__ in DistanceField. Your DistanceField's root must be an instance of int.")
+
+        if (drone_class is not None) and (not isinstance(drone_class, (int, float))):
+            raise TypeError("ERROR in __init__ in DistanceField. Your DistanceField's drone_class must be a number.")
+        if (drone_class is not None) and (drone_class < 0):
+            raise ValueError("ERROR in __init__ in DistanceField. Your DistanceField's drone_class can't be negative.")
+
+        self.path_finder = path_finder
+        self.cost_model = CostModel(path_finder.grid)
+        self.root = root
+        self.drone_class = drone_class
+        self.build()
+
+    def get_current_version(self):
+        """
+        Returns the current terrain and cost model versions.
+
+        Returns:
+            tuple[int, int]: Grid's terrain_version and PathFinder's cost_model_version.
+        """
+
+        return (self.path_finder.grid.terrain_version, self.path_finder.cost_model_version)
+
+    def build(self):
+        """
+        Computes the shortest path tree from every cell to the root (Dijkstra).
+        """
+
+        grid = self.path_finder.grid
+        size = grid.height * grid.width
+        neighbor_offsets = grid.neighbor_offsets
+        neighbor_directions = grid.neighbor_directions
+        neighbor_steps = grid.neighbor_steps
+        neighbor_distances = grid.neighbor_distances
+        reverse_slot_costs = self.path_finder.get_altitude_tables(self.drone_class)[3]
+        altitudes = grid.altitudes
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        cost = array('d', [float('inf')]) * size
+        distance = array('d', [float('inf')]) * size
+        altitude_distance = array('d', [0.0]) * size
+        next_hop = array('i', [-1]) * size
+
+        cost[self.root] = 0.0
+        distance[self.root] = 0.0
+        open_set = [(0.0, self.root)]
+
+        while open_set:
+            current_cost, current = heappop(open_set)
+
+            # Stale entry, "current" was already settled with a lower cost
+            if current_cost > cost[current]:
+                continue
+
+            # Routes go towards the root, so each slot is priced on the way back: neighbor -> current
+            for slot in range(neighbor_offsets[current], neighbor_offsets[current + 1]):
+                neighbor = current + neighbor_steps[neighbor_directions[slot]]
+                tentative_cost = current_cost + reverse_slot_costs[slot]
+
+                if tentative_cost < cost[neighbor]:
+                    step = neighbor_distances[slot]
+                    cost[neighbor] = tentative_cost
+                    distance[neighbor] = distance[current] + step
+                    altitude_distance[neighbor] = altitude_distance[current] + (step * altitudes[neighbor])
+                    next_hop[neighbor] = current
+                    heappush(open_set, (tentative_cost, neighbor))
+
+        self.cost = cost
+        self.distance = distance
+        self.altitude_distance = altitude_distance
+        self.next_hop = next_hop
+        self.version = self.get_current_version()
+
+    def refresh(self):
+        """
+        Recomputes the tree if the terrain or the cost model changed since it was computed.
+        """
+
+        if self.version != self.get_current_version():
+            self.build()
+
+    def get_route(self, index):
+        """
+        Returns the route from cell "index" to the root.
+
+        Args:
+            index (int): Start cell's index.
+
+        Returns:
+            list[int]: Indexes of route's cells, from "index" to the root. None, if the root can't be reached.
+        """
+
+        self.refresh()
+
+        if self.cost[index] == float('inf'):
+            return None
+
+        next_hop = self.next_hop
+        route = [index]
+        while index != self.root:
+            index = next_hop[index]
+            route.append(index)
+
+        return route
+
+    def get_battery(self, index, weight, velocity):
+        """
+        Returns the battery consumed from cell "index" to the root (see CostModel).
+
+        Args:
+            index      (int): Start cell's index.
+            weight   (float): Drone's weight during the whole route.
+            velocity (float): Drone's velocity during the whole route.
+
+        Returns:
+            float: Battery consumed. Infinite if the root can't be reached.
+        """
+
+        self.refresh()
+        return self.cost_model.get_battery(self.distance[index], self.altitude_distance[index], weight, velocity)
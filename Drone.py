@@ -23,9 +23,15 @@ class Drone:
         velocity                               (float): Drone's current velocity.
         maximum_velocity                       (float): Drone's maximum velocity.
     """
+    __slots__ = ("id", "altitude", "maximum_altitude", "battery", "maximum_battery", "current_position", "current_weight", "maximum_weight", "orders", "path", "velocity", "maximum_velocity")
+
     # Class shared variable
     _id_counter = 1
 
+    # Velocity's weight (alpha) and altitude (beta) factors (see get_velocity)
+    ALPHA = 0.5
+    BETA = 0.2
+
     def __init__(self, maximum_altitude, maximum_weight, maximum_velocity):
         """
         Initiates a new Drone instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
@@ -154,6 +160,18 @@ class Drone:
         self.current_weight = 0.0
         self.orders.clear()
 
+    def get_velocity(self, weight):
+        """
+        Returns drone's velocity when carrying "weight". It is defined by the function v = vmax * (1 - alpha * (weight/total_weight)) * (1 - beta * (height/total_height))
+
+        Args:
+            weight (float): Carried weight.
+
+        Returns:
+            velocity (float): Drone's velocity.
+        """
+        return self.maximum_velocity * (1 - Drone.ALPHA * (weight / self.maximum_weight)) * (1 - Drone.BETA * (self.altitude / self.maximum_altitude))
+
     def update_drone_velocity(self):
         """
         Returns drone's current velocity. It is defined by the function v = vmax * (1 - alpha * (weight/total_weight)) * (1 - beta * (height/total_height))
@@ -161,10 +179,8 @@ class Drone:
         Returns:
             velocity (float): Drone's currenty velocity.
         """
-        alpha = 0.5
-        beta = 0.2
 
-        self.velocity = self.maximum_velocity * (1 - alpha * (self.current_weight / self.maximum_weight)) * (1 - beta * (self.altitude / self.maximum_altitude))
+        self.velocity = self.get_velocity(self.current_weight)
         return self.velocity
 
     def update_drone_battery(self, new_value):
@@ -177,4 +193,4 @@ class Drone:
         Returns:
             dict: Drone's attributes as a dictionary.
         """
-        return self.__dict__
\ No newline at end of file
+        return {attribute: getattr(self, attribute) for attribute in Drone.__slots__}
\ No newline at end of file
@@ -0,0 +1,85 @@
+import json
+
+class EventLog:
+    """
+    EventLog class. Ordered stream of simulation events. Every event is recorded and handed to every subscriber, in emission order.
+
+    Attributes:
+        events           (list[dict]): Recorded events. Each one has "step" (emission order), "event" (kind) and its own data.
+        subscribers (list[callable]): Functions called with every emitted event.
+    """
+
+    def __init__(self):
+        """
+        Initiates a new, empty, EventLog instance.
+        """
+
+        self.events = []
+        self.subscribers = []
+
+    def subscribe(self, subscriber):
+        """
+        Adds a subscriber, called with every event emitted from now on.
+
+        Args:
+            subscriber (callable): Function receiving the event (dict).
+
+        Raises:
+            TypeError: If "subscriber" is not callable.
+        """
+
+        # Sanity Check #
+        if (not callable(subscriber)):
+            raise TypeError("ERROR in subscribe in EventLog. Your subscriber must be callable.")
+
+        self.subscribers.append(subscriber)
+
+    def emit(self, kind, **data):
+        """
+        Records a new event and hands it to every subscriber.
+
+        Args:
+            kind  (str): Event's kind.
+            **data     : Event's data. Must be JSON serializable.
+
+        Returns:
+            dict: Emitted event.
+        """
+
+        event = {"step": len(self.events), "event": kind}
+        event.update(data)
+        self.events.append(event)
+
+        for subscriber in self.subscribers:
+            subscriber(event)
+
+        return event
+
+    def get_events(self, kind=None):
+        """
+        Gets recorded events.
+
+        Args:
+            kind (str): Only events of this kind. Every event, if None.
+
+        Returns:
+            list[dict]: Recorded events, in emission order.
+        """
+
+        if kind is None:
+            return self.events
+
+        return [event for event in self.events if event["event"] == kind]
+
+    def write(self, path):
+        """
+        Writes every recorded event to "path", one JSON object per line.
+
+        Args:
+            path (str): Output file's path.
+        """
+
+        with open(path, 'w') as arquivo:
+            for event in self.events:
+                arquivo.write(json.dumps(event))
+                arquivo.write("\n")
@@ -0,0 +1,83 @@
+import heapq
+
+class EventQueue:
+    """
+    EventQueue class. Time ordered queue of scheduled simulation events, the core of a discrete-event simulation.
+
+    Events are kept in a binary heap keyed by (time, sequence): the earliest one is popped first and events scheduled for the
+    same time come out in the order they were pushed. Popping an event moves the queue's clock to its time, so idle periods
+    between events are skipped instead of simulated.
+
+    Attributes:
+        events (list[tuple[float, int, str, dict]]): Heap of (time, sequence, kind, data) entries.
+        time                              (float): Time of the last popped event.
+        sequence                            (int): Number of events ever pushed. Breaks ties between events of the same time.
+        processed                           (int): Number of events popped.
+    """
+
+    def __init__(self):
+        """
+        Initiates a new, empty, EventQueue instance with its clock at 0.
+        """
+
+        self.events = []
+        self.time = 0.0
+        self.sequence = 0
+        self.processed = 0
+
+    def push(self, time, kind, **data):
+        """
+        Schedules a new event. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            time  (float): Event's time. Can't be earlier than the queue's clock.
+            kind    (str): Event's kind.
+            **data       : Event's data.
+
+        Raises:
+            ValueError: If "time" is either None or earlier than the queue's clock.
+            TypeError: If "kind" is not an instance of str.
+        """
+
+        # Sanity Check #
+        if (time is None) or (time < self.time):
+            raise ValueError("ERROR in push in EventQueue. Your event can't be scheduled before the queue's current time.")
+        if (not isinstance(kind, str)):
+            raise TypeError("ERROR in push in EventQueue. Your event's kind must be an instance of str.")
+
+        heapq.heappush(self.events, (time, self.sequence, kind, data))
+        self.sequence += 1
+
+    def pop(self):
+        """
+        Takes the earliest event out of the queue and moves the clock to its time.
+
+        Returns:
+            tuple[float, str, dict]: Event's time, kind and data.
+
+        Raises:
+            ValueError: If the queue is empty.
+        """
+
+        # Sanity Check #
+        if len(self.events) == 0:
+            raise ValueError("ERROR in pop in EventQueue. There is no event left.")
+
+        time, _, kind, data = heapq.heappop(self.events)
+        self.time = time
+        self.processed += 1
+
+        return time, kind, data
+
+    def __len__(self):
+        return len(self.events)
+
+    def get_event_queue_info(self):
+        """
+        Gets EventQueue's clock and counters.
+
+        Returns:
+            dict: EventQueue's current time, pending and processed events as a dictionary.
+        """
+
+        return {"time": self.time, "pending": len(self.events), "processed": self.processed}
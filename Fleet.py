@@ -0,0 +1,142 @@
+from Drone import Drone
+
+class Fleet:
+    """
+    Fleet class. Schedules trips across every Drone on a shared simulation clock.
+
+    Time is measured in the same unit as route costs (distance / velocity). Each Drone is free again when its last trip ends.
+
+    Attributes:
+        drones      (list[Drone]): Fleet's drones.
+        available_at (dict{int: float}): Time at which each Drone (by id) finishes its current trip.
+        busy_time    (dict{int: float}): Total flight time of each Drone (by id).
+        trips          (dict{int: int}): Number of trips of each Drone (by id).
+    """
+
+    def __init__(self, drones):
+        """
+        Initiates a new Fleet instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            drones (list[Drone]): Fleet's drones.
+
+        Raises:
+            ValueError: If "drones" is either None or empty.
+            TypeError: If "drones" has something that is not an instance of Drone.
+        """
+
+        # Sanity Check #
+        if (drones is None) or (len(drones) == 0):
+            raise ValueError("ERROR in __init__ in Fleet. Your Fleet must have atleast one Drone.")
+        for drone in drones:
+            if (not isinstance(drone, Drone)):
+                raise TypeError("ERROR in __init__ in Fleet. Your drones must be instances of Drone.")
+
+        self.drones = drones
+        self.available_at = {drone.id: 0.0 for drone in drones}
+        self.busy_time = {drone.id: 0.0 for drone in drones}
+        self.trips = {drone.id: 0 for drone in drones}
+
+    def next_drone(self, minimum_weight=0.0):
+        """
+        Chooses the Drone that should take the next trip: the first one to be available, then the one with more battery, then the one with more free capacity.
+
+        Args:
+            minimum_weight (float): Only drones with at least this free capacity are considered.
+
+        Returns:
+            Drone: Chosen Drone. None, if no Drone has enough free capacity.
+        """
+
+        candidates = [drone for drone in self.drones if (drone.maximum_weight - drone.current_weight) >= minimum_weight]
+        if len(candidates) == 0:
+            return None
+
+        return min(candidates, key=lambda drone: (self.available_at[drone.id], -drone.battery, -(drone.maximum_weight - drone.current_weight), drone.id))
+
+    def get_maximum_capacity(self):
+        """
+        Gets the largest weight any Drone can carry once empty. Orders heavier than it can never be flown.
+
+        Returns:
+            float: Largest maximum_weight in the fleet.
+        """
+
+        return max(drone.maximum_weight for drone in self.drones)
+
+    def get_time(self, drone):
+        """
+        Gets "drone"'s current time on the shared clock.
+
+        Args:
+            drone (Drone): Fleet's Drone.
+
+        Returns:
+            float: Time at which "drone" is free.
+        """
+
+        return self.available_at[drone.id]
+
+    def start_trip(self, drone):
+        """
+        Registers a new trip for "drone".
+
+        Args:
+            drone (Drone): Fleet's Drone.
+        """
+
+        self.trips[drone.id] += 1
+
+    def advance(self, drone, duration):
+        """
+        Moves "drone"'s clock forward by a flight of "duration".
+
+        Args:
+            drone      (Drone): Fleet's Drone.
+            duration   (float): Flight's duration.
+        """
+
+        self.available_at[drone.id] += duration
+        self.busy_time[drone.id] += duration
+
+    def wait(self, drone, duration):
+        """
+        Moves "drone"'s clock forward by "duration" spent on the ground (e.g. recharging or handing over an order).
+
+        Args:
+            drone      (Drone): Fleet's Drone.
+            duration   (float): Time on the ground.
+        """
+
+        self.available_at[drone.id] += duration
+
+    def get_makespan(self):
+        """
+        Gets the time at which the last Drone finishes its trips.
+
+        Returns:
+            float: Fleet's makespan.
+        """
+
+        return max(self.available_at.values())
+
+    def get_fleet_info(self):
+        """
+        Gets Fleet's makespan and per Drone utilization (flight time / makespan).
+
+        Returns:
+            dict: Fleet's makespan and per Drone trips, busy time and utilization as a dictionary.
+        """
+
+        makespan = self.get_makespan()
+
+        drones_info = {}
+        for drone in self.drones:
+            busy_time = self.busy_time[drone.id]
+            drones_info[drone.id] = {
+                "trips": self.trips[drone.id],
+                "busy_time": busy_time,
+                "utilization": (busy_time / makespan) if makespan > 0 else 0.0,
+            }
+
+        return {"makespan": makespan, "drones": drones_info}
@@ -1,24 +1,52 @@
+from array import array
+from itertools import chain, repeat
+from operator import add, sub
+
+from AltitudeMap import is_binary_altitude_file, load_binary_altitudes, read_text_altitudes
+
+DEFAULT_ALTITUDE_PATH = './archives/altitude1.txt'
+
 class Grid:
     """
     Grid class.
 
     Attributes: 
-        height               (int): Grid's height.
-        width                (int): Grid's width.
-        positions (list[Position]): Possible positions in Grid.
+        height                      (int): Grid's height.
+        width                       (int): Grid's width.
+        altitude_path               (str): Altitude map's path.
+        altitudes            (array[int]): Altitude (Z) of every cell, stored as int32 by flat index (index = (X * width) + Y). Memory-mapped for binary altitude maps.
+        classifications       (bytearray): Classification code (see Position.CLASSIFICATIONS) of every cell.
+        last_classifications  (bytearray): Last classification code of every cell.
+        dirty_cells            (set[int]): Cells whose classification changed since they were last drawn (see GridRenderer).
+        drone_cells (dict{int: set[int]}): Cells occupied by each drone (by id).
+        cell_drones (dict{int: set[int]}): Drones (by id) occupying each occupied cell. An occupied cell is classified "drone" and its own classification is kept in last_classifications.
+        terrain_version             (int): Incremented every time an altitude changes.
+        positions      (GridPositions): Possible positions in Grid. Each Position is a view created on demand.
+        neighbor_offsets     (array[int]): Neighbors of cell i are stored from neighbor_offsets[i] to neighbor_offsets[i + 1] (exclusive) in neighbor_directions.
+        neighbor_directions   (bytearray): Direction (index in NEIGHBOR_DELTAS) of every cell's neighbors (neighborhood of 8).
+        neighbor_distances    (bytearray): Manhattan distance from each cell to the neighbor at the same slot of neighbor_directions.
+        neighbor_steps       (tuple[int]): Flat index offset of each direction, so the neighbor at "slot" of cell i is i + neighbor_steps[neighbor_directions[slot]].
+
+    The neighbor table (neighbor_offsets, neighbor_directions and neighbor_distances) takes about 21 bytes per cell: 4 per offset,
+    and 2 per slot instead of a 4 bytes neighbor index. It is only built the first time one of its arrays is read, so a Grid nothing
+    searches never pays for it.
     """
 
-    def __init__(self, height, width):
+    # (X, Y) offsets of a cell's neighborhood of 8, in the order they are returned
+    NEIGHBOR_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+    def __init__(self, height, width, altitude_path=DEFAULT_ALTITUDE_PATH):
         """
         Initiates a new Grid instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
 
         Args:
-            height (int): Grid's height.
-            width  (int): Grid's width.
+            height        (int): Grid's height.
+            width         (int): Grid's width.
+            altitude_path (str): Altitude map's path. Either a text file (one altitude per line) or a binary altitude map (see AltitudeMap), which is memory-mapped.
 
         Raises:
-            ValueError: If attributes "height", "width" are either None or invalid (Negative values).
-            TypeError: If attributes "height", "width" have incorrect types.
+            ValueError: If attributes "height", "width", "altitude_path" are either None or invalid (Negative values or empty string).
+            TypeError: If attributes "height", "width", "altitude_path" have incorrect types.
     
         """
 
@@ -33,18 +61,140 @@ class Grid:
         if not isinstance(width, int):
             raise TypeError("ERROR in __init__ in Grid. Your Grid's width must be an instance of int.")
 
+        if (altitude_path is None) or (altitude_path == ""):
+            raise ValueError("ERROR in __init__ in Grid. Your Grid must have a valid altitude_path.")
+        if not isinstance(altitude_path, str):
+            raise TypeError("ERROR in __init__ in Grid. Your Grid's altitude_path must be an instance of str.")
+
         self.height = height
         self.width = width
-        self.positions = []
+        self.altitude_path = altitude_path
 
         # Read file with altitude values ​​at each grid position
-        with open('./archives/altitude1.txt', 'r') as arquivo:
-            lines = arquivo.readlines()
+        if is_binary_altitude_file(altitude_path):
+            self.altitudes = load_binary_altitudes(altitude_path, height, width)
+        else:
+            self.altitudes = read_text_altitudes(altitude_path, height, width)
+
+        self.build_cells()
+
+    @classmethod
+    def from_altitudes(cls, height, width, altitudes, classifications=None):
+        """
+        Creates a Grid over altitudes already in memory (e.g. a shared memory block), without reading any altitude map.
+
+        Args:
+            height                        (int): Grid's height.
+            width                         (int): Grid's width.
+            altitudes  (array[int] | memoryview): Altitude (Z) of every cell by flat index, height * width int32 values.
+            classifications (bytearray | memoryview): Classification code of every cell. New "none" cells if None.
+
+        Returns:
+            Grid: New Grid using "altitudes" (and "classifications") without copying them.
+
+        Raises:
+            ValueError: If "height", "width" are invalid or "altitudes", "classifications" don't have height * width values.
+            TypeError: If "height", "width" are not instances of int.
+        """
+
+        # Sanity Check #
+        if (height is None) or (height < 0) or (width is None) or (width < 0):
+            raise ValueError("ERROR in from_altitudes in Grid. Your Grid must have a valid height and width.")
+        if (not isinstance(height, int)) or (not isinstance(width, int)):
+            raise TypeError("ERROR in from_altitudes in Grid. Your Grid's height and width must be instances of int.")
+
+        if (altitudes is None) or (len(altitudes) != height * width):
+            raise ValueError("ERROR in from_altitudes in Grid. Your Grid must have exactly one altitude per cell.")
+        if (classifications is not None) and (len(classifications) != height * width):
+            raise ValueError("ERROR in from_altitudes in Grid. Your Grid must have exactly one classification per cell.")
+
+        grid = cls.__new__(cls)
+        grid.height = height
+        grid.width = width
+        grid.altitude_path = None
+        grid.altitudes = altitudes
+        grid.build_cells()
+
+        if classifications is not None:
+            grid.classifications = classifications
+
+        return grid
+
+    def build_cells(self):
+        """
+        Creates every cell's classification and the lazy Positions, once "altitudes" is loaded. The neighbor table is built on first use.
+        """
+
+        size = self.height * self.width
+        self.classifications = bytearray(size)
+        self.last_classifications = bytearray(size)
+        self.dirty_cells = set()
+        self.drone_cells = {}
+        self.cell_drones = {}
+        self.positions = GridPositions(self)
+        self.terrain_version = 0
+
+    def __getattr__(self, name):
+        # Only called for missing attributes: the neighbor table's arrays, before their first use
+        if name in ("neighbor_offsets", "neighbor_directions", "neighbor_distances", "neighbor_steps"):
+            self.build_neighbor_table()
+            return self.__dict__[name]
+
+        raise AttributeError(f"'Grid' object has no attribute '{name}'")
+
+    def build_neighbor_table(self):
+        """
+        Builds the neighbor table (CSR layout) of every Grid's cell. Each cell's neighbors are then found without any bounds check.
+        """
+
+        height = self.height
+        width = self.width
+        deltas = Grid.NEIGHBOR_DELTAS
+
+        offsets = array('i', [0])
+        directions = bytearray()
+
+        # Every inner cell of a row (all but its first and last one) has the same directions, so they are one repeated block.
+        # Only the two edge cells are filled cell by cell
+        inner = max(width - 2, 0)
+        for x in range(0, height):
+            row_directions = [direction for direction, (delta_x, _) in enumerate(deltas) if 0 <= (x + delta_x) < height]
+
+            for y in range(0, width, max(width - 1, 1)):
+                directions.extend(direction for direction in row_directions if 0 <= (y + deltas[direction][1]) < width)
+                offsets.append(len(directions))
+
+                # The last cell's slots go after the inner ones
+                if (y == 0) and (inner > 0):
+                    count = len(row_directions)
+                    directions.extend(bytes(row_directions) * inner)
+                    offsets.extend(range(offsets[-1] + count, offsets[-1] + (count * inner) + 1, count))
+
+        self.neighbor_offsets = offsets
+        self.neighbor_directions = directions
+        self.neighbor_distances = directions.translate(bytes(abs(delta_x) + abs(delta_y) for delta_x, delta_y in deltas).ljust(256, b"\0"))
+        self.neighbor_steps = tuple((delta_x * width) + delta_y for delta_x, delta_y in deltas)
+
+    def get_slot_cells(self):
+        """
+        Returns the cell of every slot of the neighbor table, in slot order.
+
+        Returns:
+            iterator[int]: Index of the cell each slot belongs to.
+        """
 
-        for x in range(0, self.height):
-            for y in range(0, self.width):
-                z = int (lines[(x * self.width) + y].strip())
-                self.positions.append(Position(x, y, z))
+        offsets = self.neighbor_offsets
+        return chain.from_iterable(map(repeat, range(self.height * self.width), map(sub, offsets[1:], offsets[:-1])))
+
+    def get_slot_neighbors(self):
+        """
+        Returns the neighbor of every slot of the neighbor table, in slot order.
+
+        Returns:
+            iterator[int]: Index of the neighbor each slot leads to.
+        """
+
+        return map(add, self.get_slot_cells(), map(self.neighbor_steps.__getitem__, self.neighbor_directions))
 
     def check_position_in_grid(self, position):
         """
@@ -65,7 +215,7 @@ class Grid:
             raise TypeError("ERROR in check_position_in_grid in Grid. Only Position instances can be checked.")
 
         #                                Validating X                                                    Validating Y
-        is_valid = ( (( position.X >= 0 ) and ( position.X < self.width )) and (( position.Y >= 0 ) and ( position.Y < self.height )) )
+        is_valid = ( (( position.X >= 0 ) and ( position.X < self.height )) and (( position.Y >= 0 ) and ( position.Y < self.width )) )
 
         return is_valid
 
@@ -99,11 +249,31 @@ class Grid:
         
 
         return_position = None
-        if ( self.check_position_in_grid(Position(X,Y, 0)) ):
+        if ( (0 <= X < self.height) and (0 <= Y < self.width) ):
             return_position = self.positions[(X * self.width) + Y]
 
         return return_position
     
+    def get_position_index(self, position):
+        """
+        Gets flat index of "position" in Grid (index = (X * width) + Y).
+
+        Args:
+            position (Position): Desired "position" to get the index.
+
+        Returns:
+            int: "position"'s index in Grid.
+
+        Raises:
+            TypeError: If "position" is not an instance of Position.
+        """
+
+        # Sanity Check #
+        if not isinstance(position, Position):
+            raise TypeError("ERROR in get_position_index in Grid. Only Position instances have an index.")
+
+        return (position.X * self.width) + position.Y
+
     def get_neighbors(self, position):
         """
         Returns "position"'s neighbors (neighborhood of 8) positions as a list.
@@ -119,48 +289,132 @@ class Grid:
         if not isinstance(position, Position):
             raise TypeError("ERROR in check_position_in_grid in Grid. Only Position instances can be checked.")
 
+        index = (position.X * self.width) + position.Y
+        positions = self.positions
+        neighbor_directions = self.neighbor_directions
+        neighbor_steps = self.neighbor_steps
+
         neighbors = []
-        position_x = position.X
-        position_y = position.Y
+        for slot in range(self.neighbor_offsets[index], self.neighbor_offsets[index + 1]):
+            neighbors.append(positions[index + neighbor_steps[neighbor_directions[slot]]])
 
-        ## X-1 Y-1
-        position_neighbor = self.get_position_in_grid((position_x - 1), position_y - 1)
-        if position_neighbor != None: neighbors.append(position_neighbor)
+        return neighbors
+
+    def set_altitude(self, X, Y, Z):
+        """
+        Changes the altitude of Grid's Position with specified XY. Every change increments "terrain_version", so anything computed from the terrain can be invalidated.
+
+        Args:
+            X (int): Position's X value.
+            Y (int): Position's Y value.
+            Z (int): Position's new altitude.
+
+        Raises:
+            ValueError: If attributes "X", "Y", "Z" are None or "X", "Y" are outside Grid.
+            TypeError: If attributes "X", "Y", "Z" have incorrect types.
+        """
 
-        ## X-1 Y
-        position_neighbor = self.get_position_in_grid((position_x - 1), position_y)
-        if position_neighbor != None: neighbors.append(position_neighbor)
+        # Sanity Check #
+        if (Z is None):
+            raise ValueError("ERROR in set_altitude in Grid. Your Position must have a valid Z value.")
+        if (not isinstance(Z, int)):
+            raise TypeError("ERROR in set_altitude in Grid. Your Position's Z must be an instance of int.")
 
-        ## X-1 Y+1
-        position_neighbor = self.get_position_in_grid((position_x - 1), position_y + 1)
-        if position_neighbor != None: neighbors.append(position_neighbor)
+        position = self.get_position_in_grid(X, Y)
+        if position is None:
+            raise ValueError("ERROR in set_altitude in Grid. Your Position must be inside Grid.")
 
-        ## X   Y-1
-        position_neighbor = self.get_position_in_grid((position_x), position_y - 1)
-        if position_neighbor != None: neighbors.append(position_neighbor)
+        self.altitudes[position.index] = Z
+        self.terrain_version += 1
 
-        ## X   Y+1
-        position_neighbor = self.get_position_in_grid((position_x), position_y + 1)
-        if position_neighbor != None: neighbors.append(position_neighbor)
+    def occupy_cell(self, drone_id, index):
+        """
+        Marks cell "index" as occupied by drone "drone_id". The cell's own classification is saved only when its first drone arrives,
+        so overlapping drones never overwrite it. No validation is done, "index" must be inside Grid.
 
-        ## X+1 Y-1
-        position_neighbor = self.get_position_in_grid((position_x + 1), position_y - 1)
-        if position_neighbor != None: neighbors.append(position_neighbor)
+        Args:
+            drone_id (int): Drone's id.
+            index    (int): Cell's flat index.
+        """
 
-        ## X+1 Y
-        position_neighbor = self.get_position_in_grid((position_x + 1), position_y)
-        if position_neighbor != None: neighbors.append(position_neighbor)
+        occupants = self.cell_drones.get(index)
+        if occupants is None:
+            occupants = self.cell_drones[index] = set()
+            self.last_classifications[index] = self.classifications[index]
+            self.classifications[index] = Position.CLASSIFICATIONS.index("drone")
+            self.dirty_cells.add(index)
 
-        ## X+1 Y+1
-        position_neighbor = self.get_position_in_grid((position_x + 1), position_y + 1)
-        if position_neighbor != None: neighbors.append(position_neighbor)
+        occupants.add(drone_id)
+        self.drone_cells.setdefault(drone_id, set()).add(index)
 
-        return neighbors
+    def release_cell(self, drone_id, index):
+        """
+        Removes drone "drone_id" from cell "index". The cell's own classification is restored when its last drone leaves.
+
+        Args:
+            drone_id (int): Drone's id.
+            index    (int): Cell's flat index.
+        """
+
+        occupants = self.cell_drones.get(index)
+        if (occupants is None) or (drone_id not in occupants):
+            return
+
+        occupants.discard(drone_id)
+        self.drone_cells[drone_id].discard(index)
+        if len(occupants) == 0:
+            del self.cell_drones[index]
+            self.classifications[index] = self.last_classifications[index]
+            self.dirty_cells.add(index)
+
+    def move_drone(self, drone_id, X, Y):
+        """
+        Moves drone "drone_id" to Grid's Position with specified XY, leaving every cell it occupied before. Costs O(1) per cell left.
+
+        Args:
+            drone_id (int): Drone's id.
+            X        (int): Position's X value.
+            Y        (int): Position's Y value.
+
+        Raises:
+            ValueError: If attributes "X", "Y" are None or outside Grid.
+            TypeError: If attributes "X", "Y" have incorrect types.
+        """
+
+        position = self.get_position_in_grid(X, Y)
+        if position is None:
+            raise ValueError("ERROR in move_drone in Grid. Your drone must move inside Grid.")
+
+        index = position.index
+        for occupied in list(self.drone_cells.get(drone_id, ())):
+            if occupied != index:
+                self.release_cell(drone_id, occupied)
+
+        self.occupy_cell(drone_id, index)
+
+    def remove_drone(self, drone_id):
+        """
+        Removes drone "drone_id" from every cell it occupies.
+
+        Args:
+            drone_id (int): Drone's id.
+        """
+
+        for occupied in list(self.drone_cells.pop(drone_id, ())):
+            occupants = self.cell_drones[occupied]
+            occupants.discard(drone_id)
+            if len(occupants) == 0:
+                del self.cell_drones[occupied]
+                self.classifications[occupied] = self.last_classifications[occupied]
+                self.dirty_cells.add(occupied)
 
     def grid_update_position_classification(self):
-        for position in self.positions:
-            if position.classification == "drone":
-                position.set_position_classification(position.last_classification)
+        """
+        Removes every drone from the Grid, restoring the cells they occupied. Only occupied cells are visited.
+        """
+
+        for drone_id in list(self.drone_cells):
+            self.remove_drone(drone_id)
 
     def get_grid_info(self):
         """
@@ -171,6 +425,16 @@ class Grid:
         """
         return self.__dict__
 
+    def get_label_widths(self):
+        """
+        Gets how many characters the rows' and the columns' indexes take in the board (see __str__): atleast 2, more on larger Grids.
+
+        Returns:
+            tuple[int, int]: Width of the rows' indexes and of the columns' indexes.
+        """
+
+        return max(2, len(str(self.height - 1))), max(2, len(str(self.width - 1)))
+
     def __str__(self):
         """
         Returns stringfied representation of a Grid instance.
@@ -189,22 +453,20 @@ class Grid:
         #     return_string += "\n"
         # return return_string
 
-        return_string = "   "  # Espaço inicial para alinhar com os índices das linhas
+        # Espaço inicial para alinhar com os índices das linhas, seguido do cabeçalho com os índices das colunas
+        row_width, column_width = self.get_label_widths()
+        lines = [" " * (row_width + 1) + "".join([f"{j:>{column_width}} " for j in range(self.width)])]
 
-        # Adicionar cabeçalho com os índices das colunas
-        for j in range(self.width):
-            return_string += f"{j:>2} "  # Formata os índices das colunas com largura fixa
-        return_string += "\n"
-
-        # Construir as linhas da grid
+        # Construir as linhas da grid, cada célula formatada uma única vez por classificação
+        cells = [f"{symbol:>{column_width}}|" for symbol in Position.SYMBOLS]
+        classifications = self.classifications
+        width = self.width
         for i in range(self.height):
-            return_string += f"{i:>2}|"  # Adiciona o índice da linha no início
-            for j in range(self.width):
-                value = str(self.positions[(i * self.width) + j])  # Obtém o valor na posição
-                return_string += f"{value:>2}|"  # Adiciona o valor com largura fixa
-            return_string += "\n"
+            row = classifications[i * width:(i + 1) * width]
+            lines.append(f"{i:>{row_width}}|" + "".join(map(cells.__getitem__, row)))
 
-        return return_string
+        lines.append("")
+        return "\n".join(lines)
 
 class Position:
     """
@@ -218,6 +480,12 @@ class Position:
         last_classification     (str): Position's last classification. Can be "client", "base", "drone" or "none"
     """
 
+    __slots__ = ("X", "Y", "Z", "classification", "last_classification")
+
+    # Classifications by code, as stored in Grid's classification arrays, and their symbols
+    CLASSIFICATIONS = ("none", "client", "base", "drone")
+    SYMBOLS = ("-", "C", "B", "D")
+
     def __init__(self, X, Y, Z):
         """
         Initiates a new Position instance with specified values. Null or invalid values are considered as an error (raises ValueError TypeError).
@@ -270,7 +538,9 @@ class Position:
         if (not isinstance(classification, str)):
             raise TypeError("ERROR in __init__ in Position. Your Position's classification must be an instance of str.")
         
-        self.last_classification = self.classification
+        # A drone over another drone keeps what was under the first one
+        if (classification != "drone") or (self.classification != "drone"):
+            self.last_classification = self.classification
         self.classification = classification
 
     def get_position_info(self):
@@ -281,7 +551,7 @@ class Position:
             dict: Position's attributes as a dictionary.
         """
 
-        return self.__dict__
+        return {"X": self.X, "Y": self.Y, "Z": self.Z, "classification": self.classification, "last_classification": self.last_classification}
 
     def __str__(self):
         """
@@ -298,4 +568,120 @@ class Position:
         elif   (self.classification == "none" ): return_string = "-"
 
         return return_string
-    
\ No newline at end of file
+
+
+class GridPosition(Position):
+    """
+    GridPosition class. Lightweight view of a Grid's cell, created on demand. Z and classifications are read from and written to Grid's arrays.
+
+    Attributes:
+        grid  (Grid): Grid that owns the cell.
+        index  (int): Cell's flat index (index = (X * width) + Y).
+        X      (int): Position's X value.
+        Y      (int): Position's Y value.
+    """
+
+    # X and Y are Position's slots. Z and the classifications are properties over Grid's arrays, their slots stay unused
+    __slots__ = ("grid", "index")
+
+    def __init__(self, grid, index):
+        """
+        Initiates a new GridPosition view. No validation is done, "index" must be inside "grid".
+
+        Args:
+            grid  (Grid): Grid that owns the cell.
+            index  (int): Cell's flat index.
+        """
+
+        self.grid = grid
+        self.index = index
+        self.X, self.Y = divmod(index, grid.width)
+
+    @property
+    def Z(self):
+        return self.grid.altitudes[self.index]
+
+    @Z.setter
+    def Z(self, Z):
+        self.grid.set_altitude(self.X, self.Y, Z)
+
+    @property
+    def classification(self):
+        return Position.CLASSIFICATIONS[self.grid.classifications[self.index]]
+
+    @classification.setter
+    def classification(self, classification):
+        self.grid.classifications[self.index] = Position.CLASSIFICATIONS.index(classification)
+        self.grid.dirty_cells.add(self.index)
+
+    @property
+    def last_classification(self):
+        return Position.CLASSIFICATIONS[self.grid.last_classifications[self.index]]
+
+    @last_classification.setter
+    def last_classification(self, classification):
+        self.grid.last_classifications[self.index] = Position.CLASSIFICATIONS.index(classification)
+
+    def set_position_classification(self, classification):
+        """
+        Sets position's classification with "classification". "drone" marks the cell as occupied by an anonymous drone (see Grid.occupy_cell).
+        An occupied cell stays "drone": any other classification is kept as the one restored when its last drone leaves.
+
+        Args:
+            classification (str): Classification
+
+        Raises:
+            ValueError: If arg "classification" isn't "client", "base", "drone" or "none".
+        """
+
+        if classification == "drone":
+            self.grid.occupy_cell(None, self.index)
+        elif self.index in self.grid.cell_drones:
+            # Sanity Check #
+            if classification not in Position.CLASSIFICATIONS:
+                raise ValueError("ERROR in set_position_classification in GridPosition. Your Position must have a valid classification ('client', 'base' or 'none').")
+
+            self.last_classification = classification
+        else:
+            Position.set_position_classification(self, classification)
+
+    def __eq__(self, other):
+        if not isinstance(other, GridPosition):
+            return NotImplemented
+        return (self.grid is other.grid) and (self.index == other.index)
+
+    def __hash__(self):
+        return hash((id(self.grid), self.index))
+
+
+class GridPositions:
+    """
+    GridPositions class. Read-only sequence of a Grid's positions, indexed by flat index. GridPosition views are created on demand.
+
+    Attributes:
+        grid (Grid): Grid that owns the positions.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __len__(self):
+        return len(self.grid.altitudes)
+
+    def __getitem__(self, index):
+        size = len(self.grid.altitudes)
+        if isinstance(index, slice):
+            return [GridPosition(self.grid, i) for i in range(*index.indices(size))]
+
+        if index < 0:
+            index += size
+        if not (0 <= index < size):
+            raise IndexError("ERROR in __getitem__ in GridPositions. Index out of Grid.")
+
+        return GridPosition(self.grid, index)
+
+    def __iter__(self):
+        grid = self.grid
+        for index in range(len(grid.altitudes)):
+            yield GridPosition(grid, index)
+
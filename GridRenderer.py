@@ -0,0 +1,113 @@
+from Grid import Grid, Position
+
+import sys
+
+class GridRenderer:
+    """
+    GridRenderer class. Draws a Grid on an ANSI terminal, redrawing only the cells that changed since the last frame.
+
+    The whole board (see Grid.__str__) is drawn once. Every later frame moves the cursor to each of Grid's dirty cells and
+    rewrites its symbol, so a frame costs O(changed cells) instead of O(cells). Text is written below the board, in a status
+    area that is cleared on every frame.
+
+    Attributes:
+        grid         (Grid): Drawn Grid.
+        stream  (TextIO): Terminal the board is written to.
+        drawn        (bool): True once the whole board was drawn.
+        row_prefix    (int): Characters before the first cell of a row (row's index and "|").
+        cell_width    (int): Characters of each cell (symbol right aligned under its column's index, then "|").
+    """
+
+    # Board lines above the first row of cells (columns' header)
+    HEADER_LINES = 1
+
+    def __init__(self, grid, stream=None):
+        """
+        Initiates a new GridRenderer instance. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            grid          (Grid): Grid to be drawn.
+            stream     (TextIO): Terminal the board is written to. sys.stdout, if None.
+
+        Raises:
+            ValueError: If "grid" is None.
+            TypeError: If "grid" is not an instance of Grid.
+        """
+
+        # Sanity Check #
+        if (grid is None):
+            raise ValueError("ERROR in __init__ in GridRenderer. Your GridRenderer must have a valid grid.")
+        if (not isinstance(grid, Grid)):
+            raise TypeError("ERROR in __init__ in GridRenderer. Your grid must be an instance of Grid.")
+
+        self.grid = grid
+        self.stream = stream if stream is not None else sys.stdout
+        self.drawn = False
+
+        # Same widths as the whole board's, which grow with Grid's height and width (see Grid.get_label_widths)
+        row_width, column_width = grid.get_label_widths()
+        self.row_prefix = row_width + 1
+        self.cell_width = column_width + 1
+
+    def get_status_line(self):
+        """
+        Returns the terminal line (1-based) right below the board.
+        """
+
+        return GridRenderer.HEADER_LINES + self.grid.height + 1
+
+    def draw_board(self):
+        """
+        Clears the terminal and draws the whole board. Every dirty cell is then up to date.
+        """
+
+        self.grid.dirty_cells.clear()
+        self.stream.write("\x1b[H\x1b[2J" + str(self.grid))
+        self.drawn = True
+
+    def draw_changes(self):
+        """
+        Redraws only Grid's dirty cells, each with a single cursor move.
+        """
+
+        grid = self.grid
+        width = grid.width
+        classifications = grid.classifications
+        symbols = Position.SYMBOLS
+
+        row_prefix = self.row_prefix
+        cell_width = self.cell_width
+
+        parts = []
+        for index in sorted(grid.dirty_cells):
+            X, Y = divmod(index, width)
+            line = GridRenderer.HEADER_LINES + X + 1
+            column = row_prefix + (Y * cell_width) + cell_width - 1
+            parts.append(f"\x1b[{line};{column}H{symbols[classifications[index]]}")
+
+        grid.dirty_cells.clear()
+        self.stream.write("".join(parts))
+
+    def render(self, status=""):
+        """
+        Draws a frame: the whole board the first time, only the dirty cells afterwards. "status" is written below the board.
+
+        Args:
+            status (str): Text shown below the board.
+        """
+
+        if self.drawn:
+            self.draw_changes()
+        else:
+            self.draw_board()
+
+        # Clears whatever was below the board and leaves the cursor there
+        self.stream.write(f"\x1b[{self.get_status_line()};1H\x1b[J{status}")
+        self.stream.flush()
+
+    def invalidate(self):
+        """
+        Forces the next frame to draw the whole board (e.g. after something else was printed over it).
+        """
+
+        self.drawn = False
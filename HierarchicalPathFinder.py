@@ -0,0 +1,561 @@
+from PathFinder import PathFinder
+
+from array import array
+import heapq
+import os
+import struct
+import sys
+import zlib
+
+# Abstract graph file layout: a 32 bytes header followed by little-endian arrays.
+#   magic         (4 bytes): b"DHPA"
+#   version        (uint32): GRAPH_VERSION
+#   height         (uint32): Grid's height.
+#   width          (uint32): Grid's width.
+#   cluster_size   (uint32): Cells per cluster's side.
+#   checksum       (uint32): CRC-32 of Grid's altitudes the graph was built for.
+#   nodes          (uint32): Number of abstract nodes.
+#   edges          (uint32): Number of abstract edges.
+# Then node_cells (int32 * nodes), edge_offsets (int32 * (nodes + 1)), edge_targets (int32 * edges) and edge_costs (float64 * edges).
+GRAPH_MAGIC = b"DHPA"
+GRAPH_VERSION = 1
+GRAPH_HEADER = struct.Struct("<4sIIIIIII")
+
+class HierarchicalPathFinder:
+    """
+    HierarchicalPathFinder class. HPA* search engine: Grid is split into square clusters, and the cells where adjacent
+    clusters can be crossed (entrances) become the nodes of a small abstract graph. Entrances of the same cluster are linked
+    by their shortest path inside the cluster, precomputed once.
+
+    A long route is searched on the abstract graph (with start and goal linked to their clusters' entrances), then refined
+    into cells with PathFinder between consecutive abstract nodes. Routes are near optimal: they cross clusters through entrances.
+    Short routes (start and goal at most 2 clusters apart) are searched directly with PathFinder.
+
+    The abstract graph is cached to disk next to the altitude map ("<altitude_path>.hpa<cluster_size>") and reused while the altitudes match.
+    Costs are kept in distance units, since moving costs distance / velocity for every velocity. In PathFinder's altitude aware
+    mode they are PathFinder's slot_costs, and borders are only crossed between cells that aren't no-fly. Each drone class then
+    has its own graph, kept in memory and cached to its own file ("<altitude_path>.hpa<cluster_size>.<maximum_altitude>").
+
+    Attributes:
+        path_finder             (PathFinder): Refines abstract routes and searches short ones.
+        grid                          (Grid): Grid in which paths are searched.
+        cluster_size                   (int): Cells per cluster's side.
+        clusters_height                (int): Number of clusters along X.
+        clusters_width                 (int): Number of clusters along Y.
+        cell_clusters           (array[int]): Cluster of every cell, by flat index.
+        node_cells              (array[int]): Cell of every abstract node.
+        cluster_nodes      (list[list[int]]): Abstract nodes of every cluster.
+        edge_offsets            (array[int]): Edges of node i are stored from edge_offsets[i] to edge_offsets[i + 1] (exclusive).
+        edge_targets            (array[int]): Target node of every edge.
+        edge_costs            (array[float]): Cost (distance) of every edge.
+        version   (tuple[int, int, float]): Grid's terrain_version, PathFinder's cost_model_version and drone_class the graph was built with.
+        loaded_from_disk              (bool): True if the graph was read from its cache file.
+        graphs                        (dict): Abstract graph (the attributes above) of every drone class (see PathFinder.drone_class).
+        abstract_searches              (int): Number of routes searched on the abstract graph.
+        direct_searches                (int): Number of routes searched directly with PathFinder.
+        expansions                     (int): Nodes and cells expanded by the last route's searches (abstract search and every PathFinder search).
+        heap_pushes                    (int): Entries pushed to the open sets by the last route's searches.
+    """
+
+    # Entrances longer than this get one node at each end, shorter ones a single node in the middle
+    MAXIMUM_SINGLE_ENTRANCE = 6
+
+    def __init__(self, path_finder, cluster_size=32, use_disk_cache=True):
+        """
+        Initiates a new HierarchicalPathFinder instance and builds (or loads) its abstract graph. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            path_finder (PathFinder): Refines abstract routes and searches short ones.
+            cluster_size       (int): Cells per cluster's side.
+            use_disk_cache    (bool): Read and write the abstract graph next to the altitude map.
+
+        Raises:
+            ValueError: If attributes "path_finder", "cluster_size" are either None or invalid (cluster_size lower than 2).
+            TypeError: If attributes "path_finder", "cluster_size" have incorrect types.
+        """
+
+        # Sanity Check #
+        if (path_finder is None):
+            raise ValueError("ERROR in __init__ in HierarchicalPathFinder. Your HierarchicalPathFinder must have a valid path_finder.")
+        if (not isinstance(path_finder, PathFinder)):
+            raise TypeError("ERROR in __init__ in HierarchicalPathFinder. Your path_finder must be an instance of PathFinder.")
+
+        if (cluster_size is None) or (not isinstance(cluster_size, int)):
+            raise TypeError("ERROR in __init__ in HierarchicalPathFinder. Your cluster_size must be an instance of int.")
+        if (cluster_size < 2):
+            raise ValueError("ERROR in __init__ in HierarchicalPathFinder. Your cluster_size must be atleast 2.")
+
+        grid = path_finder.grid
+
+        self.path_finder = path_finder
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.use_disk_cache = use_disk_cache
+        self.clusters_height = -(-grid.height // cluster_size)
+        self.clusters_width = -(-grid.width // cluster_size)
+        self.loaded_from_disk = False
+        self.abstract_searches = 0
+        self.direct_searches = 0
+        self.expansions = 0
+        self.heap_pushes = 0
+        self.graphs = {}
+
+        cell_clusters = array('i')
+        for x in range(grid.height):
+            row_cluster = (x // cluster_size) * self.clusters_width
+            cell_clusters.extend([row_cluster + (y // cluster_size) for y in range(grid.width)])
+        self.cell_clusters = cell_clusters
+
+        self.refresh()
+
+    @property
+    def cost_model_version(self):
+        return self.path_finder.cost_model_version
+
+    @property
+    def drone_class(self):
+        return self.path_finder.drone_class
+
+    def get_current_version(self):
+        """
+        Returns the current terrain and cost model versions, and the selected drone class.
+
+        Returns:
+            tuple[int, int, float]: Grid's terrain_version, PathFinder's cost_model_version and drone_class.
+        """
+
+        return (self.grid.terrain_version, self.path_finder.cost_model_version, self.path_finder.drone_class)
+
+    def get_cache_path(self):
+        """
+        Returns the abstract graph's cache file path. None, if Grid has no altitude map file or the disk cache is off.
+        """
+
+        if (not self.use_disk_cache) or (self.grid.altitude_path is None):
+            return None
+
+        # Each drone class' graph has its own file, in altitude aware mode
+        if self.path_finder.drone_class is not None:
+            return f"{self.grid.altitude_path}.hpa{self.cluster_size}.{self.path_finder.drone_class:g}"
+
+        return f"{self.grid.altitude_path}.hpa{self.cluster_size}"
+
+    def get_checksum(self):
+        """
+        Returns the CRC-32 of Grid's altitudes.
+        """
+
+        return zlib.crc32(memoryview(self.grid.altitudes).cast('B'))
+
+    def refresh(self):
+        """
+        Builds the abstract graph, or reads it from disk, if it is missing or the terrain or the cost model changed since it was built.
+        A graph already built for the selected drone class is reused.
+        """
+
+        self.path_finder.refresh_altitude_tables()
+        version = self.get_current_version()
+        if getattr(self, "version", None) == version:
+            return
+
+        graph = self.graphs.get(self.path_finder.drone_class)
+        if (graph is not None) and (graph[-1] == version):
+            self.node_cells, self.cluster_nodes, self.edge_offsets, self.edge_targets, self.edge_costs, self.loaded_from_disk, self.version = graph
+            return
+
+        cache_path = self.get_cache_path()
+        unchanged_terrain = (self.grid.terrain_version == 0)
+
+        if unchanged_terrain and (cache_path is not None) and os.path.exists(cache_path) and self.load(cache_path):
+            self.loaded_from_disk = True
+        else:
+            self.build()
+            self.loaded_from_disk = False
+            if unchanged_terrain and (cache_path is not None):
+                self.save(cache_path)
+
+        self.version = version
+        self.graphs[self.path_finder.drone_class] = (self.node_cells, self.cluster_nodes, self.edge_offsets, self.edge_targets, self.edge_costs, self.loaded_from_disk, self.version)
+
+    def get_cluster_bounds(self, cluster):
+        """
+        Returns cluster's cells range as (first X, last X + 1, first Y, last Y + 1).
+        """
+
+        cluster_x, cluster_y = divmod(cluster, self.clusters_width)
+        size = self.cluster_size
+        return (cluster_x * size, min(self.grid.height, (cluster_x + 1) * size), cluster_y * size, min(self.grid.width, (cluster_y + 1) * size))
+
+    def find_entrances(self):
+        """
+        Finds the entrance cells between every pair of adjacent clusters.
+
+        Returns:
+            list[tuple[int, int]]: Pairs of adjacent cells, one on each side of a clusters' border.
+        """
+
+        grid = self.grid
+        width = grid.width
+        size = self.cluster_size
+        is_no_fly = self.path_finder.is_no_fly
+        pairs = []
+
+        def add_entrance(cells):
+            if len(cells) <= HierarchicalPathFinder.MAXIMUM_SINGLE_ENTRANCE:
+                pairs.append(cells[len(cells) // 2])
+            else:
+                pairs.append(cells[0])
+                pairs.append(cells[-1])
+
+        def add_border(cells):
+            # cells: pairs of facing cells along one border. Every run of pairs that can be crossed (no no-fly cell) is an entrance
+            run = []
+            for cell_pair in cells:
+                if is_no_fly(cell_pair[0]) or is_no_fly(cell_pair[1]):
+                    if run:
+                        add_entrance(run)
+                    run = []
+                else:
+                    run.append(cell_pair)
+            if run:
+                add_entrance(run)
+
+        # Borders between clusters stacked along X (horizontal borders) and along Y (vertical borders)
+        for x in range(size, grid.height, size):
+            for y_start in range(0, width, size):
+                add_border([(((x - 1) * width) + y, (x * width) + y) for y in range(y_start, min(width, y_start + size))])
+
+        for y in range(size, width, size):
+            for x_start in range(0, grid.height, size):
+                add_border([((x * width) + y - 1, (x * width) + y) for x in range(x_start, min(grid.height, x_start + size))])
+
+        return pairs
+
+    def cluster_distances(self, source, targets, reverse=False):
+        """
+        Dijkstra from cell "source" that never leaves its cluster, stopping when every target is settled.
+
+        Args:
+            source         (int): Source cell's index.
+            targets  (set[int]): Cells' indexes, in source's cluster.
+            reverse       (bool): Price the routes from each target to "source" instead (see PathFinder.reverse_slot_costs).
+
+        Returns:
+            dict{int: float}: Distance from "source" to each reachable target (or from each target to "source", if "reverse").
+        """
+
+        grid = self.grid
+        neighbor_offsets = grid.neighbor_offsets
+        neighbor_directions = grid.neighbor_directions
+        neighbor_steps = grid.neighbor_steps
+        slot_costs = self.path_finder.reverse_slot_costs if reverse else self.path_finder.slot_costs
+        cell_clusters = self.cell_clusters
+        cluster = cell_clusters[source]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        distance = {source: 0.0}
+        remaining = set(targets)
+        found = {}
+        open_set = [(0.0, source)]
+
+        while open_set and remaining:
+            current_distance, current = heappop(open_set)
+            if current_distance > distance[current]:
+                continue
+
+            if current in remaining:
+                remaining.discard(current)
+                found[current] = current_distance
+
+            for slot in range(neighbor_offsets[current], neighbor_offsets[current + 1]):
+                neighbor = current + neighbor_steps[neighbor_directions[slot]]
+                if cell_clusters[neighbor] != cluster:
+                    continue
+
+                tentative_distance = current_distance + slot_costs[slot]
+                if tentative_distance < distance.get(neighbor, float('inf')):
+                    distance[neighbor] = tentative_distance
+                    heappush(open_set, (tentative_distance, neighbor))
+
+        return found
+
+    def build(self):
+        """
+        Builds the abstract graph: entrance nodes, edges across clusters' borders and edges inside each cluster.
+        """
+
+        grid = self.grid
+        width = grid.width
+        cell_clusters = self.cell_clusters
+        penalties = self.path_finder.cell_penalties
+
+        node_ids = {}
+        node_cells = array('i')
+        adjacency = []
+
+        def get_node(cell):
+            node = node_ids.get(cell)
+            if node is None:
+                node = node_ids[cell] = len(node_cells)
+                node_cells.append(cell)
+                adjacency.append({})
+            return node
+
+        # Edges across borders: facing cells are neighbors, one step apart (priced by the entered cell, in altitude aware mode)
+        for first_cell, second_cell in self.find_entrances():
+            first = get_node(first_cell)
+            second = get_node(second_cell)
+            step = abs((first_cell // width) - (second_cell // width)) + abs((first_cell % width) - (second_cell % width))
+            adjacency[first][second] = step if penalties is None else step * penalties[second_cell]
+            adjacency[second][first] = step if penalties is None else step * penalties[first_cell]
+
+        cluster_nodes = [[] for _ in range(self.clusters_height * self.clusters_width)]
+        for node, cell in enumerate(node_cells):
+            cluster_nodes[cell_clusters[cell]].append(node)
+
+        # Edges inside clusters: shortest path between every pair of the cluster's entrances
+        for nodes in cluster_nodes:
+            cells = {node_cells[node]: node for node in nodes}
+            for node in nodes:
+                distances = self.cluster_distances(node_cells[node], set(cells))
+                for cell, distance in distances.items():
+                    other = cells[cell]
+                    if other != node:
+                        adjacency[node][other] = min(distance, adjacency[node].get(other, float('inf')))
+
+        edge_offsets = array('i', [0])
+        edge_targets = array('i')
+        edge_costs = array('d')
+        for edges in adjacency:
+            for target in sorted(edges):
+                edge_targets.append(target)
+                edge_costs.append(edges[target])
+            edge_offsets.append(len(edge_targets))
+
+        self.node_cells = node_cells
+        self.cluster_nodes = cluster_nodes
+        self.edge_offsets = edge_offsets
+        self.edge_targets = edge_targets
+        self.edge_costs = edge_costs
+
+    def save(self, path):
+        """
+        Writes the abstract graph to "path" (see GRAPH_HEADER).
+
+        Args:
+            path (str): Cache file's path.
+        """
+
+        arrays = [array('i', self.node_cells), array('i', self.edge_offsets), array('i', self.edge_targets), array('d', self.edge_costs)]
+        if sys.byteorder != "little":
+            for values in arrays:
+                values.byteswap()
+
+        header = GRAPH_HEADER.pack(GRAPH_MAGIC, GRAPH_VERSION, self.grid.height, self.grid.width, self.cluster_size, self.get_checksum(), len(self.node_cells), len(self.edge_targets))
+
+        try:
+            with open(path, 'wb') as arquivo:
+                arquivo.write(header)
+                for values in arrays:
+                    values.tofile(arquivo)
+        except OSError:
+            # The cache is only an optimization, a read-only directory must not stop the simulation
+            pass
+
+    def load(self, path):
+        """
+        Reads the abstract graph from "path", if it was built for this Grid, cluster size and altitudes.
+
+        Args:
+            path (str): Cache file's path.
+
+        Returns:
+            bool: True if the graph was loaded. False if the file is stale or invalid.
+        """
+
+        try:
+            with open(path, 'rb') as arquivo:
+                header = arquivo.read(GRAPH_HEADER.size)
+                if len(header) != GRAPH_HEADER.size:
+                    return False
+
+                magic, version, height, width, cluster_size, checksum, nodes, edges = GRAPH_HEADER.unpack(header)
+                if (magic, version, height, width, cluster_size) != (GRAPH_MAGIC, GRAPH_VERSION, self.grid.height, self.grid.width, self.cluster_size):
+                    return False
+                if checksum != self.get_checksum():
+                    return False
+
+                node_cells, edge_offsets, edge_targets, edge_costs = array('i'), array('i'), array('i'), array('d')
+                node_cells.fromfile(arquivo, nodes)
+                edge_offsets.fromfile(arquivo, nodes + 1)
+                edge_targets.fromfile(arquivo, edges)
+                edge_costs.fromfile(arquivo, edges)
+        except (OSError, EOFError, struct.error):
+            return False
+
+        if sys.byteorder != "little":
+            for values in (node_cells, edge_offsets, edge_targets, edge_costs):
+                values.byteswap()
+
+        cluster_nodes = [[] for _ in range(self.clusters_height * self.clusters_width)]
+        for node, cell in enumerate(node_cells):
+            cluster_nodes[self.cell_clusters[cell]].append(node)
+
+        self.node_cells = node_cells
+        self.cluster_nodes = cluster_nodes
+        self.edge_offsets = edge_offsets
+        self.edge_targets = edge_targets
+        self.edge_costs = edge_costs
+        return True
+
+    def search_abstract(self, start, goal):
+        """
+        Searches the abstract route from cell "start" to cell "goal" (A* with manhattan distance, admissible in distance units).
+
+        Args:
+            start (int): Start cell's index.
+            goal  (int): Goal cell's index.
+
+        Returns:
+            list[int]: Cells of the abstract route, from "start" to "goal". None, if "goal" can't be reached.
+        """
+
+        width = self.grid.width
+        node_cells = self.node_cells
+        edge_offsets = self.edge_offsets
+        edge_targets = self.edge_targets
+        edge_costs = self.edge_costs
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        # Start and goal are linked to their own clusters' entrances. Ids after the graph's nodes are theirs
+        start_node = len(node_cells)
+        goal_node = start_node + 1
+
+        start_nodes = self.cluster_nodes[self.cell_clusters[start]]
+        start_edges = self.cluster_distances(start, {node_cells[node] for node in start_nodes})
+        goal_nodes = self.cluster_nodes[self.cell_clusters[goal]]
+        goal_distances = self.cluster_distances(goal, {node_cells[node] for node in goal_nodes}, reverse=True)
+        goal_edges = {node: goal_distances[node_cells[node]] for node in goal_nodes if node_cells[node] in goal_distances}
+
+        goal_x, goal_y = divmod(goal, width)
+
+        def heuristic(cell):
+            x, y = divmod(cell, width)
+            return abs(x - goal_x) + abs(y - goal_y)
+
+        g_score = {start_node: 0.0}
+        came_from = {}
+        open_set = [(heuristic(start), start_node)]
+        expansions = 0
+        heap_pushes = 1
+
+        while open_set:
+            current_f, current = heappop(open_set)
+
+            if current == goal_node:
+                self.expansions += expansions
+                self.heap_pushes += heap_pushes
+                cells = [goal]
+                current = came_from[current]
+                while current != start_node:
+                    cells.append(node_cells[current])
+                    current = came_from[current]
+                cells.append(start)
+                return cells[::-1]
+
+            current_g = g_score[current]
+            current_cell = start if current == start_node else node_cells[current]
+            if current_f > current_g + heuristic(current_cell):
+                continue
+            expansions += 1
+
+            if current == start_node:
+                edges = [(node, start_edges[node_cells[node]]) for node in start_nodes if node_cells[node] in start_edges]
+            else:
+                edges = [(edge_targets[slot], edge_costs[slot]) for slot in range(edge_offsets[current], edge_offsets[current + 1])]
+                if current in goal_edges:
+                    edges.append((goal_node, goal_edges[current]))
+
+            for neighbor, cost in edges:
+                tentative_g = current_g + cost
+                if tentative_g < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = tentative_g
+                    came_from[neighbor] = current
+                    heappush(open_set, (tentative_g + heuristic(goal if neighbor == goal_node else node_cells[neighbor]), neighbor))
+                    heap_pushes += 1
+
+        self.expansions += expansions
+        self.heap_pushes += heap_pushes
+        return None
+
+    def search_cells(self, start, goal, velocity):
+        """
+        Searches the route between cells "start" and "goal" with PathFinder, adding its counters to the current route's.
+        """
+
+        path = self.path_finder.search(start, goal, velocity)
+        self.expansions += self.path_finder.expansions
+        self.heap_pushes += self.path_finder.heap_pushes
+        return path
+
+    def search(self, start, goal, velocity):
+        """
+        Searches a route between cells "start" and "goal". Same call as PathFinder.search.
+
+        Args:
+            start      (int): Start cell's index.
+            goal       (int): Goal cell's index.
+            velocity (float): Drone's velocity during the whole search.
+
+        Returns:
+            list[int]: Indexes of path's cells, from "start" to "goal". None, if "goal" can't be reached.
+        """
+
+        self.refresh()
+        self.expansions = 0
+        self.heap_pushes = 0
+
+        start_x, start_y = divmod(self.cell_clusters[start], self.clusters_width)
+        goal_x, goal_y = divmod(self.cell_clusters[goal], self.clusters_width)
+        if max(abs(start_x - goal_x), abs(start_y - goal_y)) <= 2:
+            self.direct_searches += 1
+            return self.search_cells(start, goal, velocity)
+
+        self.abstract_searches += 1
+        waypoints = self.search_abstract(start, goal)
+
+        # No-fly cells (altitude aware mode) can wall start or goal off their cluster's entrances: the route is searched directly
+        if waypoints is None:
+            self.direct_searches += 1
+            return self.search_cells(start, goal, velocity)
+
+        # Refinement: each abstract edge is searched with PathFinder, sharing the waypoints between segments
+        path = [start]
+        for segment_start, segment_goal in zip(waypoints, waypoints[1:]):
+            if segment_start == segment_goal:
+                continue
+            segment = self.search_cells(segment_start, segment_goal, velocity)
+            if segment is None:
+                return None
+            path.extend(segment[1:])
+
+        return path
+
+    def get_hierarchical_path_finder_info(self):
+        """
+        Gets HierarchicalPathFinder's graph size and counters.
+
+        Returns:
+            dict: Cluster size, abstract nodes and edges, whether the graph came from disk and searches by kind as a dictionary.
+        """
+
+        return {
+            "cluster_size": self.cluster_size,
+            "nodes": len(self.node_cells),
+            "edges": len(self.edge_targets),
+            "loaded_from_disk": self.loaded_from_disk,
+            "abstract_searches": self.abstract_searches,
+            "direct_searches": self.direct_searches,
+        }
@@ -0,0 +1,210 @@
+from collections import defaultdict
+from contextlib import nullcontext
+import cProfile
+import json
+import statistics
+import time
+
+def summarize_timings(timings):
+    """
+    Summarizes per call timings.
+
+    Args:
+        timings (list[float]): Duration of every call, in seconds.
+
+    Returns:
+        dict: Number of calls, total, mean, median, 95th percentile and maximum duration.
+    """
+
+    if len(timings) == 0:
+        return {"calls": 0}
+
+    ordered = sorted(timings)
+    return {
+        "calls": len(ordered),
+        "total_seconds": sum(ordered),
+        "mean_seconds": statistics.fmean(ordered),
+        "p50_seconds": ordered[len(ordered) // 2],
+        "p95_seconds": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max_seconds": ordered[-1],
+    }
+
+
+class PhaseTimer:
+    """
+    PhaseTimer class. Context manager adding the time spent in its block to one of Instrumentation's phases.
+    """
+
+    __slots__ = ("phases", "name", "start_time")
+
+    def __init__(self, phases, name):
+        self.phases = phases
+        self.name = name
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        phase = self.phases[self.name]
+        phase[0] += 1
+        phase[1] += time.perf_counter() - self.start_time
+        return False
+
+
+class Instrumentation:
+    """
+    Instrumentation class. Opt-in counters, phase timers and per query search statistics of a simulation run.
+
+    While disabled, phase() hands out a shared no-op context manager and nothing is recorded, so the hot path only pays an
+    attribute check. Reports are exported as JSON (see write) and, when profiling, as cProfile/pstats dumps (see dump_profile).
+
+    Attributes:
+        enabled                       (bool): True if counters and timers are recorded.
+        counters            (dict{str: int}): Named event counters (e.g. "route_cache_hits").
+        phases    (dict{str: list[int, float]}): Number of calls and total seconds of each phase.
+        queries                  (list[dict]): Statistics of every route query: cells, velocity, cache hit, A* expansions and heap pushes.
+        maximum_queries                (int): Maximum number of queries kept. Later ones are only counted.
+        profiler          (cProfile.Profile): Running profiler. None, if not profiling.
+    """
+
+    NO_PHASE = nullcontext()
+
+    def __init__(self, enabled=False, maximum_queries=100000):
+        """
+        Initiates a new Instrumentation instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            enabled          (bool): Record counters and timers from the start.
+            maximum_queries   (int): Maximum number of queries kept.
+
+        Raises:
+            ValueError: If "maximum_queries" is either None or invalid (Negative value).
+            TypeError: If "maximum_queries" is not an instance of int.
+        """
+
+        # Sanity Check #
+        if (maximum_queries is None) or (maximum_queries < 0):
+            raise ValueError("ERROR in __init__ in Instrumentation. Your Instrumentation must have a valid maximum_queries.")
+        if (not isinstance(maximum_queries, int)):
+            raise TypeError("ERROR in __init__ in Instrumentation. Your Instrumentation's maximum_queries must be an instance of int.")
+
+        self.enabled = enabled
+        self.counters = defaultdict(int)
+        self.phases = defaultdict(lambda: [0, 0.0])
+        self.queries = []
+        self.maximum_queries = maximum_queries
+        self.profiler = None
+
+    def phase(self, name):
+        """
+        Times a block of code as phase "name": "with instrumentation.phase(name): ...".
+
+        Args:
+            name (str): Phase's name.
+
+        Returns:
+            PhaseTimer: Context manager timing the block. A shared no-op one, if disabled.
+        """
+
+        if not self.enabled:
+            return Instrumentation.NO_PHASE
+
+        return PhaseTimer(self.phases, name)
+
+    def count(self, name, amount=1):
+        """
+        Adds "amount" to counter "name", if enabled.
+        """
+
+        if self.enabled:
+            self.counters[name] += amount
+
+    def record_query(self, start, goal, velocity, cached, expansions, heap_pushes):
+        """
+        Records a route query, if enabled.
+
+        Args:
+            start        (int): Start cell's index.
+            goal         (int): Goal cell's index.
+            velocity   (float): Drone's velocity.
+            cached      (bool): True if the route came from cache (no search).
+            expansions   (int): Cells expanded by the search.
+            heap_pushes  (int): Entries pushed to the open set by the search.
+        """
+
+        if not self.enabled:
+            return
+
+        counters = self.counters
+        counters["route_queries"] += 1
+        counters["route_cache_hits" if cached else "route_cache_misses"] += 1
+        counters["expansions"] += expansions
+        counters["heap_pushes"] += heap_pushes
+
+        if len(self.queries) < self.maximum_queries:
+            self.queries.append({"start": start, "goal": goal, "velocity": velocity, "cached": cached, "expansions": expansions, "heap_pushes": heap_pushes})
+
+    def start_profiler(self):
+        """
+        Starts profiling with cProfile.
+        """
+
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop_profiler(self):
+        """
+        Stops profiling. Profiled data is kept until dumped.
+        """
+
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def dump_profile(self, path):
+        """
+        Writes the profiled data to "path", readable with pstats (e.g. "python -m pstats path").
+
+        Args:
+            path (str): Dump's path.
+
+        Raises:
+            ValueError: If nothing was profiled.
+        """
+
+        # Sanity Check #
+        if self.profiler is None:
+            raise ValueError("ERROR in dump_profile in Instrumentation. Nothing was profiled.")
+
+        self.stop_profiler()
+        self.profiler.dump_stats(path)
+
+    def get_report(self):
+        """
+        Gets Instrumentation's counters, phases and queries.
+
+        Returns:
+            dict: Counters, per phase calls, total and mean seconds, and per query statistics as a dictionary.
+        """
+
+        return {
+            "counters": dict(self.counters),
+            "phases": {name: {"calls": calls, "total_seconds": seconds, "mean_seconds": seconds / calls if calls else 0.0} for name, (calls, seconds) in self.phases.items()},
+            "queries": self.queries,
+        }
+
+    def write(self, path, **extra):
+        """
+        Writes the report (see get_report) as JSON to "path".
+
+        Args:
+            path    (str): Report's path.
+            **extra      : Other entries added to the report (e.g. the run's summary).
+        """
+
+        report = self.get_report()
+        report.update(extra)
+
+        with open(path, 'w') as arquivo:
+            json.dump(report, arquivo, indent=4)
@@ -1,5 +1,8 @@
 from Client import Client
 
+from collections import deque
+from itertools import repeat
+
 class Order:
     """
     Order Class.
@@ -10,6 +13,8 @@ class Order:
         total_weight    (float): Order's total weight.
     """
 
+    __slots__ = ("client", "products", "total_weight")
+
     def __init__(self, client, products):
         """
         Initiates a new Order instance with specified values. Null or invalid values are considered as an error (raises ValueError).
@@ -41,6 +46,42 @@ class Order:
         for product in products:
             self.total_weight += product.weight
 
+    @classmethod
+    def from_columns(cls, clients, products):
+        """
+        Creates many Orders at once from columns of clients and product lists (e.g. the lists built by Product.from_columns).
+        Columns are validated once for the whole batch, instead of once per Order. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            clients              (list[Client]): Orders' clients.
+            products  (list[list[Product]]): Orders' products.
+
+        Returns:
+            list[Order]: New Orders, in columns' order.
+
+        Raises:
+            ValueError: If columns have different lengths, or an Order has no Product.
+            TypeError: If a client is not an instance of Client.
+        """
+
+        # Sanity Check #
+        if (len(clients) != len(products)):
+            raise ValueError("ERROR in from_columns in Order. Your columns must have the same length.")
+        if (not all(isinstance(client, Client) for client in set(clients))):
+            raise TypeError("ERROR in from_columns in Order. Your Clients must be instances of Client.")
+        if (not all(products)):
+            raise ValueError("ERROR in from_columns in Order. Your orders must have atleast one Product to make an order.")
+
+        total_weights = [sum(product.weight for product in order_products) for order_products in products]
+
+        # Instances are created and each slot filled column by column, without running __init__
+        orders = list(map(object.__new__, repeat(cls, len(clients))))
+        deque(map(cls.client.__set__, orders, clients), maxlen=0)
+        deque(map(cls.products.__set__, orders, products), maxlen=0)
+        deque(map(cls.total_weight.__set__, orders, total_weights), maxlen=0)
+
+        return orders
+
     def get_order_info(self):
         """
         Gets Order's attributes.
@@ -48,7 +89,7 @@ class Order:
         Returns:
             dict: Order's attributes as a dictionary.
         """
-        return self.__dict__
+        return {"client": self.client, "products": self.products, "total_weight": self.total_weight}
 
     def __str__(self):
         """
@@ -0,0 +1,345 @@
+from Order import Order
+
+from array import array
+from collections import deque
+import heapq
+import math
+import random
+
+class OrderPacker:
+    """
+    OrderPacker class. Pool of pending orders, packed into drone loads (bins) by their total weight.
+
+    The whole pool is packed at once for a given capacity, in O(n log n), and loads are then handed out one at a time.
+    Loads are kept per capacity, so a fleet of drones with different capacities packs the pool once per capacity, not once per trip.
+    Orders handed out in a load packed for one capacity are dropped from the loads packed for the others. The pool is only packed again when new orders arrive.
+
+    Strategies:
+        first_fit:            Orders in arrival order, each one in the first load with room for it.
+        first_fit_decreasing: Orders from heaviest to lightest, each one in the first load with room for it.
+        best_fit:             Orders from heaviest to lightest, each one in the load it leaves with the least room (loads kept in a skip list by remaining room).
+        spatial:              Orders swept by their client's angle around base, consecutive orders share a load until it is full.
+
+    Attributes:
+        strategy                (str): Packing strategy.
+        base_position      (Position): Drones' base. Needed by the "spatial" strategy.
+        orders (dict[int, tuple[int, Order]]): Orders in the pool, by id, with their sequence numbers. In arrival order.
+        changed                (bool): True if orders were added since the pool was last packed.
+        packings (dict[float, deque[list[Order]]]): Packed loads not handed out yet, by the capacity they were packed for.
+        lightest  (list[tuple[float, int]]): Heap of (weight, sequence number) of orders added to the pool. Orders already taken are dropped lazily.
+        taken              (set[int]): Sequence numbers of orders handed out but still in "lightest".
+        loads_taken             (int): Number of loads handed out.
+        loaded_weight         (float): Total weight of the loads handed out.
+        offered_capacity      (float): Total capacity the loads handed out were packed for.
+    """
+
+    STRATEGIES = ("first_fit", "first_fit_decreasing", "best_fit", "spatial")
+
+    # Remaining room is kept by subtraction, so an exact fit (e.g. 20 - 6.19 - 7.49 against 6.32) must not be lost to rounding
+    TOLERANCE = 1e-9
+
+    # Levels of the skip list best_fit keeps its loads in. Enough for 2 ** 32 loads
+    SKIP_LIST_LEVELS = 32
+
+    def __init__(self, strategy="first_fit_decreasing", base_position=None):
+        """
+        Initiates a new, empty, OrderPacker instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            strategy           (str): Packing strategy, one of OrderPacker.STRATEGIES.
+            base_position (Position): Drones' base. Needed by the "spatial" strategy.
+
+        Raises:
+            ValueError: If "strategy" is invalid or "base_position" is None with the "spatial" strategy.
+            TypeError: If "strategy" is not an instance of str.
+        """
+
+        # Sanity Check #
+        if (not isinstance(strategy, str)):
+            raise TypeError("ERROR in __init__ in OrderPacker. Your strategy must be an instance of str.")
+        if (strategy not in OrderPacker.STRATEGIES):
+            raise ValueError(f"ERROR in __init__ in OrderPacker. Your strategy must be one of {', '.join(OrderPacker.STRATEGIES)}.")
+        if (strategy == "spatial") and (base_position is None):
+            raise ValueError("ERROR in __init__ in OrderPacker. The spatial strategy needs a valid base_position.")
+
+        self.strategy = strategy
+        self.base_position = base_position
+        self.orders = {}
+        self.changed = False
+        self.packings = {}
+        self.sequence = 0
+        self.lightest = []
+        self.taken = set()
+        self.loads_taken = 0
+        self.loaded_weight = 0.0
+        self.offered_capacity = 0.0
+
+    def __len__(self):
+        return len(self.orders)
+
+    def add_orders(self, orders):
+        """
+        Adds new orders to the pool.
+
+        Args:
+            orders (list[Order]): New orders.
+
+        Raises:
+            TypeError: If "orders" has something that is not an instance of Order.
+        """
+
+        for order in orders:
+            # Sanity Check #
+            if (not isinstance(order, Order)):
+                raise TypeError("ERROR in add_orders in OrderPacker. Only Order instances can be packed.")
+
+            self.orders[id(order)] = (self.sequence, order)
+            heapq.heappush(self.lightest, (order.total_weight, self.sequence))
+            self.sequence += 1
+
+        self.changed = True
+
+    def get_lightest_weight(self):
+        """
+        Gets the weight of the lightest order in the pool.
+
+        Returns:
+            float: Lightest order's weight. None, if the pool is empty.
+        """
+
+        lightest = self.lightest
+        while lightest and (lightest[0][1] in self.taken):
+            self.taken.discard(heapq.heappop(lightest)[1])
+
+        return lightest[0][0] if lightest else None
+
+    def take_all(self):
+        """
+        Removes every order from the pool.
+
+        Returns:
+            list[Order]: Every order that was in the pool.
+        """
+
+        orders = [order for _, order in self.orders.values()]
+        self.orders.clear()
+        self.changed = False
+        self.packings.clear()
+        self.lightest = []
+        self.taken.clear()
+
+        return orders
+
+    def next_load(self, capacity):
+        """
+        Hands out the next load for a drone with "capacity" free weight.
+
+        Args:
+            capacity (float): Drone's free weight.
+
+        Returns:
+            list[Order]: Orders of the load, removed from the pool. Empty, if no order fits in "capacity".
+        """
+
+        if self.changed:
+            self.packings.clear()
+            self.changed = False
+
+        loads = self.packings.get(capacity)
+        if loads is None:
+            loads, _ = self.pack([order for _, order in self.orders.values()], capacity)
+            loads = self.packings[capacity] = deque(loads)
+
+        # Orders already handed out in a load packed for another capacity are skipped
+        orders = self.orders
+        load = []
+        while loads and (len(load) == 0):
+            load = [order for order in loads.popleft() if id(order) in orders]
+
+        if len(load) == 0:
+            return []
+
+        for order in load:
+            self.taken.add(orders.pop(id(order))[0])
+            self.loaded_weight += order.total_weight
+        self.loads_taken += 1
+        self.offered_capacity += capacity
+
+        return load
+
+    def pack(self, orders, capacity):
+        """
+        Packs "orders" into loads of "capacity" with the OrderPacker's strategy.
+
+        Args:
+            orders (list[Order]): Orders to be packed.
+            capacity     (float): Load's capacity.
+
+        Returns:
+            tuple[list[list[Order]], list[Order]]: Packed loads and the orders heavier than "capacity", in arrival order.
+        """
+
+        fitting = [order for order in orders if order.total_weight <= capacity]
+        oversized = [order for order in orders if order.total_weight > capacity]
+
+        if self.strategy == "first_fit":
+            loads = self.pack_first_fit(fitting, capacity)
+        elif self.strategy == "first_fit_decreasing":
+            loads = self.pack_first_fit(sorted(fitting, key=lambda order: order.total_weight, reverse=True), capacity)
+        elif self.strategy == "best_fit":
+            loads = self.pack_best_fit(sorted(fitting, key=lambda order: order.total_weight, reverse=True), capacity)
+        else:
+            loads = self.pack_spatial(fitting, capacity)
+
+        return loads, oversized
+
+    def pack_first_fit(self, orders, capacity):
+        """
+        Puts each order, in the given order, in the first load with room for it.
+        Loads' remaining room is kept in a max segment tree, so the first load with room is found in O(log n).
+        """
+
+        size = 1
+        while size < len(orders):
+            size *= 2
+
+        # Unused leaves are loads not opened yet, so they have the whole capacity
+        room = array('d', [capacity]) * (2 * size)
+        loads = []
+
+        for order in orders:
+            weight = order.total_weight - OrderPacker.TOLERANCE
+
+            node = 1
+            while node < size:
+                node *= 2
+                if room[node] < weight:
+                    node += 1
+
+            load_index = node - size
+            if load_index == len(loads):
+                loads.append([])
+            loads[load_index].append(order)
+
+            room[node] -= order.total_weight
+            node //= 2
+            while node >= 1:
+                room[node] = max(room[2 * node], room[(2 * node) + 1])
+                node //= 2
+
+        return loads
+
+    def pack_best_fit(self, orders, capacity):
+        """
+        Puts each order, in the given order, in the load it leaves with the least room.
+        Loads are kept in a skip list sorted by (remaining room, load index), so that load is found, taken out and put back in O(log n).
+        """
+
+        loads = []
+
+        # Node 0 is the head, node 1 the tail. Their rooms are sentinels, so no search ever runs past either of them
+        rooms = [-math.inf, math.inf]
+        load_indexes = [-1, -1]
+        forward = [[1] * OrderPacker.SKIP_LIST_LEVELS, []]
+        update = [0] * OrderPacker.SKIP_LIST_LEVELS
+        top = 0
+        random_bits = random.Random(0).getrandbits
+
+        for order in orders:
+            weight = order.total_weight
+
+            # First load with room for the order, i.e. the one it leaves with the least room
+            minimum = weight - OrderPacker.TOLERANCE
+            node = 0
+            for level in range(top, -1, -1):
+                following = forward[node][level]
+                while rooms[following] < minimum:
+                    node = following
+                    following = forward[node][level]
+                update[level] = node
+
+            candidate = forward[node][0]
+            if candidate == 1:
+                load_index = len(loads)
+                loads.append([])
+                remaining = capacity
+
+                # A new node, with a random height (each level is kept with probability 1/2)
+                candidate = len(rooms)
+                rooms.append(0.0)
+                load_indexes.append(load_index)
+                bits = random_bits(OrderPacker.SKIP_LIST_LEVELS - 1)
+                height = 1
+                while bits & 1:
+                    height += 1
+                    bits >>= 1
+                forward.append([1] * height)
+            else:
+                remaining = rooms[candidate]
+                load_index = load_indexes[candidate]
+
+                # Unlinked, so it can be linked back in with the load's new room
+                links = forward[candidate]
+                for level in range(len(links)):
+                    forward[update[level]][level] = links[level]
+
+            loads[load_index].append(order)
+
+            remaining -= weight
+            rooms[candidate] = remaining
+            links = forward[candidate]
+            top = max(top, len(links) - 1)
+
+            node = 0
+            for level in range(top, -1, -1):
+                following = forward[node][level]
+                while (rooms[following] < remaining) or ((rooms[following] == remaining) and (load_indexes[following] < load_index)):
+                    node = following
+                    following = forward[node][level]
+                if level < len(links):
+                    links[level] = following
+                    forward[node][level] = candidate
+
+        return loads
+
+    def pack_spatial(self, orders, capacity):
+        """
+        Sweeps orders by their client's angle around base (then by distance), filling one load until the next order doesn't fit.
+        Each load then covers a narrow sector around base.
+        """
+
+        base_x = self.base_position.X
+        base_y = self.base_position.Y
+
+        def sweep_key(order):
+            delta_x = order.client.position.X - base_x
+            delta_y = order.client.position.Y - base_y
+            return (math.atan2(delta_y, delta_x), abs(delta_x) + abs(delta_y))
+
+        loads = []
+        remaining = 0.0
+
+        for order in sorted(orders, key=sweep_key):
+            if (len(loads) == 0) or (order.total_weight - OrderPacker.TOLERANCE > remaining):
+                loads.append([])
+                remaining = capacity
+
+            loads[-1].append(order)
+            remaining -= order.total_weight
+
+        return loads
+
+    def get_packer_info(self):
+        """
+        Gets OrderPacker's counters.
+
+        Returns:
+            dict: OrderPacker's strategy, loads handed out, their weight and packing efficiency (loaded weight / capacity offered) as a dictionary.
+        """
+
+        return {
+            "strategy": self.strategy,
+            "loads": self.loads_taken,
+            "loaded_weight": self.loaded_weight,
+            "efficiency": (self.loaded_weight / self.offered_capacity) if self.offered_capacity > 0 else 0.0,
+        }
@@ -0,0 +1,262 @@
+from Grid import Grid
+from PathFinder import PathFinder
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import math
+import os
+import sys
+
+# Worker process' own Grid and PathFinder, built once by initialize_worker over the shared memory block
+worker_state = {}
+
+def attach_shared_memory(name):
+    """
+    Attaches to an existing shared memory block, which stays owned (and is unlinked) by the ParallelPlanner.
+    Worker processes share their parent's resource tracker, so before Python 3.13 attaching registers the block a second time, which is harmless.
+
+    Args:
+        name (str): Shared memory block's name.
+
+    Returns:
+        SharedMemory: Attached block.
+    """
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    return shared_memory.SharedMemory(name=name)
+
+def initialize_worker(name, height, width, settings):
+    """
+    Builds the worker's Grid and PathFinder over the shared altitude and classification arrays. Runs once per worker process.
+
+    Args:
+        name       (str): Shared memory block's name.
+        height     (int): Grid's height.
+        width      (int): Grid's width.
+        settings (tuple): Heuristic, heuristic_weight, tie_breaking and jump_points the PathFinder is configured with (see ParallelPlanner.get_settings).
+    """
+
+    size = height * width
+    block = attach_shared_memory(name)
+    altitudes = block.buf[:4 * size].cast('i')
+    classifications = block.buf[4 * size:5 * size]
+
+    grid = Grid.from_altitudes(height, width, altitudes, classifications)
+    worker_state["block"] = block
+    worker_state["grid"] = grid
+    worker_state["path_finder"] = PathFinder(grid)
+    worker_state["path_finder"].configure(*settings)
+
+def search_chunk(queries):
+    """
+    Searches a chunk of route queries in a worker process.
+
+    Args:
+        queries (list[tuple[int, int, float]]): (start index, goal index, velocity) of every route.
+
+    Returns:
+        tuple[list[tuple[int]], int, int]: Path of every query, in the same order (None for the queries whose goal can't be reached),
+                                           and the cells expanded and entries pushed to the open set by the chunk's searches.
+    """
+
+    path_finder = worker_state["path_finder"]
+    expansions = path_finder.total_expansions
+    heap_pushes = path_finder.total_heap_pushes
+
+    paths = []
+    for start, goal, velocity in queries:
+        path = path_finder.search(start, goal, velocity)
+        paths.append(tuple(path) if path is not None else None)
+
+    return paths, path_finder.total_expansions - expansions, path_finder.total_heap_pushes - heap_pushes
+
+class ParallelPlanner:
+    """
+    ParallelPlanner class. Fans independent route queries out to a pool of worker processes.
+
+    Grid's altitudes and classifications are copied once into a shared memory block, and every worker builds its own
+    Grid and PathFinder over it, so no Grid is pickled per task. The block is written again only when the terrain changes.
+    Workers' PathFinders are configured like "path_finder" (see PathFinder.configure), so their routes are the ones it would
+    find, and the worker processes are restarted if its settings change. Queries are sent in chunks and their paths come
+    back in the same order the queries were given.
+
+    Attributes:
+        grid                   (Grid): Grid in which paths are searched.
+        path_finder       (PathFinder): PathFinder whose search settings the workers copy. None, for the default settings.
+        workers                 (int): Number of worker processes.
+        chunk_size              (int): Queries per task. None, to split each batch into about 4 tasks per worker.
+        block          (SharedMemory): Shared altitudes (int32) followed by classifications (one byte per cell).
+        executor (ProcessPoolExecutor): Worker processes. None, until the first batch.
+        published_version       (int): Grid's terrain_version the shared altitudes were copied at.
+        settings              (tuple): Search settings the worker processes were started with.
+        batches                 (int): Number of batches searched.
+        queries                 (int): Number of queries searched.
+        expansions              (int): Cells expanded by the workers to search the last batch.
+        heap_pushes             (int): Entries pushed to the open set by the workers to search the last batch.
+    """
+
+    def __init__(self, grid, workers=None, chunk_size=None, path_finder=None):
+        """
+        Initiates a new ParallelPlanner instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            grid       (Grid): Grid in which paths will be searched.
+            workers     (int): Number of worker processes. os.cpu_count(), if None.
+            chunk_size  (int): Queries per task. None, to split each batch into about 4 tasks per worker.
+            path_finder (PathFinder): PathFinder whose search settings the workers copy. None, for the default settings.
+
+        Raises:
+            ValueError: If attributes "grid", "workers", "chunk_size" are either None or invalid (Non positive values), or "path_finder" searches another Grid or is altitude aware.
+            TypeError: If attributes "grid", "workers", "chunk_size", "path_finder" have incorrect types.
+        """
+
+        # Sanity Check #
+        if (grid is None):
+            raise ValueError("ERROR in __init__ in ParallelPlanner. Your ParallelPlanner must have a valid grid.")
+        if (not isinstance(grid, Grid)):
+            raise TypeError("ERROR in __init__ in ParallelPlanner. Your grid must be an instance of Grid.")
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if (not isinstance(workers, int)):
+            raise TypeError("ERROR in __init__ in ParallelPlanner. Your ParallelPlanner's workers must be an instance of int.")
+        if (workers <= 0):
+            raise ValueError("ERROR in __init__ in ParallelPlanner. Your ParallelPlanner must have atleast one worker.")
+
+        if (chunk_size is not None) and (not isinstance(chunk_size, int)):
+            raise TypeError("ERROR in __init__ in ParallelPlanner. Your ParallelPlanner's chunk_size must be an instance of int.")
+        if (chunk_size is not None) and (chunk_size <= 0):
+            raise ValueError("ERROR in __init__ in ParallelPlanner. Your ParallelPlanner must have a valid chunk_size.")
+
+        if (path_finder is not None) and (not isinstance(path_finder, PathFinder)):
+            raise TypeError("ERROR in __init__ in ParallelPlanner. Your path_finder must be an instance of PathFinder.")
+        if (path_finder is not None) and (path_finder.grid is not grid):
+            raise ValueError("ERROR in __init__ in ParallelPlanner. Your path_finder must search the ParallelPlanner's grid.")
+        if (path_finder is not None) and (path_finder.altitude_aware):
+            raise ValueError("ERROR in __init__ in ParallelPlanner. Workers can't select drone classes, your path_finder can't be altitude aware.")
+
+        self.grid = grid
+        self.path_finder = path_finder
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.block = None
+        self.executor = None
+        self.published_version = None
+        self.settings = None
+        self.batches = 0
+        self.queries = 0
+        self.expansions = 0
+        self.heap_pushes = 0
+
+    def get_settings(self):
+        """
+        Gets the search settings the workers must be configured with.
+
+        Returns:
+            tuple[str, float, str, bool]: path_finder's heuristic, heuristic_weight, tie_breaking and jump_points. PathFinder's defaults, if there's no path_finder.
+        """
+
+        path_finder = self.path_finder
+        if path_finder is None:
+            return ("manhattan", 1.0, "index", False)
+
+        return (path_finder.heuristic, path_finder.heuristic_weight, path_finder.tie_breaking, path_finder.jump_points)
+
+    def start(self):
+        """
+        Creates the shared memory block and the worker processes, if they don't exist yet. Worker processes started with
+        other search settings than path_finder's current ones are stopped and started again.
+        """
+
+        settings = self.get_settings()
+        if (self.executor is not None) and (self.settings != settings):
+            self.executor.shutdown()
+            self.executor = None
+
+        if self.executor is not None:
+            return
+
+        if self.block is None:
+            size = self.grid.height * self.grid.width
+            self.block = shared_memory.SharedMemory(create=True, size=max(5 * size, 1))
+            self.publish()
+
+        self.settings = settings
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=initialize_worker, initargs=(self.block.name, self.grid.height, self.grid.width, settings))
+
+    def publish(self):
+        """
+        Copies Grid's altitudes and classifications into the shared memory block. Workers must be idle.
+        """
+
+        size = self.grid.height * self.grid.width
+        buffer = self.block.buf
+        buffer[:4 * size] = memoryview(self.grid.altitudes).cast('B')
+        buffer[4 * size:5 * size] = self.grid.classifications
+        self.published_version = self.grid.terrain_version
+
+    def search_many(self, queries):
+        """
+        Searches every route query in the worker processes.
+
+        Args:
+            queries (list[tuple[int, int, float]]): (start index, goal index, velocity) of every route.
+
+        Returns:
+            list[tuple[int]]: Path of every query, in the same order as "queries". None for the queries whose goal can't be reached.
+        """
+
+        queries = list(queries)
+        self.expansions = 0
+        self.heap_pushes = 0
+        if len(queries) == 0:
+            return []
+
+        self.start()
+        if self.published_version != self.grid.terrain_version:
+            self.publish()
+
+        chunk_size = self.chunk_size or math.ceil(len(queries) / (4 * self.workers))
+        chunks = [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]
+
+        paths = []
+        for chunk_paths, expansions, heap_pushes in self.executor.map(search_chunk, chunks):
+            paths.extend(chunk_paths)
+            self.expansions += expansions
+            self.heap_pushes += heap_pushes
+
+        self.batches += 1
+        self.queries += len(queries)
+        return paths
+
+    def close(self):
+        """
+        Stops the worker processes and releases the shared memory block.
+        """
+
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+        if self.block is not None:
+            self.block.close()
+            self.block.unlink()
+            self.block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_planner_info(self):
+        """
+        Gets ParallelPlanner's counters.
+
+        Returns:
+            dict: ParallelPlanner's workers, batches and queries searched as a dictionary.
+        """
+
+        return {"workers": self.workers, "batches": self.batches, "queries": self.queries}
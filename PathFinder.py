@@ -0,0 +1,685 @@
+from Grid import Grid
+from Drone import Drone
+
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import mul
+import heapq
+
+class PathFinder:
+    """
+    PathFinder class. A* search engine over Grid's flat cell indexes (index = (X * width) + Y).
+
+    Scores are kept in arrays allocated once per Grid and reused between searches. Only the
+    cells touched by a search are reset before the next one.
+
+    Heuristics:
+        manhattan: Manhattan distance, not scaled by velocity. As moves cost distance / velocity, it overestimates by a
+                   factor of velocity and the search is close to greedy best-first (the original behavior).
+        octile:    Octile distance / velocity, the exact cost without obstacles, so it is admissible and consistent. On this
+                   Grid a diagonal move costs as much as two straight ones (see Grid.neighbor_distances), so the octile
+                   distance is the manhattan distance.
+
+    Tie breakings (between entries with the same f):
+        index:   Lowest flat index first, i.e. by (X, Y).
+        deepest: Highest g first, so the search keeps following the path it is on. Then lowest flat index.
+
+    Jump points (see search_jump_points): optional mode for uniform-cost regions. A diagonal move costs as much as two
+    straight ones, so inside uniform regions only straight moves are followed, and straight runs are jumped over in one step.
+    Irregular cells (non-uniform cells and their neighbors) are expanded normally, with all 8 neighbors.
+
+    Altitude aware mode (see select_drone_class): terrain slows drones down like Drone.get_velocity does, so entering a cell
+    at altitude Z costs distance * 1 / (1 - BETA * Z / maximum_altitude), and cells above the drone class' maximum altitude
+    can't be entered at all (no-fly). Penalties and move costs are precomputed once per terrain and drone class, so searches
+    only read another table (slot_costs) instead of Grid.neighbor_distances. No move costs less than its distance times the lowest
+    penalty (atleast 1), so heuristics are scaled by it (heuristic_scale) and stay admissible. Switching drone class doesn't
+    change the cost model: whatever is derived from the costs (cached routes, jump tables, distance fields, HPA* graphs) is kept
+    per drone class instead.
+
+    Attributes:
+        grid                 (Grid): Grid in which paths are searched.
+        g_score      (array[float]): Cost from start to each cell on the current search.
+        f_score      (array[float]): Estimated total cost (g_score + heuristic) of each cell on the current search.
+        came_from      (array[int]): Previous cell on the best known path to each cell. -1 if none.
+        touched         (list[int]): Cells whose scores were changed by the last search.
+        cost_model_version      (int): Incremented every time the search's costs change (see invalidate_cost_model).
+        expansions              (int): Cells expanded by the last search.
+        heap_pushes             (int): Entries pushed to the open set by the last search.
+        heuristic               (str): Search's heuristic, one of PathFinder.HEURISTICS.
+        heuristic_weight      (float): Heuristic's weight (weighted A*). 1.0 keeps octile admissible.
+        tie_breaking            (str): Order of entries with the same f, one of PathFinder.TIE_BREAKINGS.
+        searches                (int): Number of searches.
+        total_expansions        (int): Cells expanded by every search.
+        total_heap_pushes       (int): Entries pushed to the open set by every search.
+        jump_points            (bool): True if searches use jump points (see search_jump_points).
+        arrival         (bytearray): Direction each cell was reached from on the current jump point search (see JUMP_DIRECTIONS).
+        jump_tables           (tuple): Selected drone class' irregular cells, their columns and their rows, for the jump point search. None, until needed.
+        class_jump_tables      (dict): Jump tables of every drone class (see drone_class).
+        altitude_aware         (bool): True if moves are priced with the selected drone class' altitude penalties.
+        drone_class           (float): Selected drone class' maximum altitude. None, if none (moves cost their distance).
+        tables_version          (int): Grid's terrain_version the selected drone class' tables were built at.
+        altitude_tables        (dict): Altitude tables of every drone class, by maximum altitude (see build_altitude_tables).
+        cell_penalties (array[float]): Cost factor of entering each cell, infinite for no-fly cells. None, outside altitude aware mode.
+        heuristic_scale       (float): Lowest penalty of any cell, every heuristic is scaled by it. 1.0, outside altitude aware mode.
+        slot_costs            (array): Cost of every move (slot of Grid's neighbor table) at velocity 1.
+        reverse_slot_costs    (array): Cost of every move's way back (from the neighbor to the slot's cell) at velocity 1.
+    """
+
+    HEURISTICS = ("manhattan", "octile")
+    TIE_BREAKINGS = ("index", "deepest")
+
+    # Jump point search's arrival directions: 0 for a cell whose every direction is open (start, or reached from an irregular cell),
+    # then (X, Y) steps of horizontal (along Y) and vertical (along X) moves
+    JUMP_DIRECTIONS = (None, (0, 1), (0, -1), (1, 0), (-1, 0))
+
+    def __init__(self, grid):
+        """
+        Initiates a new PathFinder instance for "grid". Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            grid (Grid): Grid in which paths will be searched.
+
+        Raises:
+            ValueError: If "grid" is None.
+            TypeError: If "grid" is not an instance of Grid.
+        """
+
+        # Sanity Check #
+        if (grid is None):
+            raise ValueError("ERROR in __init__ in PathFinder. Your PathFinder must have a valid grid.")
+        if (not isinstance(grid, Grid)):
+            raise TypeError("ERROR in __init__ in PathFinder. Your grid must be an instance of Grid.")
+
+        size = grid.height * grid.width
+
+        self.grid = grid
+        self.g_score = array('d', [float('inf')]) * size
+        self.f_score = array('d', [float('inf')]) * size
+        self.came_from = array('i', [-1]) * size
+        self.touched = []
+        self.cost_model_version = 0
+        self.expansions = 0
+        self.heap_pushes = 0
+        self.heuristic = "manhattan"
+        self.heuristic_weight = 1.0
+        self.tie_breaking = "index"
+        self.searches = 0
+        self.total_expansions = 0
+        self.total_heap_pushes = 0
+        self.jump_points = False
+        self.arrival = bytearray(size)
+        self.jump_tables = None
+        self.class_jump_tables = {}
+        self.altitude_aware = False
+        self.drone_class = None
+        self.tables_version = grid.terrain_version
+        self.altitude_tables = {}
+        self.cell_penalties = None
+        self.heuristic_scale = 1.0
+        self.slot_costs = grid.neighbor_distances
+        self.reverse_slot_costs = grid.neighbor_distances
+
+    def configure(self, heuristic="manhattan", heuristic_weight=1.0, tie_breaking="index", jump_points=False, altitude_aware=False):
+        """
+        Changes the search's heuristic and tie breaking. Routes found before may differ, so the cost model is invalidated.
+
+        Args:
+            heuristic          (str): One of PathFinder.HEURISTICS.
+            heuristic_weight (float): Heuristic's weight (weighted A*), atleast 1.0.
+            tie_breaking       (str): One of PathFinder.TIE_BREAKINGS.
+            jump_points       (bool): Search with jump points (see search_jump_points). Heuristic is then always octile and ties go to the deepest entry.
+            altitude_aware    (bool): Price moves with the altitude penalties of the drone class selected by select_drone_class.
+
+        Raises:
+            ValueError: If "heuristic", "tie_breaking" are unknown or "heuristic_weight" is lower than 1.0.
+            TypeError: If "heuristic_weight" is not a number.
+        """
+
+        # Sanity Check #
+        if (heuristic not in PathFinder.HEURISTICS):
+            raise ValueError(f"ERROR in configure in PathFinder. Your heuristic must be one of {', '.join(PathFinder.HEURISTICS)}.")
+        if (tie_breaking not in PathFinder.TIE_BREAKINGS):
+            raise ValueError(f"ERROR in configure in PathFinder. Your tie_breaking must be one of {', '.join(PathFinder.TIE_BREAKINGS)}.")
+        if (not isinstance(heuristic_weight, (int, float))):
+            raise TypeError("ERROR in configure in PathFinder. Your heuristic_weight must be a number.")
+        if (heuristic_weight < 1.0):
+            raise ValueError("ERROR in configure in PathFinder. Your heuristic_weight must be atleast 1.0.")
+
+        if (heuristic, float(heuristic_weight), tie_breaking, bool(jump_points)) != (self.heuristic, self.heuristic_weight, self.tie_breaking, self.jump_points):
+            self.heuristic = heuristic
+            self.heuristic_weight = float(heuristic_weight)
+            self.tie_breaking = tie_breaking
+            self.jump_points = bool(jump_points)
+            self.invalidate_cost_model()
+
+        if bool(altitude_aware) != self.altitude_aware:
+            self.altitude_aware = bool(altitude_aware)
+            self.drone_class = None
+            self.cell_penalties, self.heuristic_scale, self.slot_costs, self.reverse_slot_costs = self.get_altitude_tables(None)
+            self.invalidate_cost_model()
+
+    def get_path_finder_info(self):
+        """
+        Gets PathFinder's configuration and counters.
+
+        Returns:
+            dict: PathFinder's heuristic, heuristic_weight, tie_breaking, altitude mode, searches, expansions and heap pushes as a dictionary.
+        """
+
+        return {
+            "heuristic": self.heuristic,
+            "heuristic_weight": self.heuristic_weight,
+            "tie_breaking": self.tie_breaking,
+            "jump_points": self.jump_points,
+            "altitude_aware": self.altitude_aware,
+            "drone_class": self.drone_class,
+            "searches": self.searches,
+            "expansions": self.total_expansions,
+            "heap_pushes": self.total_heap_pushes,
+            "mean_expansions": (self.total_expansions / self.searches) if self.searches > 0 else 0.0,
+        }
+
+    def invalidate_cost_model(self):
+        """
+        Signals that the search's costs changed, so routes computed before are no longer valid.
+        """
+
+        self.cost_model_version += 1
+
+    def build_altitude_tables(self, maximum_altitude):
+        """
+        Precomputes the altitude tables of a drone class: every cell's penalty and every move's cost, both ways.
+
+        Args:
+            maximum_altitude (float): Drone class' maximum altitude.
+
+        Returns:
+            tuple[int, array[float], float, array[float], array[float]]: Grid's terrain_version, cell_penalties, heuristic_scale, slot_costs and reverse_slot_costs.
+        """
+
+        grid = self.grid
+        inf = float('inf')
+        factor = (Drone.BETA / maximum_altitude) if maximum_altitude > 0 else 0.0
+
+        # Cells below sea level fly as fast as at 0, so no penalty is lower than 1
+        penalties = array('d', [1.0 if altitude <= 0 else inf if altitude > maximum_altitude else 1.0 / (1.0 - (factor * altitude)) for altitude in grid.altitudes])
+
+        # A move costs its distance times the penalty of the cell it enters: the neighbor's, or the slot's own cell's on the way back
+        slot_costs = array('d', map(mul, grid.neighbor_distances, map(penalties.__getitem__, grid.get_slot_neighbors())))
+        reverse_slot_costs = array('d', map(mul, grid.neighbor_distances, map(penalties.__getitem__, grid.get_slot_cells())))
+
+        # Every cell may be no-fly, then nothing can be entered and any scale is admissible
+        heuristic_scale = min((penalty for penalty in penalties if penalty != inf), default=1.0)
+
+        return (grid.terrain_version, penalties, heuristic_scale, slot_costs, reverse_slot_costs)
+
+    def get_altitude_tables(self, drone_class):
+        """
+        Gets a drone class' altitude tables, built the first time (and again after the terrain changes), then reused.
+
+        Args:
+            drone_class (float): Drone class' maximum altitude. None, for plain distances.
+
+        Returns:
+            tuple[array[float], float, array, array]: cell_penalties, heuristic_scale, slot_costs and reverse_slot_costs.
+        """
+
+        if drone_class is None:
+            return (None, 1.0, self.grid.neighbor_distances, self.grid.neighbor_distances)
+
+        tables = self.altitude_tables.get(drone_class)
+        if (tables is None) or (tables[0] != self.grid.terrain_version):
+            tables = self.altitude_tables[drone_class] = self.build_altitude_tables(drone_class)
+
+        return tables[1:]
+
+    def select_drone_class(self, maximum_altitude):
+        """
+        Prices the next searches for a drone class, in altitude aware mode (see get_altitude_tables). Routes, jump tables,
+        distance fields and HPA* graphs are kept per class, so switching between classes doesn't invalidate any of them.
+        Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            maximum_altitude (float): Drone class' maximum altitude.
+
+        Raises:
+            ValueError: If "maximum_altitude" is either None or negative.
+            TypeError: If "maximum_altitude" is not a number.
+        """
+
+        # Sanity Check #
+        if (maximum_altitude is None):
+            raise ValueError("ERROR in select_drone_class in PathFinder. Your drone class must have a valid maximum_altitude.")
+        if (not isinstance(maximum_altitude, (int, float))):
+            raise TypeError("ERROR in select_drone_class in PathFinder. Your maximum_altitude must be a number.")
+        if (maximum_altitude < 0):
+            raise ValueError("ERROR in select_drone_class in PathFinder. Your maximum_altitude can't be negative.")
+
+        if (not self.altitude_aware) or ((self.drone_class == maximum_altitude) and (self.tables_version == self.grid.terrain_version)):
+            return
+
+        self.cell_penalties, self.heuristic_scale, self.slot_costs, self.reverse_slot_costs = self.get_altitude_tables(maximum_altitude)
+        self.drone_class = maximum_altitude
+        self.tables_version = self.grid.terrain_version
+
+    def refresh_altitude_tables(self):
+        """
+        Builds the selected drone class' tables again if the terrain changed since they were selected. Every search calls it,
+        so callers that edit the Grid (see Grid.set_altitude) don't have to select their drone class again.
+        """
+
+        if (self.drone_class is not None) and (self.tables_version != self.grid.terrain_version):
+            self.cell_penalties, self.heuristic_scale, self.slot_costs, self.reverse_slot_costs = self.get_altitude_tables(self.drone_class)
+            self.tables_version = self.grid.terrain_version
+
+    def is_no_fly(self, index):
+        """
+        Checks if cell "index" is above the selected drone class' maximum altitude. Always False outside altitude aware mode.
+        """
+
+        self.refresh_altitude_tables()
+        return (self.cell_penalties is not None) and (self.cell_penalties[index] == float('inf'))
+
+    def reset(self):
+        """
+        Restores scores of every cell touched by the last search.
+        """
+
+        g_score = self.g_score
+        f_score = self.f_score
+        came_from = self.came_from
+        arrival = self.arrival
+        inf = float('inf')
+
+        for index in self.touched:
+            g_score[index] = inf
+            f_score[index] = inf
+            came_from[index] = -1
+            arrival[index] = 0
+
+        self.touched.clear()
+
+    def search(self, start, goal, velocity):
+        """
+        Searches the best path between cells "start" and "goal". Moving between two cells costs distance / velocity
+        (times the entered cell's penalty, in altitude aware mode).
+
+        Args:
+            start      (int): Start cell's index.
+            goal       (int): Goal cell's index.
+            velocity (float): Drone's velocity during the whole search.
+
+        Returns:
+            list[int]: Indexes of path's cells, from "start" to "goal". None, if "goal" can't be reached.
+        """
+
+        if self.jump_points:
+            return self.search_jump_points(start, goal, velocity)
+
+        self.refresh_altitude_tables()
+        self.reset()
+
+        width = self.grid.width
+        neighbor_offsets = self.grid.neighbor_offsets
+        neighbor_directions = self.grid.neighbor_directions
+        neighbor_steps = self.grid.neighbor_steps
+        slot_costs = self.slot_costs
+        g_score = self.g_score
+        f_score = self.f_score
+        came_from = self.came_from
+        touched = self.touched
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        goal_x, goal_y = divmod(goal, width)
+        start_x, start_y = divmod(start, width)
+
+        # h = scale * manhattan distance (see HEURISTICS). Velocity is constant during a search, so the octile search keeps
+        # its scores in distance units (time * velocity): nodes are ordered the same, and equal costs compare exactly equal
+        scale = self.heuristic_weight * self.heuristic_scale
+        divisor = velocity if self.heuristic == "manhattan" else 1.0
+        deepest = (self.tie_breaking == "deepest")
+
+        g_score[start] = 0.0
+        f_score[start] = scale * (abs(start_x - goal_x) + abs(start_y - goal_y))
+        touched.append(start)
+
+        # Entries are (f, tie, index). tie is 0 when ties in f are broken by (X, Y), which is the same order as the flat index,
+        # or -g when the deepest entry goes first
+        open_set = [(f_score[start], 0.0, start)]
+        expansions = 0
+        heap_pushes = 1
+
+        while open_set:
+            current_f, _, current = heappop(open_set)
+
+            # Client found
+            if current == goal:
+                self.record_search(expansions, heap_pushes)
+                path = [current]
+                while came_from[current] != -1:
+                    current = came_from[current]
+                    path.append(current)
+                return path[::-1]
+
+            # Stale entry, "current" was already expanded with a better score
+            if current_f > f_score[current]:
+                continue
+
+            current_g = g_score[current]
+            expansions += 1
+
+            for slot in range(neighbor_offsets[current], neighbor_offsets[current + 1]):
+                neighbor = current + neighbor_steps[neighbor_directions[slot]]
+                tentative_g = current_g + (slot_costs[slot] / divisor)
+
+                if tentative_g < g_score[neighbor]:
+                    if g_score[neighbor] == float('inf'): touched.append(neighbor)
+                    neighbor_x, neighbor_y = divmod(neighbor, width)
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    f_score[neighbor] = tentative_g + (scale * (abs(neighbor_x - goal_x) + abs(neighbor_y - goal_y)))
+                    heappush(open_set, (f_score[neighbor], -tentative_g if deepest else 0.0, neighbor))
+                    heap_pushes += 1
+
+        self.record_search(expansions, heap_pushes)
+        return None
+
+    def record_search(self, expansions, heap_pushes):
+        """
+        Keeps a search's counters.
+        """
+
+        self.expansions = expansions
+        self.heap_pushes = heap_pushes
+        self.searches += 1
+        self.total_expansions += expansions
+        self.total_heap_pushes += heap_pushes
+
+    def get_nonuniform_cells(self):
+        """
+        Returns the cells whose moves cost more than their distance / velocity: the cells with an altitude penalty, in altitude aware mode.
+
+        Returns:
+            bytearray: 1 for every non-uniform cell, by flat index. None, if every cell is uniform (outside altitude aware mode).
+        """
+
+        if self.cell_penalties is None:
+            return None
+
+        return bytearray(map((1.0).__ne__, self.cell_penalties))
+
+    def build_jump_tables(self):
+        """
+        Finds the irregular cells (non-uniform cells and their neighbors), and indexes them by column and by row for the jump point search.
+
+        Returns:
+            tuple: Irregular cells, their rows by column, the sorted columns and the (terrain_version, cost_model_version) they were built at.
+        """
+
+        grid = self.grid
+        width = grid.width
+        irregular = bytearray(grid.height * width)
+
+        nonuniform = self.get_nonuniform_cells()
+        if nonuniform is not None:
+            neighbor_offsets = grid.neighbor_offsets
+            neighbor_directions = grid.neighbor_directions
+            neighbor_steps = grid.neighbor_steps
+            index = nonuniform.find(1)
+            while index != -1:
+                irregular[index] = 1
+                for slot in range(neighbor_offsets[index], neighbor_offsets[index + 1]):
+                    irregular[index + neighbor_steps[neighbor_directions[slot]]] = 1
+                index = nonuniform.find(1, index + 1)
+
+        # Rows (X) of the irregular cells of each column (Y), sorted, and the sorted columns that have any
+        column_rows = {}
+        index = irregular.find(1)
+        while index != -1:
+            x, y = divmod(index, width)
+            column_rows.setdefault(y, []).append(x)
+            index = irregular.find(1, index + 1)
+
+        return (irregular, column_rows, sorted(column_rows), (grid.terrain_version, self.cost_model_version))
+
+    def jump(self, current, direction, goal):
+        """
+        Jumps from cell "current" along "direction" (see JUMP_DIRECTIONS) over uniform cells, up to the next cell that must be expanded.
+
+        Horizontal jumps stop at the goal's column and at every column with an irregular cell, where the search may have to turn.
+        Vertical jumps never turn (paths go horizontally first), so they only stop at the goal or at an irregular cell.
+
+        Returns:
+            tuple[int, int]: Jump point's index and its distance from "current". None, if the jump runs off the Grid.
+        """
+
+        irregular, column_rows, irregular_columns, _ = self.jump_tables
+        width = self.grid.width
+        x, y = divmod(current, width)
+        goal_x, goal_y = divmod(goal, width)
+        step_x, step_y = PathFinder.JUMP_DIRECTIONS[direction]
+
+        if step_x == 0:
+            # Nearest stop column strictly after y in the direction of the jump
+            if step_y > 0:
+                position = bisect_right(irregular_columns, y)
+                stop = irregular_columns[position] if position < len(irregular_columns) else width
+                if goal_y > y:
+                    stop = min(stop, goal_y)
+                if stop >= width:
+                    return None
+            else:
+                position = bisect_left(irregular_columns, y) - 1
+                stop = irregular_columns[position] if position >= 0 else -1
+                if goal_y < y:
+                    stop = max(stop, goal_y)
+                if stop < 0:
+                    return None
+            return ((x * width) + stop, abs(stop - y))
+
+        rows = column_rows.get(y, ())
+        if step_x > 0:
+            position = bisect_right(rows, x)
+            stop = rows[position] if position < len(rows) else self.grid.height
+            if (goal_y == y) and (goal_x > x):
+                stop = min(stop, goal_x)
+            if stop >= self.grid.height:
+                return None
+        else:
+            position = bisect_left(rows, x) - 1
+            stop = rows[position] if position >= 0 else -1
+            if (goal_y == y) and (goal_x < x):
+                stop = max(stop, goal_x)
+            if stop < 0:
+                return None
+        return ((stop * width) + y, abs(stop - x))
+
+    def search_jump_points(self, start, goal, velocity):
+        """
+        Searches the best path between cells "start" and "goal" with jump points over uniform cells (see JUMP_DIRECTIONS).
+        The heuristic is octile (admissible), so routes cost the same as an optimal A* search. Scores are in distance units.
+
+        Args:
+            start      (int): Start cell's index.
+            goal       (int): Goal cell's index.
+            velocity (float): Drone's velocity during the whole search.
+
+        Returns:
+            list[int]: Indexes of path's cells, from "start" to "goal". None, if "goal" can't be reached.
+        """
+
+        self.refresh_altitude_tables()
+
+        # Selected drone class' tables, built again only after the terrain or the cost model changed
+        jump_tables = self.class_jump_tables.get(self.drone_class)
+        if (jump_tables is None) or (jump_tables[3] != (self.grid.terrain_version, self.cost_model_version)):
+            jump_tables = self.class_jump_tables[self.drone_class] = self.build_jump_tables()
+        self.jump_tables = jump_tables
+
+        self.reset()
+
+        width = self.grid.width
+        neighbor_offsets = self.grid.neighbor_offsets
+        neighbor_directions = self.grid.neighbor_directions
+        neighbor_steps = self.grid.neighbor_steps
+        slot_costs = self.slot_costs
+        irregular = self.jump_tables[0]
+        g_score = self.g_score
+        f_score = self.f_score
+        came_from = self.came_from
+        arrival = self.arrival
+        touched = self.touched
+        jump = self.jump
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        goal_x, goal_y = divmod(goal, width)
+        scale = self.heuristic_weight * self.heuristic_scale
+
+        # Straight moves allowed after arriving from each direction: every one from an open cell, a horizontal move may turn vertical
+        successors = ((1, 2, 3, 4), (1, 3, 4), (2, 3, 4), (3,), (4,))
+
+        g_score[start] = 0.0
+        start_x, start_y = divmod(start, width)
+        f_score[start] = scale * (abs(start_x - goal_x) + abs(start_y - goal_y))
+        touched.append(start)
+        open_set = [(f_score[start], -0.0, start)]
+        expansions = 0
+        heap_pushes = 1
+
+        while open_set:
+            current_f, _, current = heappop(open_set)
+
+            if current == goal:
+                self.record_search(expansions, heap_pushes)
+                return self.unfold_jump_path(current)
+
+            if current_f > f_score[current]:
+                continue
+
+            current_g = g_score[current]
+            expansions += 1
+
+            if irregular[current]:
+                # Standard expansion, every successor is open in every direction
+                moves = [(current + neighbor_steps[neighbor_directions[slot]], slot_costs[slot], 0) for slot in range(neighbor_offsets[current], neighbor_offsets[current + 1])]
+            else:
+                moves = []
+                for direction in successors[arrival[current]]:
+                    jump_point = jump(current, direction, goal)
+                    if jump_point is not None:
+                        moves.append((jump_point[0], jump_point[1], direction))
+
+            for neighbor, distance, direction in moves:
+                tentative_g = current_g + distance
+                if tentative_g < g_score[neighbor]:
+                    if g_score[neighbor] == float('inf'): touched.append(neighbor)
+                    neighbor_x, neighbor_y = divmod(neighbor, width)
+                    came_from[neighbor] = current
+                    arrival[neighbor] = direction
+                    g_score[neighbor] = tentative_g
+                    f_score[neighbor] = tentative_g + (scale * (abs(neighbor_x - goal_x) + abs(neighbor_y - goal_y)))
+                    heappush(open_set, (f_score[neighbor], -tentative_g, neighbor))
+                    heap_pushes += 1
+
+        self.record_search(expansions, heap_pushes)
+        return None
+
+    def unfold_jump_path(self, current):
+        """
+        Rebuilds the path ending at cell "current" from the jump points' came_from, filling the straight runs between them.
+        """
+
+        width = self.grid.width
+        came_from = self.came_from
+
+        jump_points = [current]
+        while came_from[current] != -1:
+            current = came_from[current]
+            jump_points.append(current)
+        jump_points.reverse()
+
+        path = [jump_points[0]]
+        for previous, current in zip(jump_points, jump_points[1:]):
+            previous_x, previous_y = divmod(previous, width)
+            current_x, current_y = divmod(current, width)
+            if (previous_x == current_x) or (previous_y == current_y):
+                step = ((current_x > previous_x) - (current_x < previous_x)) * width + ((current_y > previous_y) - (current_y < previous_y))
+                path.extend(range(previous + step, current + step, step))
+            else:
+                path.append(current)
+
+        return path
+
+    def search_targets(self, start, goals):
+        """
+        Searches the best paths from cell "start" to every cell in "goals" at once (Dijkstra, stopping when every goal is settled).
+        Costs are the search's costs with velocity 1 (distances, outside altitude aware mode).
+
+        Args:
+            start        (int): Start cell's index.
+            goals  (list[int]): Goal cells' indexes.
+
+        Returns:
+            dict{int: list[int]}: Indexes of path's cells, from "start" to each goal. None, for goals that can't be reached.
+        """
+
+        self.refresh_altitude_tables()
+        self.reset()
+
+        neighbor_offsets = self.grid.neighbor_offsets
+        neighbor_directions = self.grid.neighbor_directions
+        neighbor_steps = self.grid.neighbor_steps
+        slot_costs = self.slot_costs
+        g_score = self.g_score
+        came_from = self.came_from
+        touched = self.touched
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        remaining = set(goals)
+        g_score[start] = 0.0
+        touched.append(start)
+        open_set = [(0.0, start)]
+        expansions = 0
+        heap_pushes = 1
+
+        while open_set and remaining:
+            current_g, current = heappop(open_set)
+
+            # Stale entry, "current" was already settled with a shorter distance
+            if current_g > g_score[current]:
+                continue
+
+            remaining.discard(current)
+            expansions += 1
+
+            for slot in range(neighbor_offsets[current], neighbor_offsets[current + 1]):
+                neighbor = current + neighbor_steps[neighbor_directions[slot]]
+                tentative_g = current_g + slot_costs[slot]
+
+                if tentative_g < g_score[neighbor]:
+                    if g_score[neighbor] == float('inf'): touched.append(neighbor)
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    heappush(open_set, (tentative_g, neighbor))
+                    heap_pushes += 1
+
+        self.record_search(expansions, heap_pushes)
+
+        paths = {}
+        for goal in goals:
+            if (goal in remaining) or (g_score[goal] == float('inf')):
+                paths[goal] = None
+                continue
+
+            current = goal
+            path = [current]
+            while came_from[current] != -1:
+                current = came_from[current]
+                path.append(current)
+            paths[goal] = path[::-1]
+
+        return paths
+
@@ -1,3 +1,8 @@
+from array import array
+from collections import deque
+from itertools import repeat
+import math
+
 class Product:
     """
     Product Class.
@@ -8,6 +13,8 @@ class Product:
         weight (float): Product's total weight.
     """
 
+    __slots__ = ("name", "price", "weight")
+
     def __init__(self, name, price, weight):
         """
         Initiates a new Product instance with specified values. Null or invalid values are considered as an error (raises ValueError).
@@ -44,6 +51,52 @@ class Product:
         self.price = price
         self.weight = weight
 
+    @classmethod
+    def from_columns(cls, names, prices, weights):
+        """
+        Creates many Products at once from columns of names, prices and weights (e.g. generated scenarios or columnar files).
+        Columns are validated once for the whole batch, instead of once per Product. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            names        (list[str]): Products' names.
+            prices   (array[float]): Products' prices. Any sequence of numbers, stored as floats.
+            weights  (array[float]): Products' weights. Any sequence of numbers, stored as floats.
+
+        Returns:
+            list[Product]: New Products, in columns' order.
+
+        Raises:
+            ValueError: If columns have different lengths, or have an empty name or a negative or NaN price or weight.
+            TypeError: If a name is not an instance of str, or a price or weight is not a number.
+        """
+
+        # Sanity Check #
+        # array('d') converts every number to float in one pass, and raises TypeError for anything else
+        try:
+            prices = prices if isinstance(prices, array) and prices.typecode == 'd' else array('d', prices)
+            weights = weights if isinstance(weights, array) and weights.typecode == 'd' else array('d', weights)
+        except TypeError:
+            raise TypeError("ERROR in from_columns in Product. Your Products' prices and weights must be numbers.")
+
+        if (len(names) != len(prices)) or (len(names) != len(weights)):
+            raise ValueError("ERROR in from_columns in Product. Your columns must have the same length.")
+        if (not all(isinstance(name, str) for name in names)):
+            raise TypeError("ERROR in from_columns in Product. Your Products' names must be instances of str.")
+        if ("" in names):
+            raise ValueError("ERROR in from_columns in Product. Your Products must have valid names.")
+        if any(map(math.isnan, prices)) or ((len(prices) > 0) and (min(prices) < 0.0)):
+            raise ValueError("ERROR in from_columns in Product. Your Products must have valid prices.")
+        if any(map(math.isnan, weights)) or ((len(weights) > 0) and (min(weights) < 0.0)):
+            raise ValueError("ERROR in from_columns in Product. Your Products must have valid weights.")
+
+        # Instances are created and each slot filled column by column, without running __init__
+        products = list(map(object.__new__, repeat(cls, len(names))))
+        deque(map(cls.name.__set__, products, names), maxlen=0)
+        deque(map(cls.price.__set__, products, prices), maxlen=0)
+        deque(map(cls.weight.__set__, products, weights), maxlen=0)
+
+        return products
+
     def get_product_info(self):
         """
         Gets Product's attributes.
@@ -51,7 +104,7 @@ class Product:
         Returns:
             dict: Product's attributes as a dictionary.
         """
-        return self.__dict__
+        return {"name": self.name, "price": self.price, "weight": self.weight}
 
     def __str__(self):
         """
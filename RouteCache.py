@@ -0,0 +1,181 @@
+from PathFinder import PathFinder
+from HierarchicalPathFinder import HierarchicalPathFinder
+
+from collections import OrderedDict
+
+class RouteCache:
+    """
+    RouteCache class. Least recently used cache of PathFinder's routes, keyed by (start index, goal index, velocity, drone class).
+
+    Every cached route is dropped when the Grid's terrain or the PathFinder's cost model changes. Routes of each drone class
+    (see PathFinder.drone_class) are kept side by side, so switching classes doesn't drop them.
+
+    Attributes:
+        path_finder   (PathFinder): PathFinder (or HierarchicalPathFinder) used on cache misses.
+        maximum_size         (int): Maximum number of cached routes.
+        routes       (OrderedDict): Cached routes (tuple[int] or None), from least to most recently used.
+        hits                 (int): Number of routes found in cache.
+        misses               (int): Number of routes that had to be searched.
+        invalidations        (int): Number of times the whole cache was dropped.
+        expansions           (int): Cells expanded to answer the last query (or batch, see search_many). 0, if every route was cached.
+        heap_pushes          (int): Entries pushed to the open set to answer the last query (or batch). 0, if every route was cached.
+        version  (tuple[int, int]): Grid's terrain_version and PathFinder's cost_model_version the cached routes were computed with.
+    """
+
+    def __init__(self, path_finder, maximum_size=4096):
+        """
+        Initiates a new RouteCache instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            path_finder (PathFinder): PathFinder (or HierarchicalPathFinder) used on cache misses.
+            maximum_size       (int): Maximum number of cached routes.
+
+        Raises:
+            ValueError: If attributes "path_finder", "maximum_size" are either None or invalid (Non positive values).
+            TypeError: If attributes "path_finder", "maximum_size" have incorrect types.
+        """
+
+        # Sanity Check #
+        if (path_finder is None):
+            raise ValueError("ERROR in __init__ in RouteCache. Your RouteCache must have a valid path_finder.")
+        if (not isinstance(path_finder, (PathFinder, HierarchicalPathFinder))):
+            raise TypeError("ERROR in __init__ in RouteCache. Your path_finder must be an instance of PathFinder or HierarchicalPathFinder.")
+
+        if (maximum_size is None) or (maximum_size <= 0):
+            raise ValueError("ERROR in __init__ in RouteCache. Your RouteCache must have a valid maximum_size.")
+        if (not isinstance(maximum_size, int)):
+            raise TypeError("ERROR in __init__ in RouteCache. Your RouteCache's maximum_size must be an instance of int.")
+
+        self.path_finder = path_finder
+        self.maximum_size = maximum_size
+        self.routes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.expansions = 0
+        self.heap_pushes = 0
+        self.version = self.get_current_version()
+
+    def get_current_version(self):
+        """
+        Returns the current terrain and cost model versions.
+
+        Returns:
+            tuple[int, int]: Grid's terrain_version and PathFinder's cost_model_version.
+        """
+
+        return (self.path_finder.grid.terrain_version, self.path_finder.cost_model_version)
+
+    def invalidate(self):
+        """
+        Drops every cached route.
+        """
+
+        self.routes.clear()
+        self.invalidations += 1
+        self.version = self.get_current_version()
+
+    def search(self, start, goal, velocity):
+        """
+        Returns the best path between cells "start" and "goal", searching it only if it isn't cached.
+
+        Args:
+            start      (int): Start cell's index.
+            goal       (int): Goal cell's index.
+            velocity (float): Drone's velocity during the whole route.
+
+        Returns:
+            tuple[int]: Indexes of path's cells, from "start" to "goal". None, if "goal" can't be reached.
+        """
+
+        if self.version != self.get_current_version():
+            self.invalidate()
+
+        key = (start, goal, velocity, self.path_finder.drone_class)
+        routes = self.routes
+
+        if key in routes:
+            self.hits += 1
+            self.expansions = 0
+            self.heap_pushes = 0
+            routes.move_to_end(key)
+            return routes[key]
+
+        self.misses += 1
+        path = self.path_finder.search(start, goal, velocity)
+        self.expansions = self.path_finder.expansions
+        self.heap_pushes = self.path_finder.heap_pushes
+        if path is not None:
+            path = tuple(path)
+
+        routes[key] = path
+        if len(routes) > self.maximum_size:
+            routes.popitem(last=False)
+
+        return path
+
+    def search_many(self, queries, planner=None):
+        """
+        Returns the best path of every query, in the same order. Routes that aren't cached are searched in one batch by
+        "planner" (see ParallelPlanner) if given, or one by one otherwise, and then cached.
+
+        Args:
+            queries (list[tuple[int, int, float]]): (start index, goal index, velocity) of every route.
+            planner            (ParallelPlanner): Searches the missing routes in parallel. None, to search them here.
+
+        Returns:
+            list[tuple[int]]: Path of every query (see search). None for the queries whose goal can't be reached.
+        """
+
+        if planner is None:
+            paths = []
+            expansions = heap_pushes = 0
+            for start, goal, velocity in queries:
+                paths.append(self.search(start, goal, velocity))
+                expansions += self.expansions
+                heap_pushes += self.heap_pushes
+            self.expansions = expansions
+            self.heap_pushes = heap_pushes
+            return paths
+
+        if self.version != self.get_current_version():
+            self.invalidate()
+
+        routes = self.routes
+        drone_class = self.path_finder.drone_class
+        keys = [(start, goal, velocity, drone_class) for start, goal, velocity in queries]
+        missing = list(dict.fromkeys(key for key in keys if key not in routes))
+
+        for key, path in zip(missing, planner.search_many([key[:3] for key in missing])):
+            routes[key] = path
+            if len(routes) > self.maximum_size:
+                routes.popitem(last=False)
+        self.expansions = planner.expansions
+        self.heap_pushes = planner.heap_pushes
+
+        self.misses += len(missing)
+        self.hits += len(queries) - len(missing)
+
+        paths = []
+        for key in keys:
+            if key in routes:
+                routes.move_to_end(key)
+                paths.append(routes[key])
+            else:
+                # Evicted by this same batch, so it is searched again
+                path = self.path_finder.search(*key[:3])
+                paths.append(tuple(path) if path is not None else None)
+                self.expansions += self.path_finder.expansions
+                self.heap_pushes += self.path_finder.heap_pushes
+
+        return paths
+
+    def get_route_cache_info(self):
+        """
+        Gets RouteCache's counters.
+
+        Returns:
+            dict: RouteCache's size, hits, misses and invalidations as a dictionary.
+        """
+
+        return {"size": len(self.routes), "hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
@@ -0,0 +1,110 @@
+from GridRenderer import GridRenderer
+
+import os
+import platform
+import sys
+
+def clear_terminal():
+    if platform.system() == "Windows":
+        os.system("cls")
+    else:
+        os.system("clear")
+
+
+class TerminalViewer:
+    """
+    TerminalViewer class. Interactive consumer of the simulation's EventLog: prints the Grid and waits for the user on every drone step.
+
+    On ANSI terminals only the cells that changed are redrawn on each step (see GridRenderer). Otherwise (e.g. output
+    redirected to a file) the whole Grid is printed on every step.
+
+    Attributes:
+        grid                (Grid): Simulated Grid.
+        drones       (list[Drone]): Simulated drones.
+        clients     (list[Client]): Simulated clients.
+        renderer    (GridRenderer): Incremental renderer. None, if the whole Grid is printed on every step.
+        status               (str): Messages shown below the Grid on the next step (incremental mode only).
+    """
+
+    def __init__(self, grid, drones, clients, incremental=None):
+        """
+        Initiates a new TerminalViewer instance.
+
+        Args:
+            grid            (Grid): Simulated Grid.
+            drones   (list[Drone]): Simulated drones. Read when events arrive, so it may still be empty.
+            clients (list[Client]): Simulated clients. Read when events arrive, so it may still be empty.
+            incremental     (bool): Redraw only changed cells. None, to do so only if stdout is an ANSI capable terminal.
+        """
+
+        if incremental is None:
+            incremental = sys.stdout.isatty() and (os.environ.get("TERM") != "dumb")
+
+        self.grid = grid
+        self.drones = drones
+        self.clients = clients
+        self.renderer = GridRenderer(grid) if incremental else None
+        self.status = ""
+
+    def get_drone(self, drone_id):
+        return next((drone for drone in self.drones if drone.id == drone_id), None)
+
+    def show(self, text):
+        """
+        Prints "text", or keeps it to be shown below the Grid on the next step in incremental mode.
+        """
+
+        if self.renderer is None:
+            print(text)
+        else:
+            self.status += text + "\n"
+
+    def step(self):
+        """
+        Shows the Grid and waits for the user.
+        """
+
+        if self.renderer is None:
+            print(self.grid)
+            foo = input("Next step...")
+            clear_terminal()
+        else:
+            self.renderer.render(self.status)
+            self.status = ""
+            foo = input("Next step...")
+
+    def __call__(self, event):
+        """
+        Handles a simulation event.
+
+        Args:
+            event (dict): Event emitted by the simulation.
+        """
+
+        kind = event["event"]
+
+        if kind == "drones_loaded":
+            for drone_id in event["drones"]:
+                print(drone_id)
+
+        elif (kind == "clients_loaded") or (kind == "orders_loaded"):
+            for client in self.clients:
+                print(client)
+
+        elif kind == "simulation_started":
+            clear_terminal()
+            self.step()
+
+        elif kind == "route_planned":
+            drone = self.get_drone(event["drone"])
+            visual_string = f"Current total battery: {(event['battery'] / drone.maximum_battery ) * 100:.2f}%\nWill consume {(event['battery_consumption'] / drone.maximum_battery) * 100:.2f}% to next route\n"
+            if event["went_to_recharge"]: visual_string += "Going back to base to recharge!\n"
+            self.show(visual_string)
+
+        elif kind == "returning_to_base":
+            self.show("Going back to get more orders.")
+
+        elif kind == "leg_flown":
+            for X, Y in event["path"]:
+                self.grid.move_drone(event["drone"], X, Y)
+                self.step()
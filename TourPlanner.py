@@ -0,0 +1,176 @@
+from PathFinder import PathFinder
+from CostModel import CostModel
+
+class TourPlanner:
+    """
+    TourPlanner class. Chooses the order in which a loaded Drone visits its clients, starting and ending at base.
+
+    Every pair of stops is priced once with one multi-target search per stop. A tour is then built with nearest neighbor
+    and improved with 2-opt and Or-opt moves. Tours are compared by flight time, including the detours to base the Drone
+    must take whenever its battery can't cover the next stop (see evaluate).
+
+    Attributes:
+        path_finder (PathFinder): Searches the paths between stops.
+        cost_model   (CostModel): Prices the paths between stops.
+        maximum_rounds     (int): Maximum number of improvement rounds per tour.
+    """
+
+    def __init__(self, path_finder, maximum_rounds=50):
+        """
+        Initiates a new TourPlanner instance with specified values. Null or invalid values are considered as an error (raises ValueError or TypeError).
+
+        Args:
+            path_finder (PathFinder): Searches the paths between stops.
+            maximum_rounds     (int): Maximum number of improvement rounds per tour.
+
+        Raises:
+            ValueError: If attributes "path_finder", "maximum_rounds" are either None or invalid (Negative values).
+            TypeError: If attributes "path_finder", "maximum_rounds" have incorrect types.
+        """
+
+        # Sanity Check #
+        if (path_finder is None):
+            raise ValueError("ERROR in __init__ in TourPlanner. Your TourPlanner must have a valid path_finder.")
+        if (not isinstance(path_finder, PathFinder)):
+            raise TypeError("ERROR in __init__ in TourPlanner. Your path_finder must be an instance of PathFinder.")
+
+        if (maximum_rounds is None) or (maximum_rounds < 0):
+            raise ValueError("ERROR in __init__ in TourPlanner. Your TourPlanner must have a valid maximum_rounds.")
+        if (not isinstance(maximum_rounds, int)):
+            raise TypeError("ERROR in __init__ in TourPlanner. Your TourPlanner's maximum_rounds must be an instance of int.")
+
+        self.path_finder = path_finder
+        self.cost_model = CostModel(path_finder.grid)
+        self.maximum_rounds = maximum_rounds
+
+    def build_cost_matrix(self, nodes):
+        """
+        Prices the shortest path between every pair of "nodes", with one multi-target search per node.
+
+        Args:
+            nodes (list[int]): Cells' indexes.
+
+        Returns:
+            tuple[list[list[float]], list[list[float]]]: Distance and altitude_distance (see CostModel) from nodes[i] to nodes[j]. Infinite distance if unreachable.
+        """
+
+        distances = [[0.0] * len(nodes) for _ in nodes]
+        altitude_distances = [[0.0] * len(nodes) for _ in nodes]
+
+        for i, node in enumerate(nodes):
+            paths = self.path_finder.search_targets(node, nodes)
+            for j, other in enumerate(nodes):
+                path = paths[other]
+                if path is None:
+                    distances[i][j] = float('inf')
+                else:
+                    distances[i][j], altitude_distances[i][j] = self.cost_model.score_route(path)
+
+        return distances, altitude_distances
+
+    def evaluate(self, tour, distances, altitude_distances, weights, drone):
+        """
+        Prices a tour (base, stops in "tour" order, base) the way the simulation flies it: the Drone carries its whole load
+        during the trip and, before each stop, checks that its battery covers the way to the stop and back to base (without
+        that stop's order). If it doesn't, the Drone goes back to base to recharge first.
+
+        Args:
+            tour                        (list[int]): Stops' order, as indexes into "weights" (node i + 1 in the cost matrix).
+            distances          (list[list[float]]): Distance matrix, node 0 is base.
+            altitude_distances (list[list[float]]): altitude_distance matrix, node 0 is base.
+            weights                   (list[float]): Weight delivered at each stop.
+            drone                          (Drone): Drone flying the tour.
+
+        Returns:
+            tuple[float, int]: Tour's flight time, recharge detours included, and number of recharges.
+        """
+
+        get_battery = self.cost_model.get_battery
+        weight = sum(weights)
+        velocity = drone.get_velocity(weight)
+        battery = drone.battery
+        time = 0.0
+        recharges = 0
+        previous = 0
+
+        for stop in tour:
+            node = stop + 1
+            needed = get_battery(distances[previous][node], altitude_distances[previous][node], weight, velocity) + get_battery(distances[node][0], altitude_distances[node][0], weight - weights[stop], velocity)
+
+            if (needed > battery) and (previous != 0):
+                time += distances[previous][0] / velocity
+                battery = drone.maximum_battery
+                recharges += 1
+                previous = 0
+                needed = get_battery(distances[0][node], altitude_distances[0][node], weight, velocity) + get_battery(distances[node][0], altitude_distances[node][0], weight - weights[stop], velocity)
+
+            time += distances[previous][node] / velocity
+            battery -= needed
+            previous = node
+
+        time += distances[previous][0] / velocity
+        return (time, recharges)
+
+    def plan(self, drone, base, stops, weights):
+        """
+        Chooses the order in which "drone" visits "stops", starting and ending at "base".
+
+        Args:
+            drone          (Drone): Drone flying the tour.
+            base             (int): Base cell's index.
+            stops      (list[int]): Stops cells' indexes.
+            weights  (list[float]): Weight delivered at each stop.
+
+        Returns:
+            list[int]: Stops' order, as indexes into "stops".
+        """
+
+        if len(stops) <= 1:
+            return list(range(len(stops)))
+
+        distances, altitude_distances = self.build_cost_matrix([base] + stops)
+
+        def cost(tour):
+            return self.evaluate(tour, distances, altitude_distances, weights, drone)
+
+        # Nearest neighbor
+        tour = []
+        unvisited = set(range(len(stops)))
+        previous = 0
+        while unvisited:
+            stop = min(unvisited, key=lambda candidate: (distances[previous][candidate + 1], candidate))
+            tour.append(stop)
+            unvisited.remove(stop)
+            previous = stop + 1
+
+        best = cost(tour)
+
+        for _ in range(self.maximum_rounds):
+            improved = False
+
+            # 2-opt: reverse a segment of the tour
+            for i in range(len(tour) - 1):
+                for j in range(i + 1, len(tour)):
+                    candidate = tour[:i] + tour[i:j + 1][::-1] + tour[j + 1:]
+                    candidate_cost = cost(candidate)
+                    if candidate_cost < best:
+                        tour, best, improved = candidate, candidate_cost, True
+
+            # Or-opt: move a segment of up to 3 stops somewhere else in the tour
+            for length in (1, 2, 3):
+                for i in range(len(tour) - length + 1):
+                    segment = tour[i:i + length]
+                    rest = tour[:i] + tour[i + length:]
+                    for j in range(len(rest) + 1):
+                        if j == i:
+                            continue
+                        candidate = rest[:j] + segment + rest[j:]
+                        candidate_cost = cost(candidate)
+                        if candidate_cost < best:
+                            tour, best, improved = candidate, candidate_cost, True
+                            break
+
+            if not improved:
+                break
+
+        return tour
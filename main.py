@@ -1,32 +1,197 @@
-from Grid import Grid
+from Grid import Grid, DEFAULT_ALTITUDE_PATH
 from Client import Client
 from Product import Product
 from Drone import Drone
 from Order import Order
-from queue import PriorityQueue
-import os
-import platform
+from PathFinder import PathFinder
+from RouteCache import RouteCache
+from DistanceField import DistanceField
+from CostModel import CostModel
+from EventLog import EventLog
+from EventQueue import EventQueue
+from Fleet import Fleet
+from OrderPacker import OrderPacker
+from TourPlanner import TourPlanner
+from HierarchicalPathFinder import HierarchicalPathFinder
+from ConstrainedPathFinder import ConstrainedPathFinder
+from ParallelPlanner import ParallelPlanner
+from Instrumentation import Instrumentation
+from TerminalViewer import TerminalViewer
+from itertools import islice
+import argparse
+import json
+import time
+
+# Searches each load's routes in worker processes before the load is flown. None, to search them one by one
+parallel_planner = None
+
+# Opt-in counters and phase timers (see --report and --profile). Disabled, it records nothing
+instrumentation = Instrumentation()
+
+# Routes back to base are read from a single shortest path tree rooted at base, instead of one A* per route. The tree floods
+# the whole Grid, so it only pays off when many routes go back to base (see --base-distance-field)
+use_base_distance_field = False
+
+# Legs are checked against a battery lower bound before searching, and a leg whose route runs out of battery is searched
+# again with the battery constrained search (see plan_leg), instead of sending the drone to recharge right away
+battery_aware_routing = False
+
+# Order lines parsed at once by iter_orders. Their Products and Orders are created and validated as one batch
+ORDER_CHUNK_SIZE = 1024
+
+def setup(height=5, width=5, altitude_path=DEFAULT_ALTITUDE_PATH, base=(2, 2)):
+    """
+    Creates a new, empty, simulation over a "height" x "width" Grid with base at "base". Drones, clients and orders are then loaded by build.
+    """
 
-grid = Grid(5, 5)
+    global grid, path_finder, route_cache, cost_model, tour_planner, constrained_path_finder, X_base, Y_base, base_fields
+    global clients, clients_by_name, drones, fleet, order_pool, order_stream, events
 
-# Drone's base coords
-X_base = 2
-Y_base = 2
+    grid = Grid(height, width, altitude_path)
+    path_finder = PathFinder(grid)
+    route_cache = RouteCache(path_finder)
+    cost_model = CostModel(grid)
+    tour_planner = TourPlanner(path_finder)
+    constrained_path_finder = ConstrainedPathFinder(path_finder)
 
-clients = []
-orders = []
-drones = []
+    # Drone's base coords
+    X_base, Y_base = base
+    # Shortest path trees to base, by (base index, drone class)
+    base_fields = {}
 
-def clear_terminal():
-    if platform.system() == "Windows":
-        os.system("cls")
-    else:
-        os.system("clear")
+    clients = []
+    clients_by_name = {}
+    drones = []
+    fleet = None
+
+    # Pending orders, packed into drone loads
+    order_pool = OrderPacker(base_position=grid.get_position_in_grid(X_base, Y_base))
+
+    # Orders not yet ingested. Read lazily from the orders file, see ingest_orders
+    order_stream = iter(())
+
+    # Every simulation step is emitted here. The interactive viewer is just one of its subscribers
+    events = EventLog()
+
+setup()
+
+def parse_orders(lines, clients_index):
+    """
+    Parses many order lines ("client,product price weight,...") at once. Their products are also added to their Clients.
+    Products and Orders are created column by column (see Product.from_columns and Order.from_columns), so they are validated once for all the lines.
+
+    Args:
+        lines               (list[str]): Orders' lines.
+        clients_index (dict{str: Client}): Clients by name.
+
+    Returns:
+        list[Order]: Parsed orders, in lines' order.
+
+    Raises:
+        ValueError: If an order's client does not exist.
+    """
+
+    order_clients = []
+    products_per_order = []
+    names = []
+    prices = []
+    weights = []
+
+    for line in lines:
+        parts = line.strip().split(',')
+        client_name = parts[0]
+        products = parts[1:]
+
+        # Check if client exists
+        client = clients_index.get(client_name)
+        if client == None:
+            raise ValueError("ERROR in build. Your client does not exist.")
+
+        for product in products:
+            product_name, price, weight = product.split()
+            names.append(product_name)
+            prices.append(float(price))
+            weights.append(float(weight))
+
+        order_clients.append(client)
+        products_per_order.append(len(products))
+
+    new_products = Product.from_columns(names, prices, weights)
+
+    products_lists = []
+    start = 0
+    for client, count in zip(order_clients, products_per_order):
+        products_list = new_products[start:start + count]
+        start += count
+
+        # Add products to the customer's product list
+        for new_product in products_list:
+            client.add_product(new_product)
+
+        products_lists.append(products_list)
 
+    return Order.from_columns(order_clients, products_lists)
 
-def build():
+def parse_order(line, clients_index):
+    """
+    Parses an order line ("client,product price weight,..."). Its products are also added to its Client.
+
+    Args:
+        line                       (str): Order's line.
+        clients_index (dict{str: Client}): Clients by name.
+
+    Returns:
+        Order: Parsed order.
+
+    Raises:
+        ValueError: If the order's client does not exist.
+    """
+
+    return parse_orders([line], clients_index)[0]
+
+def iter_orders(orders_path, clients_index):
+    """
+    Parses orders file ORDER_CHUNK_SIZE lines at a time (see parse_orders), yielding one Order per line.
+
+    Args:
+        orders_path                (str): Orders file's path.
+        clients_index (dict{str: Client}): Clients by name.
+
+    Yields:
+        Order: Next order in file.
+
+    Raises:
+        ValueError: If an order's client does not exist.
+    """
+
+    with open(orders_path, 'r') as arquivo:
+        lines = (line for line in arquivo if line.strip() != "")
+        while True:
+            chunk = list(islice(lines, ORDER_CHUNK_SIZE))
+            if len(chunk) == 0:
+                return
+
+            yield from parse_orders(chunk, clients_index)
+
+def ingest_orders(limit=None):
+    """
+    Moves up to "limit" orders from the order stream to the pending orders.
+
+    Args:
+        limit (int): Maximum number of orders ingested. Every remaining order, if None.
 
-    with open('./archives/drones.txt', 'r') as arquivo:
+    Returns:
+        int: Number of orders ingested.
+    """
+
+    new_orders = list(islice(order_stream, limit))
+    order_pool.add_orders(new_orders)
+    return len(new_orders)
+
+def build(drones_path='./archives/drones.txt', clients_path='./archives/clients1.txt', orders_path='./archives/orders1.txt', order_batch_size=None):
+    global order_stream
+
+    with open(drones_path, 'r') as arquivo:
         for line in arquivo: 
             maximum_altitude, maximum_weight, maximum_velocity = map(float, line.split(' ')) 
             current_drone = Drone(maximum_altitude, maximum_weight, maximum_velocity)
@@ -34,113 +199,236 @@ def build():
             drones.append(current_drone)
 
 
-    for drone in drones:
-        print(drone.id)
+    events.emit("drones_loaded", drones=[drone.id for drone in drones])
 
     base_position = grid.get_position_in_grid(X_base, Y_base)
     base_position.set_position_classification("base")
 
-    with open('./archives/clients1.txt', 'r') as arquivo:
+    with open(clients_path, 'r') as arquivo:
         for line in arquivo:
             name, positions = line.strip().split(',')  
             x, y = map(int, positions.split()) 
             client_position = grid.get_position_in_grid(x, y)
             client_position.set_position_classification("client")
-            clients.append(Client(name, client_position))
+            client = Client(name, client_position)
+            clients.append(client)
+            clients_by_name[name] = client
 
 
-    for client in clients:
-        print(client)
+    events.emit("clients_loaded", clients=[client.name for client in clients])
 
-    with open('./archives/orders1.txt', 'r') as arquivo:
-        for line in arquivo:
-            parts = line.strip().split(',')
-            client_name = parts[0] 
-            products = parts[1:]
+    # Orders are streamed, either all of them now or "order_batch_size" at a time while the simulation runs
+    order_stream = iter_orders(orders_path, clients_by_name)
+    events.emit("orders_loaded", orders=ingest_orders(order_batch_size))
 
-            # Check if client exists
-            client = next((client for client in clients if client.name == client_name), None)
-            if client == None:
-                raise ValueError("ERROR in build. Your client does not exist.")
+def manhattan_distance(node, goal):
+    return abs(node.X - goal.X) + abs(node.Y - goal.Y)
 
-            products_list = []
-            for product in products:
-                product_name, price, weight = product.split()
-                price = float(price)  
-                weight = float(weight)    
+def select_drone_class(drone):
+    """
+    Prices the next searches for "drone"'s class, in altitude aware mode (see PathFinder.select_drone_class).
+    """
 
-                # Add products to the customer's product list
-                new_product = Product(product_name, price, weight)
-                client.add_product(new_product)
+    if path_finder.altitude_aware:
+        path_finder.select_drone_class(drone.maximum_altitude)
 
-                products_list.append(new_product)
+def a_star(start, goal, drone):
+    select_drone_class(drone)
+    velocity = drone.update_drone_velocity()
+    start_index = grid.get_position_index(start)
+    goal_index = grid.get_position_index(goal)
 
-            orders.append(Order(client, products_list))
-            
-    for client in clients:
-        print(client)
+    if not instrumentation.enabled:
+        path = route_cache.search(start_index, goal_index, velocity)
+    else:
+        misses = route_cache.misses
+        path = route_cache.search(start_index, goal_index, velocity)
+        cached = (route_cache.misses == misses)
+        instrumentation.record_query(start_index, goal_index, velocity, cached, route_cache.expansions, route_cache.heap_pushes)
 
-def manhattan_distance(node, goal):
-    return abs(node.X - goal.X) + abs(node.Y - goal.Y)
+    if path is None:
+        return None
 
-def a_star(start, goal, drone):
-    open_set = PriorityQueue()
-    open_set.put((0, start.X, start.Y, start))
-    came_from = {}
-
-    g_score = {position: float('inf') for position in grid.positions}
-    g_score[start] = 0
-    f_score = {position: float('inf') for position in grid.positions}
-    f_score[start] = manhattan_distance(start, goal)
-
-    while not open_set.empty():
-        _, _, _, current = open_set.get()
-
-        # Client found
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            return path[::-1]
-        
-        #cost = distance / speed + battery_consumption(distance, altitude, weight)
-        for neighbor in grid.get_neighbors(current):
-            distance = manhattan_distance(current, neighbor)
-            altitude = neighbor.Z
-            weight = drone.current_weight
-            velocity = drone.update_drone_velocity()
-            cost = distance / velocity
-
-            if g_score[current] + cost < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = g_score[current] + cost
-                f_score[neighbor] = g_score[neighbor] + manhattan_distance(neighbor, goal)
-                open_set.put((f_score[neighbor], neighbor.X, neighbor.Y, neighbor))
+    return [grid.positions[index] for index in path]
 
 def battery_consumption(distance, altitude, weight, velocity):
     """
     Calculates battery consumption. It is defined by the function b -= distance * (base_consumption + altitude_factor + weight_factor)
     distance = manhattan_distance between initial an final point
-    base_consumption = 0.1 per grid
-    altitude_factor = 0.0001 * altitude
-    weight_facotr = 0.02 * weight
-    """
-    base_consumption = 10
+    base_consumption = 10 per grid
     altitude_factor = 0.0001 * altitude
     weight_factor = 0.1 * weight
-    return (distance / velocity) * (base_consumption + altitude_factor + weight_factor)
+    """
+    return cost_model.get_battery(distance, distance * altitude, weight, velocity)
+
+def get_base_field(base_position):
+    if not use_base_distance_field:
+        return None
+
+    # One tree per drone class, in altitude aware mode (see PathFinder.drone_class)
+    key = (grid.get_position_index(base_position), path_finder.drone_class)
+    field = base_fields.get(key)
+    if field is None:
+        field = base_fields[key] = DistanceField(path_finder, key[0], key[1])
+        instrumentation.count("distance_field_builds")
+    return field
+
+def route_to_base(start, base_position, drone):
+    select_drone_class(drone)
+    field = get_base_field(base_position)
+    if field is None:
+        return a_star(start, base_position, drone)
+
+    drone.update_drone_velocity()
+    path = field.get_route(grid.get_position_index(start))
+    if path is None:
+        return None
+
+    return [grid.positions[index] for index in path]
+
+def calculate_battery_to_base(start, base_position, drone, weight):
+    select_drone_class(drone)
+    field = get_base_field(base_position)
+    if field is None:
+        return calculate_battery_for_route(a_star(start, base_position, drone), weight, drone.velocity)
+
+    drone.update_drone_velocity()
+    return field.get_battery(grid.get_position_index(start), weight, drone.velocity)
 
 def calculate_battery_for_route(route, weight, velocity):
-    total_battery_consumed = 0
-    for i in range(len(route) - 1):
-        current = route[i]
-        next_node = route[i + 1]
-        distance = manhattan_distance(current, next_node)
-        altitude = current.Z
-        total_battery_consumed += battery_consumption(distance, altitude, weight, velocity)
-    return total_battery_consumed
+    return cost_model.get_route_battery([grid.get_position_index(position) for position in route], weight, velocity)
+
+def is_reachable(position, base_position, drone):
+    """
+    Checks that "drone" can fly to "position" and back to base at all. In altitude aware mode, "position" may be a no-fly cell for
+    "drone"'s class, or be walled off by them. Every other cell can be entered both ways, so a route back means a route there too.
+    """
+
+    if not path_finder.altitude_aware:
+        return True
+
+    select_drone_class(drone)
+    if path_finder.is_no_fly(grid.get_position_index(position)):
+        return False
+
+    return route_to_base(position, base_position, drone) is not None
+
+def get_route_duration(drone, route):
+    """
+    Gets how long "drone" takes to fly "route": its distance over "drone"'s velocity. In altitude aware mode, each cell's
+    altitude slows "drone" down (see PathFinder.cell_penalties).
+    """
+
+    select_drone_class(drone)
+    indexes = [grid.get_position_index(position) for position in route]
+    if path_finder.cell_penalties is not None:
+        return cost_model.score_route_time(indexes, path_finder.cell_penalties) / drone.velocity
+
+    distance, _ = cost_model.score_route(indexes)
+    return distance / drone.velocity
+
+def fly_route(drone, route, purpose, battery_consumption):
+    """
+    Moves "drone" along "route", emits it as a single "leg_flown" event and moves "drone"'s clock forward by the flight's duration.
+    """
+
+    duration = get_route_duration(drone, route)
+
+    drone.set_current_position(route[-1])
+    events.emit("leg_flown", drone=drone.id, purpose=purpose, time=fleet.get_time(drone), duration=duration, path=[[position.X, position.Y] for position in route], battery_consumption=battery_consumption)
+    fleet.advance(drone, duration)
+
+def plan_leg(start_position, client_position, base_position, drone, order_weight):
+    """
+    Plans "drone"'s next leg towards "client_position": the route to it if "drone"'s battery can take it there and then back to base,
+    otherwise the route back to base to recharge.
+
+    Returns:
+        tuple[list[Position], float, bool]: Leg's route, its battery consumption and True if "drone" has to recharge first.
+    """
+
+    if battery_aware_routing:
+        return plan_battery_aware_leg(start_position, client_position, base_position, drone, order_weight)
+
+    # Find best route to client
+    with instrumentation.phase("route_to_client"):
+        route_to_client = a_star(start_position, client_position, drone)
+    with instrumentation.phase("battery_evaluation"):
+        battery_consumption = calculate_battery_for_route(route_to_client, drone.current_weight, drone.velocity)
+        battery_consumption += calculate_battery_to_base(client_position, base_position, drone, (drone.current_weight - order_weight))
+    final_route = route_to_client
+
+    # If route taken consumes more battery than drone has or will make it get stuck, we must send drone to base to recharge
+    went_to_recharge = ( battery_consumption > drone.battery )
+    events.emit("route_planned", drone=drone.id, client=[client_position.X, client_position.Y], battery=drone.battery, battery_consumption=battery_consumption, went_to_recharge=went_to_recharge)
+
+    if went_to_recharge:
+        final_route, battery_consumption = plan_return_leg(drone.current_position, base_position, drone)
+
+    return final_route, battery_consumption, went_to_recharge
+
+def plan_battery_aware_leg(start_position, client_position, base_position, drone, order_weight):
+    """
+    Plans "drone"'s next leg like plan_leg, searching with the remaining battery in mind:
+    a leg whose battery lower bound (see ConstrainedPathFinder.get_lower_bound) is already over "drone"'s battery isn't searched at all,
+    and when a_star's route runs out of battery, the fastest route that fits (see ConstrainedPathFinder) is flown instead.
+    Only if none fits, "drone" goes back to base to recharge.
+
+    Returns:
+        tuple[list[Position], float, bool]: Leg's route, its battery consumption and True if "drone" has to recharge first.
+    """
+
+    velocity = drone.update_drone_velocity()
+    start = grid.get_position_index(start_position)
+    client = grid.get_position_index(client_position)
+
+    # Battery needed to get back to base from client, once its order is delivered
+    with instrumentation.phase("battery_evaluation"):
+        battery_to_base = calculate_battery_to_base(client_position, base_position, drone, (drone.current_weight - order_weight))
+        budget = drone.battery - battery_to_base
+        battery_consumption = constrained_path_finder.get_lower_bound(start, client, velocity, drone.current_weight) + battery_to_base
+
+    final_route = None
+    if battery_consumption <= drone.battery:
+        with instrumentation.phase("route_to_client"):
+            final_route = a_star(start_position, client_position, drone)
+        with instrumentation.phase("battery_evaluation"):
+            battery_consumption = calculate_battery_for_route(final_route, drone.current_weight, velocity) + battery_to_base
+
+        # a_star's route runs out of battery: the fastest one that doesn't, if any
+        if battery_consumption > drone.battery:
+            with instrumentation.phase("constrained_search"):
+                path = constrained_path_finder.search(start, client, velocity, drone.current_weight, budget)
+            if path is not None:
+                route = [grid.positions[index] for index in path]
+                with instrumentation.phase("battery_evaluation"):
+                    consumption = calculate_battery_for_route(route, drone.current_weight, velocity) + battery_to_base
+                if consumption <= drone.battery:
+                    final_route, battery_consumption = route, consumption
+                    instrumentation.count("constrained_routes")
+
+    went_to_recharge = ( battery_consumption > drone.battery )
+    events.emit("route_planned", drone=drone.id, client=[client_position.X, client_position.Y], battery=drone.battery, battery_consumption=battery_consumption, went_to_recharge=went_to_recharge)
+
+    if went_to_recharge:
+        final_route, battery_consumption = plan_return_leg(drone.current_position, base_position, drone)
+
+    return final_route, battery_consumption, went_to_recharge
+
+def plan_return_leg(start_position, base_position, drone):
+    """
+    Plans "drone"'s route back to base.
+
+    Returns:
+        tuple[list[Position], float]: Route to base and its battery consumption.
+    """
+
+    with instrumentation.phase("route_to_base"):
+        final_route = route_to_base(start_position, base_position, drone)
+    with instrumentation.phase("battery_evaluation"):
+        battery_consumption = calculate_battery_for_route(final_route, drone.current_weight, drone.velocity)
+
+    return final_route, battery_consumption
 
 def find_best_route_with_battery_check(start_position, client_position, base_position, drone, order_weight, more_orders):
 
@@ -148,98 +436,427 @@ def find_best_route_with_battery_check(start_position, client_position, base_pos
 
     # If drone hasn't finished it's orders
     if not more_orders:
-        # Find best route to client
-        route_to_client = a_star(start_position, client_position, drone)
-        battery_consumption = calculate_battery_for_route(route_to_client, drone.current_weight, drone.velocity)
-        route_to_base = a_star(client_position, base_position, drone)
-        battery_consumption += calculate_battery_for_route(route_to_base, (drone.current_weight - order_weight), drone.velocity)
-        final_route = route_to_client
-
-        visual_string = f"Current total battery: {(drone.battery / drone.maximum_battery ) * 100:.2f}%\nWill consume {(battery_consumption / drone.maximum_battery) * 100:.2f}% to next route\n"
-        # If route taken consumes more battery than drone has or will make it get stuck, we must send drone to base to recharge
-        if ( battery_consumption > drone.battery ):
-            went_to_recharge = True
-            final_route = a_star(drone.current_position, base_position, drone)
-            battery_consumption = calculate_battery_for_route(final_route, drone.current_weight, drone.velocity)
-
-        if went_to_recharge: visual_string += "Going back to base to recharge!\n"
-        print(visual_string)
-        for position in final_route:
-            drone.set_current_position(position)
-            position.set_position_classification("drone")
-            print(grid)
-            foo = input("Next step...")
-            clear_terminal()
-            grid.grid_update_position_classification()
+        final_route, battery_consumption, went_to_recharge = plan_leg(start_position, client_position, base_position, drone, order_weight)
+
+        with instrumentation.phase("fly_route"):
+            fly_route(drone, final_route, "recharge" if went_to_recharge else "delivery", battery_consumption)
 
         if (went_to_recharge):
             drone.update_drone_battery(drone.maximum_battery)
+            events.emit("drone_recharged", drone=drone.id)
         else:
             drone.update_drone_battery(drone.battery - battery_consumption)
 
 
     else:
-        print("Going back to get more orders.")
-        route_to_base = a_star(start_position, client_position, drone)
-        battery_consumption = calculate_battery_for_route(route_to_base, drone.current_weight, drone.velocity)
-        for position in route_to_base:
-            drone.set_current_position(position)
-            position.set_position_classification("drone")
-            print(grid)
-            foo = input("Next step...")
-            clear_terminal()
-            grid.grid_update_position_classification()
+        events.emit("returning_to_base", drone=drone.id)
+        final_route, battery_consumption = plan_return_leg(start_position, client_position, drone)
+        with instrumentation.phase("fly_route"):
+            fly_route(drone, final_route, "return", battery_consumption)
 
         drone.update_drone_battery(drone.maximum_battery)
+        events.emit("drone_recharged", drone=drone.id)
 
 
     return went_to_recharge
 
 
-def main():
-    build()
+def plan_drone_tour(drone, base_position):
+    """
+    Reorders "drone"'s orders so its clients are visited in the planned tour's order.
+    """
+
+    select_drone_class(drone)
+    drone_orders = drone.get_orders()
+    load_clients = list(drone_orders)
+    weights = [sum(product.weight for product in drone_orders[client]) for client in load_clients]
+    stops = [grid.get_position_index(client.position) for client in load_clients]
+
+    tour = tour_planner.plan(drone, grid.get_position_index(base_position), stops, weights)
+    planned_orders = [(load_clients[stop], drone_orders[load_clients[stop]]) for stop in tour]
 
-    clear_terminal()
-    print(grid)
-    foo = input("Next step...")
-    clear_terminal()
+    drone_orders.clear()
+    drone_orders.update(planned_orders)
+    events.emit("tour_planned", drone=drone.id, clients=[client.name for client, _ in planned_orders])
+
+
+def prefetch_drone_routes(drone):
+    """
+    Searches the routes between "drone"'s consecutive stops in one parallel batch, so a_star finds them cached.
+    Their searches' counters are recorded here, a_star then records them as cached queries.
+    """
+
+    select_drone_class(drone)
+    velocity = drone.get_velocity(drone.current_weight)
+    stops = [grid.get_position_index(drone.current_position)] + [grid.get_position_index(client.position) for client in drone.get_orders()]
+    route_cache.search_many([(start, goal, velocity) for start, goal in zip(stops, stops[1:])], parallel_planner)
+    instrumentation.count("prefetch_expansions", route_cache.expansions)
+    instrumentation.count("prefetch_heap_pushes", route_cache.heap_pushes)
+
+
+def summarize():
+    """
+    Builds the simulation's summary statistics from the recorded events.
+
+    Returns:
+        dict: Summary statistics.
+    """
+
+    legs = events.get_events("leg_flown")
+    cells_flown = sum(len(leg["path"]) - 1 for leg in legs)
+
+    return {
+        "deliveries": len(events.get_events("order_delivered")),
+        "legs": len(legs),
+        "cells_flown": cells_flown,
+        "battery_consumed": sum(leg["battery_consumption"] for leg in legs),
+        "recharges": len(events.get_events("drone_recharged")),
+        "rejected_orders": len(events.get_events("order_rejected")),
+        "packing": order_pool.get_packer_info(),
+        "route_cache": route_cache.get_route_cache_info(),
+        "hpa": route_cache.path_finder.get_hierarchical_path_finder_info() if isinstance(route_cache.path_finder, HierarchicalPathFinder) else None,
+        "path_finder": path_finder.get_path_finder_info(),
+        "constrained_path_finder": constrained_path_finder.get_constrained_path_finder_info() if battery_aware_routing else None,
+        "fleet": fleet.get_fleet_info(),
+        "parallel_planner": parallel_planner.get_planner_info() if parallel_planner is not None else None,
+    }
+
+
+def dispatch(order_batch_size=None, plan_tours=True):
+    """
+    Runs the fleet over every pending order (and every order still to be ingested) until none is left.
+
+    Args:
+        order_batch_size (int): Orders ingested at a time. None, if every order was already ingested.
+        plan_tours      (bool): Reorder each load's clients with the TourPlanner.
+    """
+
+    base_position = grid.get_position_in_grid(X_base, Y_base)
 
     # Add new order in drone
-    while len(orders) > 0 :
-        iterator = 0    
-        next_drone = drones[0]
-
-        # Adding all orders in drone. 
-        # Iterating through orders and making sure that the order's weight won't surpass drone's maximum weight
-        while iterator < len(orders):
-            next_order = orders[iterator]
-            next_weight = next_drone.current_weight + next_order.total_weight
-
-            if ( next_weight <= next_drone.maximum_weight ):
-                next_drone.add_new_order(next_order)
-                orders.remove(next_order)
-            else:
-                iterator += 1
+    while True:
+        if (order_batch_size is not None) and (len(order_pool) < order_batch_size):
+            ingested = ingest_orders(order_batch_size - len(order_pool))
+            if ingested > 0:
+                events.emit("orders_ingested", orders=ingested)
 
-        while len(next_drone.get_orders()) > 0:
-            orders_to_be_processed = next_drone.get_orders()
-            
-            client = next(iter(orders_to_be_processed))
-            products = orders_to_be_processed[client]
+        if len(order_pool) == 0:
+            break
 
-            order_weight = sum(product.weight for product in products)
+        # Next trip goes to the first drone to be available that can carry atleast one pending order
+        next_drone = fleet.next_drone(order_pool.get_lightest_weight())
+        if next_drone is None:
+            for order in order_pool.take_all():
+                events.emit("order_rejected", client=order.client.name, weight=order.total_weight)
+            break
 
-            went_to_recharge = find_best_route_with_battery_check(next_drone.current_position, client.position, grid.get_position_in_grid(X_base, Y_base), next_drone, order_weight, False)
+        # Adding a whole packed load in drone, it never surpasses drone's maximum weight
+        with instrumentation.phase("packing"):
+            load = order_pool.next_load(next_drone.maximum_weight - next_drone.current_weight)
 
-            if not went_to_recharge:
-                del next_drone.get_orders()[client]
+        fly_load(next_drone, load, base_position, plan_tours)
 
 
-        next_drone.clear_orders()
+def fly_load(drone, load, base_position, plan_tours=True):
+    """
+    Loads "drone" with "load" and flies it: every client in turn, recharging at base when needed, then back to base.
+
+    Args:
+        drone               (Drone): Drone at base.
+        load          (list[Order]): Orders packed for "drone".
+        base_position    (Position): Base's position.
+        plan_tours           (bool): Reorder the load's clients with the TourPlanner.
+    """
+
+    fleet.start_trip(drone)
+
+    for next_order in load:
+        drone.add_new_order(next_order)
+
+    if plan_tours:
+        with instrumentation.phase("tour_planning"):
+            plan_drone_tour(drone, base_position)
+
+    if parallel_planner is not None:
+        with instrumentation.phase("prefetch"):
+            prefetch_drone_routes(drone)
+
+    while len(drone.get_orders()) > 0:
+        orders_to_be_processed = drone.get_orders()
         
-        find_best_route_with_battery_check(next_drone.current_position, grid.get_position_in_grid(X_base, Y_base), grid.get_position_in_grid(X_base, Y_base), next_drone, order_weight, True)
+        client = next(iter(orders_to_be_processed))
+        products = orders_to_be_processed[client]
+
+        order_weight = sum(product.weight for product in products)
+
+        if not is_reachable(client.position, base_position, drone):
+            del drone.get_orders()[client]
+            events.emit("order_rejected", client=client.name, weight=order_weight, reason="unreachable")
+            continue
+
+        # A fully charged drone at base that still has to recharge can never reach this client
+        fully_charged_at_base = (drone.current_position == base_position) and (drone.battery == drone.maximum_battery)
+
+        went_to_recharge = find_best_route_with_battery_check(drone.current_position, client.position, base_position, drone, order_weight, False)
+
+        if not went_to_recharge:
+            del drone.get_orders()[client]
+            events.emit("order_delivered", drone=drone.id, client=client.name)
+        elif fully_charged_at_base:
+            del drone.get_orders()[client]
+            events.emit("order_rejected", client=client.name, weight=order_weight, reason="out_of_range")
+
+
+    drone.clear_orders()
+    
+    find_best_route_with_battery_check(drone.current_position, base_position, base_position, drone, 0.0, True)
+
+
+def schedule_next_leg(queue, drone, base_position):
+    """
+    Plans "drone"'s next leg (to its next client, to base to recharge, or back to base once its load is delivered) and schedules its departure now.
+    """
+
+    while len(drone.get_orders()) > 0:
+        orders_to_be_processed = drone.get_orders()
+
+        client = next(iter(orders_to_be_processed))
+        order_weight = sum(product.weight for product in orders_to_be_processed[client])
+
+        if not is_reachable(client.position, base_position, drone):
+            del orders_to_be_processed[client]
+            events.emit("order_rejected", client=client.name, weight=order_weight, reason="unreachable", time=queue.time)
+            continue
+
+        # A fully charged drone at base that still has to recharge can never reach this client
+        fully_charged_at_base = (drone.current_position == base_position) and (drone.battery == drone.maximum_battery)
+
+        route, battery_consumption, went_to_recharge = plan_leg(drone.current_position, client.position, base_position, drone, order_weight)
+
+        if went_to_recharge and fully_charged_at_base:
+            del orders_to_be_processed[client]
+            events.emit("order_rejected", client=client.name, weight=order_weight, reason="out_of_range", time=queue.time)
+            continue
+
+        queue.push(queue.time, "depart", drone=drone, route=route, purpose="recharge" if went_to_recharge else "delivery", battery_consumption=battery_consumption, client=client)
+        return
+
+    drone.clear_orders()
+    events.emit("returning_to_base", drone=drone.id)
+    route, battery_consumption = plan_return_leg(drone.current_position, base_position, drone)
+    queue.push(queue.time, "depart", drone=drone, route=route, purpose="return", battery_consumption=battery_consumption, client=None)
+
+
+def dispatch_events(order_batch_size=None, plan_tours=True, recharge_time=0.0, service_time=0.0):
+    """
+    Runs the fleet over every pending order as a discrete-event simulation, until none is left.
+
+    Instead of flying each load to completion before the next one is assigned, every drone's trip is a chain of timestamped
+    events (depart, arrive at client, deliver, return to base, recharge complete) in one EventQueue. Events are handled in
+    time order, so drones fly concurrently and a load goes to whichever drone is back at base first. Legs last distance / velocity,
+    and the clock jumps straight from one event to the next.
+
+    Args:
+        order_batch_size (int): Orders ingested at a time. None, if every order was already ingested.
+        plan_tours      (bool): Reorder each load's clients with the TourPlanner.
+        recharge_time  (float): Time a drone spends recharging at base.
+        service_time   (float): Time a drone spends handing over an order at its client.
+
+    Returns:
+        EventQueue: Queue the simulation ran on (see get_event_queue_info).
+    """
+
+    base_position = grid.get_position_in_grid(X_base, Y_base)
+    queue = EventQueue()
+
+    # Drones start at base, ready for a load. Ties go to the one with more free capacity, as in Fleet.next_drone
+    for drone in sorted(fleet.drones, key=lambda drone: (fleet.get_time(drone), -(drone.maximum_weight - drone.current_weight), drone.id)):
+        queue.push(fleet.get_time(drone), "ready", drone=drone)
+
+    # Drones waiting at base because every pending order is too heavy for them. They are ready again when new orders come in
+    parked = []
+
+    while len(queue) > 0:
+        time, kind, data = queue.pop()
+        drone = data["drone"]
+
+        if kind == "ready":
+            if (order_batch_size is not None) and (len(order_pool) < order_batch_size):
+                ingested = ingest_orders(order_batch_size - len(order_pool))
+                if ingested > 0:
+                    events.emit("orders_ingested", orders=ingested, time=time)
+                    for parked_drone in parked:
+                        fleet.wait(parked_drone, time - fleet.get_time(parked_drone))
+                        queue.push(time, "ready", drone=parked_drone)
+                    parked.clear()
+
+            # Drone stays at base: nothing left, or nothing it can carry
+            if len(order_pool) == 0:
+                continue
+
+            # Not even an empty drone of the fleet can carry the lightest order, so no pending order will ever be flown
+            if order_pool.get_lightest_weight() > fleet.get_maximum_capacity():
+                for order in order_pool.take_all():
+                    events.emit("order_rejected", client=order.client.name, weight=order.total_weight, time=time)
+                continue
+
+            # Pending orders are left to larger drones, even if they are still flying
+            if (drone.maximum_weight - drone.current_weight) < order_pool.get_lightest_weight():
+                parked.append(drone)
+                continue
+
+            fleet.start_trip(drone)
+
+            with instrumentation.phase("packing"):
+                load = order_pool.next_load(drone.maximum_weight - drone.current_weight)
+            for next_order in load:
+                drone.add_new_order(next_order)
+
+            if plan_tours:
+                with instrumentation.phase("tour_planning"):
+                    plan_drone_tour(drone, base_position)
+
+            if parallel_planner is not None:
+                with instrumentation.phase("prefetch"):
+                    prefetch_drone_routes(drone)
+
+            schedule_next_leg(queue, drone, base_position)
+
+        elif kind == "depart":
+            route = data["route"]
+            duration = get_route_duration(drone, route)
+            events.emit("leg_flown", drone=drone.id, purpose=data["purpose"], time=time, duration=duration, path=[[position.X, position.Y] for position in route], battery_consumption=data["battery_consumption"])
+            fleet.advance(drone, duration)
+
+            data["position"] = route[-1]
+            queue.push(time + duration, "return" if data["purpose"] != "delivery" else "arrive", **data)
+
+        elif kind == "arrive":
+            drone.set_current_position(data["position"])
+            fleet.wait(drone, service_time)
+            queue.push(time + service_time, "deliver", **data)
+
+        elif kind == "deliver":
+            client = data["client"]
+            drone.update_drone_battery(drone.battery - data["battery_consumption"])
+            del drone.get_orders()[client]
+            events.emit("order_delivered", drone=drone.id, client=client.name, time=time)
+            schedule_next_leg(queue, drone, base_position)
+
+        elif kind == "return":
+            drone.set_current_position(data["position"])
+            fleet.wait(drone, recharge_time)
+            queue.push(time + recharge_time, "recharge_complete", drone=drone)
+
+        elif kind == "recharge_complete":
+            drone.update_drone_battery(drone.maximum_battery)
+            events.emit("drone_recharged", drone=drone.id, time=time)
+
+            # Back from a mid-trip recharge it resumes its load. Back from its trip, it is ready for the next one
+            if len(drone.get_orders()) > 0:
+                schedule_next_leg(queue, drone, base_position)
+            else:
+                queue.push(time, "ready", drone=drone)
+
+    return queue
+
+
+def main(headless=False, event_log_path=None, order_batch_size=None, packing_strategy="first_fit_decreasing", plan_tours=True, workers=1, report_path=None, profile_path=None, heuristic="manhattan", heuristic_weight=1.0, tie_breaking="index", engine="a_star", cluster_size=32, jump_points=False, event_driven=False, recharge_time=0.0, service_time=0.0, battery_aware=False, altitude_aware=False, base_distance_field=False, drones_path='./archives/drones.txt', clients_path='./archives/clients1.txt', orders_path='./archives/orders1.txt'):
+    global fleet, order_pool, parallel_planner, route_cache, battery_aware_routing, use_base_distance_field
+
+    # Worker processes search with their own PathFinder, which doesn't know the drone classes' altitude tables
+    if altitude_aware and (workers > 1):
+        raise ValueError("ERROR in main. Parallel route planning searches flat A* routes, it can't be combined with altitude aware routing.")
+
+    path_finder.configure(heuristic, heuristic_weight, tie_breaking, jump_points, altitude_aware)
+    battery_aware_routing = battery_aware
+    use_base_distance_field = base_distance_field
+
+    # Routes are searched by a_star's engine: flat A* or HPA* over clusters of "cluster_size" cells
+    if engine == "hpa":
+        if workers > 1:
+            raise ValueError("ERROR in main. Parallel route planning searches flat A* routes, it can't be combined with the hpa engine.")
+        route_cache = RouteCache(HierarchicalPathFinder(path_finder, cluster_size))
+    order_pool = OrderPacker(packing_strategy, grid.get_position_in_grid(X_base, Y_base))
+
+    if not headless:
+        events.subscribe(TerminalViewer(grid, drones, clients))
+
+    instrumentation.enabled = (report_path is not None)
+    if profile_path is not None:
+        instrumentation.start_profiler()
+
+    start_time = time.perf_counter()
+    with instrumentation.phase("build"):
+        build(drones_path, clients_path, orders_path, order_batch_size=order_batch_size)
+
+    fleet = Fleet(drones)
+    if workers > 1:
+        parallel_planner = ParallelPlanner(grid, workers, path_finder=path_finder)
+    events.emit("simulation_started")
+
+    # Loads flown one after another, or every drone's trips interleaved in time order by a discrete-event simulation
+    queue = None
+    with instrumentation.phase("dispatch"):
+        if event_driven:
+            queue = dispatch_events(order_batch_size, plan_tours, recharge_time, service_time)
+        else:
+            dispatch(order_batch_size, plan_tours)
+
+    summary = summarize()
+    summary["event_queue"] = queue.get_event_queue_info() if queue is not None else None
+    summary["elapsed_seconds"] = time.perf_counter() - start_time
+
+    if profile_path is not None:
+        instrumentation.dump_profile(profile_path)
+    if report_path is not None:
+        instrumentation.write(report_path, summary=summary)
+
+    if parallel_planner is not None:
+        parallel_planner.close()
+    events.emit("simulation_finished", **summary)
+
+    if event_log_path is not None:
+        events.write(event_log_path)
 
+    return summary
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Drone path simulation.")
+    parser.add_argument("--altitude-path", metavar="PATH", default=DEFAULT_ALTITUDE_PATH, help="Altitude map: a text file (one altitude per line) or a binary altitude map.")
+    parser.add_argument("--height", metavar="N", type=int, default=5, help="Grid's height.")
+    parser.add_argument("--width", metavar="N", type=int, default=5, help="Grid's width.")
+    parser.add_argument("--base", metavar=("X", "Y"), type=int, nargs=2, default=(2, 2), help="Base's coords.")
+    parser.add_argument("--drones", metavar="PATH", default="./archives/drones.txt", help="Drones file.")
+    parser.add_argument("--clients", metavar="PATH", default="./archives/clients1.txt", help="Clients file.")
+    parser.add_argument("--orders", metavar="PATH", default="./archives/orders1.txt", help="Orders file.")
+    parser.add_argument("--headless", action="store_true", help="Run the whole order queue without terminal interaction and print the summary as JSON.")
+    parser.add_argument("--event-log", metavar="PATH", help="Write every simulation event to PATH, one JSON object per line.")
+    parser.add_argument("--order-batch-size", metavar="N", type=int, help="Ingest orders N at a time while the simulation runs, instead of all of them up front.")
+    parser.add_argument("--packing", choices=OrderPacker.STRATEGIES, default="first_fit_decreasing", help="How pending orders are packed into drone loads.")
+    parser.add_argument("--no-tour-planning", action="store_true", help="Visit a load's clients in the order they were loaded.")
+    parser.add_argument("--workers", metavar="N", type=int, default=1, help="Search each load's routes across N worker processes.")
+    parser.add_argument("--heuristic", choices=PathFinder.HEURISTICS, default="manhattan", help="A* heuristic. octile is admissible (optimal routes), manhattan is the original, close to greedy, one.")
+    parser.add_argument("--heuristic-weight", metavar="W", type=float, default=1.0, help="Weighted A*: multiply the heuristic by W (atleast 1.0).")
+    parser.add_argument("--tie-breaking", choices=PathFinder.TIE_BREAKINGS, default="index", help="Order of A* entries with the same f. deepest keeps octile from expanding every equally good cell.")
+    parser.add_argument("--jump-points", action="store_true", help="Jump over uniform-cost regions (JPS) instead of expanding every cell. Routes cost the same as an optimal search.")
+    parser.add_argument("--engine", choices=("a_star", "hpa"), default="a_star", help="Route search engine. hpa searches long routes over precomputed clusters (HPA*), cached next to the altitude map.")
+    parser.add_argument("--cluster-size", metavar="N", type=int, default=32, help="Cells per cluster's side with the hpa engine.")
+    parser.add_argument("--event-driven", action="store_true", help="Run the fleet as a discrete-event simulation: drones fly concurrently and each load goes to the first drone back at base.")
+    parser.add_argument("--recharge-time", metavar="T", type=float, default=0.0, help="Time a drone spends recharging at base, with --event-driven.")
+    parser.add_argument("--service-time", metavar="T", type=float, default=0.0, help="Time a drone spends handing over an order, with --event-driven.")
+    parser.add_argument("--battery-aware", action="store_true", help="Skip legs a drone's battery can't possibly cover, and fly a slower route that fits in its battery before sending it to recharge.")
+    parser.add_argument("--altitude-aware", action="store_true", help="Price moves by terrain altitude (drones fly slower up high) and never fly over cells above a drone's maximum altitude.")
+    parser.add_argument("--base-distance-field", action="store_true", help="Read routes back to base from one shortest path tree rooted at base, instead of one A* per route. Worth it when many routes go back to base.")
+    parser.add_argument("--report", metavar="PATH", help="Record A* expansions, heap pushes, cache hits and phase timings, and write them to PATH as JSON.")
+    parser.add_argument("--profile", metavar="PATH", help="Profile the run with cProfile and dump the stats to PATH (read it with pstats).")
+    args = parser.parse_args()
+
+    if not ((0 <= args.base[0] < args.height) and (0 <= args.base[1] < args.width)):
+        parser.error("--base must be inside the Grid.")
+    setup(args.height, args.width, args.altitude_path, tuple(args.base))
+
+    summary = main(headless=args.headless, event_log_path=args.event_log, order_batch_size=args.order_batch_size, packing_strategy=args.packing, plan_tours=not args.no_tour_planning, workers=args.workers, report_path=args.report, profile_path=args.profile, heuristic=args.heuristic, heuristic_weight=args.heuristic_weight, tie_breaking=args.tie_breaking, engine=args.engine, cluster_size=args.cluster_size, jump_points=args.jump_points, event_driven=args.event_driven, recharge_time=args.recharge_time, service_time=args.service_time, battery_aware=args.battery_aware, altitude_aware=args.altitude_aware, base_distance_field=args.base_distance_field, drones_path=args.drones, clients_path=args.clients, orders_path=args.orders)
+    if args.headless:
+        print(json.dumps(summary, indent=4))
@@ -0,0 +1,99 @@
+from collections import Counter
+import os
+import random
+import sys
+
+import pytest
+
+# Modules live at the repository's root, next to the archives main reads on import
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Fleet import Fleet
+from PathFinder import PathFinder
+
+@pytest.fixture
+def simulation(monkeypatch):
+    """
+    main, set up again over the archives' 5x5 Grid. Its module-wide switches are restored after the test.
+    """
+
+    monkeypatch.chdir(ROOT)
+    import main
+
+    monkeypatch.setattr(main, "use_base_distance_field", main.use_base_distance_field)
+    monkeypatch.setattr(main, "battery_aware_routing", main.battery_aware_routing)
+    main.setup()
+    return main
+
+@pytest.fixture
+def dispatch(simulation):
+    """
+    Flies every order of "paths" (the archives' files, if None) across the whole fleet, sequentially or event driven. Gets the clients delivered to and the (client, weight) rejected.
+    """
+
+    def fly(paths=None, order_batch_size=None, event_driven=False):
+        simulation.setup()
+        simulation.build(**(paths or {}), order_batch_size=order_batch_size)
+        simulation.fleet = Fleet(simulation.drones)
+
+        if event_driven:
+            simulation.dispatch_events(order_batch_size)
+        else:
+            simulation.dispatch(order_batch_size)
+
+        delivered = Counter(event["client"] for event in simulation.events.get_events("order_delivered"))
+        rejected = Counter((event["client"], event["weight"]) for event in simulation.events.get_events("order_rejected"))
+        return delivered, rejected
+
+    return fly
+
+@pytest.fixture
+def heterogeneous_scenario(tmp_path):
+    """
+    Input files for a fleet of a 20 and a 5 capacity drone, and orders of weight 8 only the first one can carry (and one no drone can).
+    """
+
+    rng = random.Random(1)
+    paths = {f"{name}_path": str(tmp_path / f"{name}.txt") for name in ("drones", "clients", "orders")}
+
+    with open(paths["drones_path"], 'w') as arquivo:
+        arquivo.write("2000.0 20.0 50.0\n2000.0 5.0 50.0\n")
+    with open(paths["clients_path"], 'w') as arquivo:
+        arquivo.writelines(f"C{i},{x} {y}\n" for i, (x, y) in enumerate([(0, 0), (1, 3), (4, 4), (3, 1), (2, 4)]))
+    with open(paths["orders_path"], 'w') as arquivo:
+        arquivo.writelines(f"C{rng.randrange(5)},P 1.0 {weight}\n" for weight in [8.0] * 60 + [3.0, 30.0])
+
+    return paths
+
+@pytest.fixture
+def make_path_finder():
+    """
+    Builds PathFinders searching with the octile heuristic (optimal routes), in altitude aware mode for a 2000 drone class if asked.
+    """
+
+    def make(grid, altitude_aware=False, jump_points=False):
+        path_finder = PathFinder(grid)
+        path_finder.configure(heuristic="octile", jump_points=jump_points, altitude_aware=altitude_aware)
+        if altitude_aware:
+            path_finder.select_drone_class(2000.0)
+        return path_finder
+
+    return make
+
+@pytest.fixture
+def route_cost():
+    """
+    Gets a path's cost at velocity 1 with a PathFinder's move costs, checking that every step is a move to a neighbor.
+    """
+
+    def get_route_cost(path_finder, path):
+        grid = path_finder.grid
+        cost = 0.0
+        for current, following in zip(path, path[1:]):
+            slots = [slot for slot in range(grid.neighbor_offsets[current], grid.neighbor_offsets[current + 1]) if current + grid.neighbor_steps[grid.neighbor_directions[slot]] == following]
+            assert len(slots) == 1
+            cost += path_finder.slot_costs[slots[0]]
+        return cost
+
+    return get_route_cost
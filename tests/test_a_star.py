@@ -0,0 +1,80 @@
+from Drone import Drone
+
+import heapq
+import random
+
+import pytest
+
+def baseline_a_star(grid, start, goal, drone):
+    """
+    The original A*: moves cost distance / velocity, the heuristic is the plain manhattan distance and ties go to the lowest (X, Y).
+    """
+
+    def manhattan_distance(node, other):
+        return abs(node.X - other.X) + abs(node.Y - other.Y)
+
+    velocity = drone.update_drone_velocity()
+    open_set = [(0, start.X, start.Y)]
+    came_from = {}
+    g_score = {(start.X, start.Y): 0}
+
+    while open_set:
+        _, X, Y = heapq.heappop(open_set)
+        current = grid.get_position_in_grid(X, Y)
+
+        if (X, Y) == (goal.X, goal.Y):
+            path = [(X, Y)]
+            while path[-1] in came_from:
+                path.append(came_from[path[-1]])
+            return path[::-1]
+
+        for neighbor in grid.get_neighbors(current):
+            key = (neighbor.X, neighbor.Y)
+            g = g_score[(X, Y)] + manhattan_distance(current, neighbor) / velocity
+            if g < g_score.get(key, float('inf')):
+                came_from[key] = (X, Y)
+                g_score[key] = g
+                heapq.heappush(open_set, (g + manhattan_distance(neighbor, goal), neighbor.X, neighbor.Y))
+
+    return None
+
+def assert_same_routes(simulation, pairs, weights):
+    grid = simulation.grid
+    for weight in weights:
+        drone = Drone(2000.0, 20.0, 50.0)
+        drone.current_weight = weight
+
+        for start, goal in pairs:
+            start_position = grid.get_position_in_grid(*start)
+            goal_position = grid.get_position_in_grid(*goal)
+            route = simulation.a_star(start_position, goal_position, drone)
+
+            assert [(position.X, position.Y) for position in route] == baseline_a_star(grid, start_position, goal_position, drone)
+
+def test_a_star_matches_baseline_on_archives(simulation):
+    cells = [(X, Y) for X in range(simulation.grid.height) for Y in range(simulation.grid.width)]
+    assert_same_routes(simulation, [(start, goal) for start in cells for goal in cells], (0.0, 5.0, 19.0))
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_a_star_matches_baseline_on_random_terrain(simulation, tmp_path, seed):
+    rng = random.Random(seed)
+    height, width = 12, 17
+
+    altitude_path = tmp_path / "altitude.txt"
+    altitude_path.write_text("".join(f"{rng.randint(0, 3000)}\n" for _ in range(height * width)))
+    simulation.setup(height, width, str(altitude_path), (height // 2, width // 2))
+
+    pairs = [((rng.randrange(height), rng.randrange(width)), (rng.randrange(height), rng.randrange(width))) for _ in range(150)]
+    assert_same_routes(simulation, pairs, (0.0, 12.5))
+
+def test_a_star_is_cached(simulation):
+    grid = simulation.grid
+    drone = Drone(2000.0, 20.0, 50.0)
+    start = grid.get_position_in_grid(0, 0)
+    goal = grid.get_position_in_grid(4, 3)
+
+    first = simulation.a_star(start, goal, drone)
+    second = simulation.a_star(start, goal, drone)
+
+    assert first == second
+    assert simulation.route_cache.hits == 1
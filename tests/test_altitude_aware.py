@@ -0,0 +1,139 @@
+from Drone import Drone
+from Grid import Grid
+from HierarchicalPathFinder import HierarchicalPathFinder
+from PathFinder import PathFinder
+from RouteCache import RouteCache
+
+from array import array
+import heapq
+import random
+
+import pytest
+
+def get_penalty(altitude, maximum_altitude):
+    """
+    Gets the cost factor of entering a cell at "altitude", straight from Drone's velocity model. None, for a no-fly cell.
+    """
+
+    if altitude > maximum_altitude:
+        return None
+    return 1.0 / (1.0 - (Drone.BETA * max(altitude, 0) / maximum_altitude))
+
+def get_step_cost(grid, current, following, maximum_altitude):
+    """
+    Gets the cost of moving from "current" to its 8-neighbor "following", computed from coordinates and altitudes only.
+    """
+
+    current_x, current_y = divmod(current, grid.width)
+    following_x, following_y = divmod(following, grid.width)
+    assert max(abs(current_x - following_x), abs(current_y - following_y)) == 1
+
+    penalty = get_penalty(grid.altitudes[following], maximum_altitude)
+    assert penalty is not None
+    return (abs(current_x - following_x) + abs(current_y - following_y)) * penalty
+
+def get_baseline_cost(grid, start, goal, maximum_altitude):
+    """
+    Dijkstra over the 8-neighbors of every cell, without Grid's neighbor table nor PathFinder's precomputed costs.
+    """
+
+    costs = {start: 0.0}
+    open_set = [(0.0, start)]
+    while open_set:
+        cost, current = heapq.heappop(open_set)
+        if current == goal:
+            return cost
+        if cost > costs[current]:
+            continue
+
+        x, y = divmod(current, grid.width)
+        for neighbor_x in range(max(x - 1, 0), min(x + 2, grid.height)):
+            for neighbor_y in range(max(y - 1, 0), min(y + 2, grid.width)):
+                neighbor = neighbor_x * grid.width + neighbor_y
+                if (neighbor == current) or (get_penalty(grid.altitudes[neighbor], maximum_altitude) is None):
+                    continue
+                neighbor_cost = cost + get_step_cost(grid, current, neighbor, maximum_altitude)
+                if neighbor_cost < costs.get(neighbor, float('inf')):
+                    costs[neighbor] = neighbor_cost
+                    heapq.heappush(open_set, (neighbor_cost, neighbor))
+
+    return None
+
+@pytest.mark.parametrize("maximum_altitude", [1200.0, 2000.0])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_routes_avoid_no_fly_cells_and_are_optimal(seed, maximum_altitude, route_cost):
+    rng = random.Random(seed)
+    height, width = 24, 30
+    grid = Grid.from_altitudes(height, width, array('i', [rng.choice((-100, 0, 500, 1000, 1500, 2500)) for _ in range(height * width)]))
+
+    path_finder = PathFinder(grid)
+    path_finder.configure(heuristic="octile", altitude_aware=True)
+    path_finder.select_drone_class(maximum_altitude)
+
+    for _ in range(40):
+        start, goal = rng.randrange(height * width), rng.randrange(height * width)
+        expected = get_baseline_cost(grid, start, goal, maximum_altitude)
+        path = path_finder.search(start, goal, 1.0)
+
+        assert (path is None) == (expected is None)
+        if path is None:
+            continue
+
+        assert (path[0], path[-1]) == (start, goal)
+        assert all(grid.altitudes[cell] <= maximum_altitude for cell in path[1:])
+        assert route_cost(path_finder, path) == pytest.approx(expected)
+
+def test_drone_classes_keep_their_own_routes(route_cost):
+    height, width = 9, 9
+    altitudes = array('i', [0] * (height * width))
+    # A 1500 high ridge across every row: only drone classes flying above it can cross
+    for x in range(height):
+        altitudes[x * width + width // 2] = 1500
+    grid = Grid.from_altitudes(height, width, altitudes)
+
+    path_finder = PathFinder(grid)
+    path_finder.configure(heuristic="octile", altitude_aware=True)
+    route_cache = RouteCache(path_finder)
+    start, goal = 4 * width, 4 * width + width - 1
+
+    path_finder.select_drone_class(2000.0)
+    high_route = route_cache.search(start, goal, 1.0)
+    path_finder.select_drone_class(1000.0)
+    low_route = route_cache.search(start, goal, 1.0)
+
+    assert high_route is not None
+    assert low_route is None
+
+    # Switching back reuses the cached route
+    path_finder.select_drone_class(2000.0)
+    assert route_cache.search(start, goal, 1.0) == high_route
+    assert route_cache.get_route_cache_info()["hits"] == 1
+
+    # Lowering the ridge changes the terrain, so the low class can now cross it
+    grid.set_altitude(0, width // 2, 500)
+    path_finder.select_drone_class(1000.0)
+    low_route = route_cache.search(start, goal, 1.0)
+    assert low_route is not None
+    assert route_cost(path_finder, low_route) == pytest.approx(get_baseline_cost(grid, start, goal, 1000.0))
+
+def test_terrain_edits_reprice_the_selected_drone_class(route_cost):
+    height, width = 12, 12
+    grid = Grid.from_altitudes(height, width, array('i', [0] * (height * width)))
+    path_finder = PathFinder(grid)
+    path_finder.configure(heuristic="octile", altitude_aware=True)
+    path_finder.select_drone_class(2000.0)
+    start, goal = 5 * width, 5 * width + width - 1
+    assert path_finder.search(start, goal, 1.0) is not None
+
+    # A no-fly wall with a single gap, without selecting the drone class again
+    for x in range(1, height):
+        grid.set_altitude(x, width // 2, 2500)
+
+    assert path_finder.is_no_fly(5 * width + width // 2)
+    expected = get_baseline_cost(grid, start, goal, 2000.0)
+    for search in (path_finder.search, RouteCache(path_finder).search, HierarchicalPathFinder(path_finder, 4, use_disk_cache=False).search):
+        path = search(start, goal, 1.0)
+        assert all(grid.altitudes[cell] <= 2000.0 for cell in path)
+        assert route_cost(path_finder, path) >= expected - 1e-9
+
+    assert route_cost(path_finder, path_finder.search(start, goal, 1.0)) == pytest.approx(expected)
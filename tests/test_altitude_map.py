@@ -0,0 +1,90 @@
+from AltitudeMap import BINARY_HEADER, BINARY_MAGIC, BINARY_VERSION, convert_text_to_binary, is_binary_altitude_file, load_binary_altitudes, read_text_altitudes, write_binary_altitudes
+from Grid import Grid
+import AltitudeMap
+
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+HEIGHT, WIDTH = 6, 7
+
+@pytest.fixture
+def text_path(tmp_path):
+    """
+    A text altitude map of HEIGHT x WIDTH random altitudes, some below sea level.
+    """
+
+    rng = random.Random(0)
+    path = tmp_path / "altitude.txt"
+    path.write_text("".join(f"{rng.randint(-500, 3000)}\n" for _ in range(HEIGHT * WIDTH)))
+    return str(path)
+
+def test_round_trip(text_path, tmp_path):
+    binary_path = str(tmp_path / "altitude.dalt")
+    convert_text_to_binary(text_path, binary_path, HEIGHT, WIDTH)
+
+    assert is_binary_altitude_file(binary_path)
+    assert not is_binary_altitude_file(text_path)
+    assert os.path.getsize(binary_path) == BINARY_HEADER.size + (4 * HEIGHT * WIDTH)
+    assert list(load_binary_altitudes(binary_path, HEIGHT, WIDTH)) == list(read_text_altitudes(text_path, HEIGHT, WIDTH))
+
+    # Grid reads either format into the same altitudes
+    assert list(Grid(HEIGHT, WIDTH, binary_path).altitudes) == list(Grid(HEIGHT, WIDTH, text_path).altitudes)
+
+def test_converter_command_line(text_path, tmp_path):
+    binary_path = str(tmp_path / "altitude.dalt")
+    subprocess.run([sys.executable, AltitudeMap.__file__, text_path, binary_path, str(HEIGHT), str(WIDTH)], check=True)
+
+    assert list(load_binary_altitudes(binary_path, HEIGHT, WIDTH)) == list(read_text_altitudes(text_path, HEIGHT, WIDTH))
+
+@pytest.mark.parametrize("header", [
+    BINARY_HEADER.pack(b"XALT", BINARY_VERSION, HEIGHT, WIDTH),
+    BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION + 1, HEIGHT, WIDTH),
+    BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, HEIGHT, WIDTH)[:BINARY_HEADER.size - 1],
+])
+def test_invalid_header(tmp_path, header):
+    path = tmp_path / "altitude.dalt"
+    path.write_bytes(header + bytes(4 * HEIGHT * WIDTH) if len(header) == BINARY_HEADER.size else header)
+
+    with pytest.raises(ValueError, match="is not a binary altitude map"):
+        load_binary_altitudes(str(path), HEIGHT, WIDTH)
+
+def test_other_grid_size(text_path, tmp_path):
+    binary_path = str(tmp_path / "altitude.dalt")
+    convert_text_to_binary(text_path, binary_path, HEIGHT, WIDTH)
+
+    with pytest.raises(ValueError, match=f"is {HEIGHT}x{WIDTH}, Grid is {WIDTH}x{HEIGHT}"):
+        load_binary_altitudes(binary_path, WIDTH, HEIGHT)
+
+@pytest.mark.parametrize("missing", [1, 4, 4 * HEIGHT * WIDTH])
+def test_truncated_altitudes(text_path, tmp_path, missing):
+    binary_path = tmp_path / "altitude.dalt"
+    convert_text_to_binary(text_path, str(binary_path), HEIGHT, WIDTH)
+    binary_path.write_bytes(binary_path.read_bytes()[:-missing])
+
+    with pytest.raises(ValueError, match="is truncated"):
+        load_binary_altitudes(str(binary_path), HEIGHT, WIDTH)
+
+def test_short_text_map(tmp_path):
+    path = tmp_path / "altitude.txt"
+    path.write_text("1\n2\n3\n")
+
+    with pytest.raises(ValueError, match="has 3 altitudes, Grid needs 42"):
+        read_text_altitudes(str(path), HEIGHT, WIDTH)
+    with pytest.raises(ValueError, match="Got 3 altitudes, Grid needs 42"):
+        write_binary_altitudes(str(tmp_path / "altitude.dalt"), HEIGHT, WIDTH, [1, 2, 3])
+
+def test_mapping_is_copy_on_write(text_path, tmp_path):
+    binary_path = tmp_path / "altitude.dalt"
+    convert_text_to_binary(text_path, str(binary_path), HEIGHT, WIDTH)
+    contents = binary_path.read_bytes()
+
+    grid = Grid(HEIGHT, WIDTH, str(binary_path))
+    grid.set_altitude(2, 3, 1234)
+
+    assert grid.altitudes[(2 * WIDTH) + 3] == 1234
+    assert binary_path.read_bytes() == contents
+    assert load_binary_altitudes(str(binary_path), HEIGHT, WIDTH)[(2 * WIDTH) + 3] == read_text_altitudes(text_path, HEIGHT, WIDTH)[(2 * WIDTH) + 3]
@@ -0,0 +1,74 @@
+from AltitudeMap import load_binary_altitudes
+import Benchmark
+from Instrumentation import summarize_timings
+
+import json
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+def test_summarize_timings():
+    assert summarize_timings([]) == {"calls": 0}
+
+    summary = summarize_timings([float(i) for i in range(100, 0, -1)])
+    assert summary == {"calls": 100, "total_seconds": 5050.0, "mean_seconds": 50.5, "p50_seconds": 51.0, "p95_seconds": 96.0, "max_seconds": 100.0}
+
+def test_generated_altitudes_are_flyable_and_reproducible():
+    altitudes = Benchmark.generate_altitudes(70, 90, random.Random(3), maximum=int(Benchmark.DRONE[0]), cell_size=16)
+
+    assert len(altitudes) == 70 * 90
+    assert 500 <= min(altitudes) and max(altitudes) <= Benchmark.DRONE[0]
+    assert altitudes == Benchmark.generate_altitudes(70, 90, random.Random(3), maximum=int(Benchmark.DRONE[0]), cell_size=16)
+
+def test_generated_scenario(tmp_path):
+    height, width, radius = 30, 40, 3
+    scenario = Benchmark.generate_scenario(str(tmp_path / "scenario"), height, width, 12, 50, 4, radius, 0)
+    base = scenario["base"]
+
+    assert len(load_binary_altitudes(scenario["altitude_path"], height, width)) == height * width
+
+    with open(scenario["clients_path"]) as arquivo:
+        clients = dict(line.strip().split(',') for line in arquivo)
+    assert len(clients) == 12
+    for coords in clients.values():
+        x, y = map(int, coords.split())
+        assert (x, y) != base
+        assert max(abs(x - base[0]), abs(y - base[1])) <= radius
+
+    with open(scenario["orders_path"]) as arquivo:
+        orders = arquivo.readlines()
+    assert len(orders) == 50
+    assert all(order.split(',')[0] in clients for order in orders)
+
+    with open(scenario["drones_path"]) as arquivo:
+        assert arquivo.readlines() == [" ".join(map(str, Benchmark.DRONE)) + "\n"] * 4
+
+def test_run_benchmark(simulation, tmp_path):
+    report = Benchmark.run_benchmark(24, 20, 6, 40, 2, 15, 2, 0, str(tmp_path))
+    results = report["results"]
+
+    assert report["config"]["queries"] == 15
+    assert results["a_star"]["calls"] == 15
+    assert results["score_routes"]["routes"] == results["calculate_battery_for_route"]["calls"]
+
+    # Every admissible mode finds routes of the same (optimal) length
+    distances = {mode["total_distance"] for name, mode in results["search_modes"].items() if name.startswith("octile-1.0-")}
+    assert len(distances) == 1
+
+    # Clients are all within reach, so every order is loaded on a drone
+    with open(tmp_path / "orders.txt") as arquivo:
+        weight = sum(float(product.split()[2]) for line in arquivo for product in line.strip().split(',')[1:])
+    assert results["dispatch_summary"]["rejected_orders"] == 0
+    assert results["dispatch_summary"]["packing"]["loaded_weight"] == pytest.approx(weight)
+
+def test_command_line(tmp_path):
+    output = tmp_path / "report.json"
+    subprocess.run([sys.executable, Benchmark.__file__, "--height", "16", "--width", "16", "--clients", "3", "--orders", "10", "--drones", "1", "--queries", "5", "--output", str(output)], check=True, cwd=os.path.dirname(Benchmark.__file__))
+
+    with open(output) as arquivo:
+        report = json.load(arquivo)
+    assert report["config"]["height"] == 16
+    assert report["results"]["a_star"]["calls"] == 5
@@ -0,0 +1,73 @@
+from ConstrainedPathFinder import ConstrainedPathFinder
+from CostModel import CostModel
+from Grid import Grid
+from PathFinder import PathFinder
+
+from array import array
+import random
+
+import pytest
+
+BUDGETS = (0.5, 1.0, 2.0, 5.0, 1e9)
+
+def get_simple_paths(grid, start, goal):
+    """
+    Gets every path from "start" to "goal" that never enters a cell twice.
+    """
+
+    paths = []
+    path = [start]
+
+    def extend(cell):
+        if cell == goal:
+            paths.append(list(path))
+            return
+        for slot in range(grid.neighbor_offsets[cell], grid.neighbor_offsets[cell + 1]):
+            neighbor = cell + grid.neighbor_steps[grid.neighbor_directions[slot]]
+            if neighbor not in path:
+                path.append(neighbor)
+                extend(neighbor)
+                path.pop()
+
+    extend(start)
+    return paths
+
+@pytest.mark.parametrize("altitude_choices", [(0, 20000, 60000), (-60000, -20000, 0, 20000)])
+def test_search_matches_brute_force(altitude_choices):
+    rng = random.Random(1)
+    velocity, weight = 40.0, 3.0
+
+    for _ in range(10):
+        height, width = 3, 4
+        grid = Grid.from_altitudes(height, width, array('i', [rng.choice(altitude_choices) for _ in range(height * width)]))
+        cost_model = CostModel(grid)
+        constrained_path_finder = ConstrainedPathFinder(PathFinder(grid))
+
+        for goal in range(1, height * width):
+            scored = [(cost_model.score_route(path)[0], cost_model.get_route_battery(path, weight, velocity)) for path in get_simple_paths(grid, 0, goal)]
+
+            for budget in BUDGETS:
+                feasible = [distance for distance, battery in scored if battery <= budget + 1e-9]
+                path = constrained_path_finder.search(0, goal, velocity, weight, budget)
+
+                if len(feasible) == 0:
+                    assert path is None
+                    continue
+
+                assert path is not None
+                assert (path[0], path[-1]) == (0, goal)
+                assert cost_model.score_route(path)[0] == min(feasible)
+                assert cost_model.get_route_battery(path, weight, velocity) <= budget + 1e-9
+
+def test_lower_bound_never_overestimates():
+    rng = random.Random(2)
+    velocity, weight = 20.0, 5.0
+    height, width = 3, 4
+
+    grid = Grid.from_altitudes(height, width, array('i', [rng.randint(-50000, 50000) for _ in range(height * width)]))
+    cost_model = CostModel(grid)
+    constrained_path_finder = ConstrainedPathFinder(PathFinder(grid))
+
+    for goal in range(1, height * width):
+        cheapest = min(cost_model.get_route_battery(path, weight, velocity) for path in get_simple_paths(grid, 0, goal))
+        assert constrained_path_finder.get_lower_bound(0, goal, velocity, weight) <= cheapest + 1e-9
@@ -0,0 +1,60 @@
+from CostModel import CostModel
+from Grid import Grid
+
+from array import array
+import random
+
+import pytest
+
+def random_route(rng, grid, length):
+    """
+    A route of "length" cells, each one a random step (straight or diagonal) from the previous one.
+    """
+
+    x, y = rng.randrange(grid.height), rng.randrange(grid.width)
+    route = [(x * grid.width) + y]
+    while len(route) < length:
+        x = min(max(x + rng.choice((-1, 0, 1)), 0), grid.height - 1)
+        y = min(max(y + rng.choice((-1, 0, 1)), 0), grid.width - 1)
+        route.append((x * grid.width) + y)
+    return route
+
+@pytest.fixture
+def grid():
+    rng = random.Random(0)
+    return Grid.from_altitudes(12, 15, array('i', [rng.randint(-50, 3000) for _ in range(12 * 15)]))
+
+def test_score_route_matches_segment_by_segment(grid):
+    rng = random.Random(1)
+    cost_model = CostModel(grid)
+
+    for length in (0, 1, 2, 30):
+        route = random_route(rng, grid, length) if length > 0 else []
+        distance, altitude_distance = 0, 0
+        for current, following in zip(route, route[1:]):
+            segment = abs((current // grid.width) - (following // grid.width)) + abs((current % grid.width) - (following % grid.width))
+            distance += segment
+            altitude_distance += segment * grid.altitudes[current]
+
+        assert cost_model.score_route(route) == (distance, altitude_distance)
+
+def test_score_routes_matches_each_route(grid):
+    rng = random.Random(2)
+    cost_model = CostModel(grid)
+
+    # Empty and single cell routes, between longer ones, must not take the segments joining their neighbors
+    routes = [random_route(rng, grid, rng.randint(1, 40)) for _ in range(50)] + [[], [7], random_route(rng, grid, 3)]
+    rng.shuffle(routes)
+    weights = [rng.uniform(0.0, 20.0) for _ in routes]
+    velocities = [rng.uniform(1.0, 50.0) for _ in routes]
+
+    distances, times, batteries = cost_model.score_routes(routes, weights, velocities)
+
+    assert len(distances) == len(times) == len(batteries) == len(routes)
+    for route, weight, velocity, distance, flight_time, battery in zip(routes, weights, velocities, distances, times, batteries):
+        assert distance == cost_model.score_route(route)[0]
+        assert flight_time == pytest.approx(distance / velocity)
+        assert battery == pytest.approx(cost_model.get_route_battery(route, weight, velocity))
+
+def test_score_routes_of_nothing(grid):
+    assert tuple(map(list, CostModel(grid).score_routes([], [], []))) == ([], [], [])
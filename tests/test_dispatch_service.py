@@ -0,0 +1,81 @@
+from DispatchService import DispatchService
+from Fleet import Fleet
+
+from collections import Counter
+import asyncio
+import os
+import threading
+
+import pytest
+
+ORDERS_PATH = "./archives/orders1.txt"
+
+def read_lines():
+    with open(ORDERS_PATH) as arquivo:
+        return [line for line in arquivo if line.strip() != ""]
+
+@pytest.fixture
+def service(simulation):
+    """
+    A DispatchService over the archives' drones and clients, with no pending orders.
+    """
+
+    simulation.build(orders_path=os.devnull)
+    simulation.fleet = Fleet(simulation.drones)
+    return DispatchService()
+
+def test_replayed_file_is_delivered(simulation, service):
+    lines = read_lines()
+
+    asyncio.run(service.run([service.replay_file(ORDERS_PATH)]))
+
+    delivered = Counter(event["client"] for event in simulation.events.get_events("order_delivered"))
+    rejected = simulation.events.get_events("order_rejected")
+
+    assert (service.received, service.invalid) == (len(lines), 0)
+    assert service.dispatched + len(rejected) == len(lines)
+    assert set(delivered) | {event["client"] for event in rejected} == {line.split(',')[0] for line in lines}
+    assert len(simulation.order_pool) == 0
+    assert len(service.latencies) == service.dispatched
+
+def test_replay_with_arrival_rate(simulation, service):
+    lines = read_lines()
+
+    asyncio.run(service.run([service.replay_file(ORDERS_PATH, arrival_rate=2000.0)]))
+
+    assert service.received == len(lines)
+    assert service.dispatched + len(simulation.events.get_events("order_rejected")) == len(lines)
+
+def test_orders_are_parsed_in_the_worker_thread(simulation, service, monkeypatch):
+    parse_order = simulation.parse_order
+    threads = set()
+
+    def recording_parse_order(line, clients_index):
+        threads.add(threading.get_ident())
+        return parse_order(line, clients_index)
+
+    monkeypatch.setattr(simulation, "parse_order", recording_parse_order)
+    asyncio.run(service.run([service.replay_file(ORDERS_PATH)]))
+
+    # Clients are only changed by the thread flying the trips, never by the event loop's
+    assert service.received == len(read_lines())
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
+
+def test_failing_source_leaves_no_task(service):
+    async def failing_source():
+        await service.submit(read_lines()[0])
+        await asyncio.sleep(0)
+        raise RuntimeError("source failed")
+
+    async def never_ending_source():
+        await asyncio.Event().wait()
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await service.run([failing_source(), never_ending_source()])
+
+        # The intake, the dispatcher and the other source were cancelled and awaited
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(run())
@@ -0,0 +1,99 @@
+from CostModel import CostModel
+from DistanceField import DistanceField
+from Drone import Drone
+from Grid import Grid
+
+from array import array
+import random
+
+import pytest
+
+HEIGHT, WIDTH = 14, 17
+
+@pytest.mark.parametrize("altitude_aware", [False, True])
+def test_routes_to_root_cost_as_much_as_a_star(altitude_aware, make_path_finder, route_cost):
+    rng = random.Random(0)
+    path_finder = make_path_finder(Grid.from_altitudes(HEIGHT, WIDTH, array('i', [rng.choice((-100, 0, 400, 1200, 1900, 2500)) for _ in range(HEIGHT * WIDTH)])), altitude_aware)
+    root = 6 * WIDTH + 8
+    field = DistanceField(path_finder, root, path_finder.drone_class)
+    cost_model = CostModel(path_finder.grid)
+
+    for index in range(HEIGHT * WIDTH):
+        expected = path_finder.search(index, root, 1.0)
+        route = field.get_route(index)
+
+        assert (route is None) == (expected is None)
+        if route is None:
+            assert field.cost[index] == float('inf')
+            continue
+
+        assert (route[0], route[-1]) == (index, root)
+        assert route_cost(path_finder, route) == pytest.approx(route_cost(path_finder, expected))
+        assert field.cost[index] == pytest.approx(route_cost(path_finder, expected))
+        assert field.distance[index] == cost_model.score_route(route)[0]
+        assert field.get_battery(index, 3.0, 20.0) == pytest.approx(cost_model.get_route_battery(route, 3.0, 20.0))
+
+@pytest.mark.parametrize("altitude_aware", [False, True])
+def test_return_leg_battery_matches_a_star(altitude_aware, make_path_finder):
+    # Every cell a route can start from or fly over is as high, so a route's battery only depends on its distance and any
+    # shortest route costs the same. No-fly peaks only exist in altitude aware mode
+    rng = random.Random(1)
+    peak = 2500 if altitude_aware else 700
+    path_finder = make_path_finder(Grid.from_altitudes(HEIGHT, WIDTH, array('i', [peak if rng.random() < 0.15 else 700 for _ in range(HEIGHT * WIDTH)])), altitude_aware)
+    root = next(index for index in range(HEIGHT * WIDTH) if not path_finder.is_no_fly(index))
+    field = DistanceField(path_finder, root, path_finder.drone_class)
+    cost_model = CostModel(path_finder.grid)
+
+    for index in range(HEIGHT * WIDTH):
+        if path_finder.is_no_fly(index):
+            continue
+        expected = path_finder.search(index, root, 1.0)
+        if expected is None:
+            assert field.get_battery(index, 3.0, 20.0) == float('inf')
+            continue
+        assert field.get_battery(index, 3.0, 20.0) == pytest.approx(cost_model.get_route_battery(expected, 3.0, 20.0))
+
+def test_terrain_change_rebuilds_the_tree(make_path_finder, route_cost):
+    path_finder = make_path_finder(Grid.from_altitudes(HEIGHT, WIDTH, array('i', [0]) * (HEIGHT * WIDTH)), True)
+    root = 0
+    field = DistanceField(path_finder, root, path_finder.drone_class)
+    assert field.get_route(WIDTH - 1) == list(range(WIDTH - 1, -1, -1))
+
+    # A no-fly cell on the straight route back: it is flown around
+    path_finder.grid.set_altitude(0, 5, 2500)
+    route = field.get_route(WIDTH - 1)
+    assert 5 not in route
+    assert route_cost(path_finder, route) == pytest.approx(route_cost(path_finder, path_finder.search(WIDTH - 1, root, 1.0)))
+
+@pytest.mark.parametrize("altitude_aware", [False, True])
+def test_base_distance_field_mode_matches_a_star(simulation, tmp_path, altitude_aware):
+    rng = random.Random(2)
+    peak = 2500 if altitude_aware else 700
+    altitude_path = tmp_path / "altitude.txt"
+    altitude_path.write_text("".join(f"{peak if rng.random() < 0.15 else 700}\n" for _ in range(HEIGHT * WIDTH)))
+
+    # Base is kept flyable, like every other cell a return leg can start from
+    simulation.setup(HEIGHT, WIDTH, str(altitude_path), (0, 0))
+    simulation.grid.set_altitude(0, 0, 700)
+    simulation.path_finder.configure(heuristic="octile", altitude_aware=altitude_aware)
+    drone = Drone(2000.0, 20.0, 50.0)
+    base_position = simulation.grid.get_position_in_grid(0, 0)
+
+    def return_leg(position):
+        route = simulation.route_to_base(position, base_position, drone)
+        if route is None:
+            return None
+        return simulation.calculate_battery_to_base(position, base_position, drone, 3.0)
+
+    simulation.select_drone_class(drone)
+    positions = [position for position in simulation.grid.positions if not simulation.path_finder.is_no_fly(simulation.grid.get_position_index(position))]
+    simulation.use_base_distance_field = False
+    expected = [return_leg(position) for position in positions]
+    simulation.use_base_distance_field = True
+    legs = [return_leg(position) for position in positions]
+
+    assert len(simulation.base_fields) == 1
+    for leg, expected_leg in zip(legs, expected):
+        assert (leg is None) == (expected_leg is None)
+        if leg is not None:
+            assert leg == pytest.approx(expected_leg)
@@ -0,0 +1,26 @@
+from EventLog import EventLog
+
+import json
+
+import pytest
+
+def test_subscribers_see_every_event_in_order(tmp_path):
+    events = EventLog()
+    seen = []
+    events.emit("before_subscribing", value=0)
+    events.subscribe(seen.append)
+
+    events.emit("leg_flown", drone=1, path=[[0, 0], [1, 1]])
+    events.emit("order_delivered", drone=1, client="C1")
+
+    assert [event["event"] for event in seen] == ["leg_flown", "order_delivered"]
+    assert [event["step"] for event in events.get_events()] == [0, 1, 2]
+    assert events.get_events("order_delivered") == [{"step": 2, "event": "order_delivered", "drone": 1, "client": "C1"}]
+
+    path = tmp_path / "events.jsonl"
+    events.write(str(path))
+    assert [json.loads(line) for line in path.read_text().splitlines()] == events.get_events()
+
+def test_subscriber_must_be_callable():
+    with pytest.raises(TypeError):
+        EventLog().subscribe("not callable")
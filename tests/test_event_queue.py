@@ -0,0 +1,50 @@
+from EventQueue import EventQueue
+
+import random
+
+import pytest
+
+def test_events_come_out_in_time_order():
+    rng = random.Random(0)
+    queue = EventQueue()
+    times = [rng.choice([1.0, 2.5, 4.0, rng.uniform(0, 10)]) for _ in range(200)]
+    for number, time in enumerate(times):
+        queue.push(time, "event", number=number)
+
+    popped = [queue.pop() for _ in range(len(times))]
+
+    # Earliest first, events of the same time in the order they were pushed
+    assert [(time, data["number"]) for time, _, data in popped] == sorted((time, number) for number, time in enumerate(times))
+    assert queue.time == max(times)
+    assert queue.get_event_queue_info() == {"time": max(times), "pending": 0, "processed": len(times)}
+
+def test_events_cant_be_scheduled_in_the_past():
+    queue = EventQueue()
+    queue.push(5.0, "event")
+    queue.pop()
+
+    with pytest.raises(ValueError):
+        queue.push(4.0, "event")
+    with pytest.raises(TypeError):
+        queue.push(6.0, None)
+    queue.push(5.0, "event")
+
+    assert queue.pop()[0] == 5.0
+    with pytest.raises(ValueError):
+        queue.pop()
+
+@pytest.mark.parametrize("order_batch_size", [None, 2])
+def test_dispatch_events_delivers_like_dispatch(dispatch, order_batch_size):
+    sequential = dispatch(order_batch_size=order_batch_size)
+    event_driven = dispatch(order_batch_size=order_batch_size, event_driven=True)
+
+    assert sum(sequential[0].values()) > 0
+    assert event_driven == sequential
+
+@pytest.mark.parametrize("order_batch_size", [None, 5])
+def test_dispatch_events_heterogeneous_fleet(dispatch, heterogeneous_scenario, order_batch_size):
+    sequential = dispatch(heterogeneous_scenario, order_batch_size)
+    event_driven = dispatch(heterogeneous_scenario, order_batch_size, event_driven=True)
+
+    assert [weight for _, weight in event_driven[1].elements()] == [30.0]
+    assert event_driven == sequential
@@ -0,0 +1,28 @@
+from Drone import Drone
+from Fleet import Fleet
+
+import pytest
+
+def test_next_drone_prefers_first_available():
+    small, large = Drone(2000.0, 5.0, 50.0), Drone(2000.0, 20.0, 50.0)
+    fleet = Fleet([small, large])
+
+    # Both are free at 0: the one with more free capacity goes first
+    assert fleet.next_drone() is large
+    fleet.advance(large, 10.0)
+    assert fleet.next_drone() is small
+    # Only "large" can carry 8, even while it is still flying
+    assert fleet.next_drone(8.0) is large
+    assert fleet.next_drone(30.0) is None
+
+    assert fleet.get_maximum_capacity() == 20.0
+    assert fleet.get_makespan() == 10.0
+
+@pytest.mark.parametrize("order_batch_size", [None, 5])
+def test_heterogeneous_fleet(simulation, dispatch, heterogeneous_scenario, order_batch_size):
+    delivered, rejected = dispatch(heterogeneous_scenario, order_batch_size)
+
+    # Only the order no drone can carry is rejected, even while the small drone is the only one at base
+    assert [weight for _, weight in rejected.elements()] == [30.0]
+    assert sum(delivered.values()) > 0
+    assert simulation.fleet.trips[simulation.drones[0].id] > 0
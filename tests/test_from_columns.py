@@ -0,0 +1,77 @@
+from Client import Client
+from Grid import Position
+from Order import Order
+from Product import Product
+
+from array import array
+import math
+
+import pytest
+
+class Name(str):
+    pass
+
+def test_products_from_columns():
+    products = Product.from_columns(["A", Name("B"), "C"], [1, 2.5, 0.0], array('d', [0.5, 3.0, 1.25]))
+
+    assert [product.get_product_info() for product in products] == [
+        {"name": "A", "price": 1.0, "weight": 0.5},
+        {"name": "B", "price": 2.5, "weight": 3.0},
+        {"name": "C", "price": 0.0, "weight": 1.25},
+    ]
+    assert all(isinstance(product.price, float) and isinstance(product.weight, float) for product in products)
+    assert Product.from_columns([], [], []) == []
+
+@pytest.mark.parametrize("names, prices, weights, error", [
+    (["A", "B"], [1.0], [1.0, 2.0], ValueError),
+    (["A", 2], [1.0, 1.0], [1.0, 2.0], TypeError),
+    (["A", ""], [1.0, 1.0], [1.0, 2.0], ValueError),
+    (["A"], [-1.0], [1.0], ValueError),
+    (["A"], [1.0], [-0.5], ValueError),
+    (["A"], [math.nan], [1.0], ValueError),
+    (["A", "B"], [1.0, 1.0], [1.0, math.nan], ValueError),
+    (["A"], ["1.0"], [1.0], TypeError),
+])
+def test_products_from_columns_validation(names, prices, weights, error):
+    with pytest.raises(error):
+        Product.from_columns(names, prices, weights)
+
+def test_orders_from_columns():
+    client = Client("C", Position(0, 0, 0))
+    products = Product.from_columns(["A", "B", "C"], [1.0, 1.0, 1.0], [0.5, 3.0, 1.25])
+
+    orders = Order.from_columns([client, client], [products[:2], products[2:]])
+
+    assert [order.get_order_info() for order in orders] == [
+        {"client": client, "products": products[:2], "total_weight": 3.5},
+        {"client": client, "products": products[2:], "total_weight": 1.25},
+    ]
+
+@pytest.mark.parametrize("clients, products, error", [
+    (["client"], [["product"]], TypeError),
+    ([None, None], [["product"]], ValueError),
+    ([None], [[]], ValueError),
+])
+def test_orders_from_columns_validation(clients, products, error):
+    client = Client("C", Position(0, 0, 0))
+    clients = [client if entry is None else entry for entry in clients]
+
+    with pytest.raises(error):
+        Order.from_columns(clients, products)
+
+def test_orders_file_is_parsed_in_chunks(simulation, monkeypatch):
+    monkeypatch.setattr(simulation, "ORDER_CHUNK_SIZE", 3)
+    simulation.build(order_batch_size=0)
+
+    lines = [line.strip() for line in open("./archives/orders1.txt") if line.strip() != ""]
+    orders = list(simulation.iter_orders("./archives/orders1.txt", simulation.clients_by_name))
+
+    assert len(orders) == len(lines)
+    for line, order in zip(lines, orders):
+        client_name, *products = line.split(',')
+        assert order.client is simulation.clients_by_name[client_name]
+        assert [(product.name, product.price, product.weight) for product in order.products] == [(name, float(price), float(weight)) for name, price, weight in map(str.split, products)]
+        assert order.total_weight == sum(product.weight for product in order.products)
+
+    with pytest.raises(ValueError):
+        simulation.parse_order("Nobody,P 1.0 1.0", simulation.clients_by_name)
@@ -0,0 +1,68 @@
+from Grid import Grid
+
+from array import array
+import tracemalloc
+
+import pytest
+
+def baseline_neighbor_table(height, width):
+    """
+    Neighbor table built cell by cell, with a bounds check per neighbor.
+    """
+
+    offsets, indexes, distances = [0], [], []
+    for x in range(height):
+        for y in range(width):
+            for delta_x, delta_y in Grid.NEIGHBOR_DELTAS:
+                if (0 <= x + delta_x < height) and (0 <= y + delta_y < width):
+                    indexes.append(((x + delta_x) * width) + y + delta_y)
+                    distances.append(abs(delta_x) + abs(delta_y))
+            offsets.append(len(indexes))
+    return offsets, indexes, distances
+
+@pytest.mark.parametrize("height", range(0, 6))
+@pytest.mark.parametrize("width", range(0, 6))
+def test_neighbor_table_matches_baseline(height, width):
+    grid = Grid.from_altitudes(height, width, array('i', [0]) * (height * width))
+
+    # Nothing read the table yet, so it isn't built
+    assert "neighbor_directions" not in vars(grid)
+
+    assert (list(grid.neighbor_offsets), list(grid.get_slot_neighbors()), list(grid.neighbor_distances)) == baseline_neighbor_table(height, width)
+
+def test_missing_attribute():
+    grid = Grid.from_altitudes(2, 2, array('i', [0]) * 4)
+
+    with pytest.raises(AttributeError):
+        grid.missing
+
+def test_neighbor_table_footprint():
+    height, width = 200, 300
+    grid = Grid.from_altitudes(height, width, array('i', [0]) * (height * width))
+
+    # 4 bytes per offset, then a direction and a distance byte per slot (8 per inner cell): about 21 bytes per cell,
+    # so a 10M cells table takes about 210 MB. Building it allocates nothing more than the table itself
+    tracemalloc.start()
+    try:
+        grid.build_neighbor_table()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    size = (grid.neighbor_offsets.itemsize * len(grid.neighbor_offsets)) + len(grid.neighbor_directions) + len(grid.neighbor_distances)
+    assert size <= 21 * height * width
+    assert peak <= 22 * height * width
+
+def test_classifying_an_occupied_cell():
+    grid = Grid.from_altitudes(3, 3, array('i', [0]) * 9)
+    grid.move_drone(0, 1, 1)
+    position = grid.get_position_in_grid(1, 1)
+
+    # The cell stays "drone" while occupied, and gets the new classification back when the drone leaves
+    position.set_position_classification("base")
+    assert (position.classification, position.last_classification) == ("drone", "base")
+    with pytest.raises(ValueError):
+        position.set_position_classification("runway")
+
+    grid.remove_drone(0)
+    assert position.classification == "base"
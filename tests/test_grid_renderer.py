@@ -0,0 +1,99 @@
+from Grid import Grid
+from GridRenderer import GridRenderer
+from TerminalViewer import TerminalViewer
+
+from array import array
+import io
+import random
+import re
+
+import pytest
+
+ESCAPE = re.compile(r"\x1b\[(?:(\d+);(\d+))?([HJ])|\x1b\[2J")
+
+def emulate_terminal(output):
+    """
+    Replays the ANSI sequences GridRenderer writes (cursor moves, clear screen, clear below cursor) on an empty screen.
+
+    Returns:
+        list[str]: Screen's lines.
+    """
+
+    screen = [[]]
+    line, column = 0, 0
+    position = 0
+
+    def write(text):
+        nonlocal line, column
+        for character in text:
+            if character == "\n":
+                line, column = line + 1, 0
+                continue
+            while len(screen) <= line:
+                screen.append([])
+            row = screen[line]
+            row.extend(" " * (column + 1 - len(row)))
+            row[column] = character
+            column += 1
+
+    for match in ESCAPE.finditer(output):
+        write(output[position:match.start()])
+        position = match.end()
+
+        if match.group(0) == "\x1b[2J":
+            screen = [[]]
+        elif match.group(3) == "H":
+            line, column = (int(match.group(1)) - 1, int(match.group(2)) - 1) if match.group(1) else (0, 0)
+        else:
+            del screen[line + 1:]
+            if line < len(screen):
+                del screen[line][column:]
+
+    write(output[position:])
+    return ["".join(row) for row in screen]
+
+@pytest.mark.parametrize("height, width", [(5, 5), (12, 104)])
+def test_frames_match_whole_board(height, width):
+    rng = random.Random(0)
+    grid = Grid.from_altitudes(height, width, array('i', [0]) * (height * width))
+    grid.get_position_in_grid(0, 0).set_position_classification("base")
+    stream = io.StringIO()
+    renderer = GridRenderer(grid, stream)
+
+    for frame in range(20):
+        for drone_id in range(3):
+            grid.move_drone(drone_id, rng.randrange(height), rng.randrange(width))
+        if frame % 7 == 6:
+            grid.remove_drone(rng.randrange(3))
+
+        renderer.render(f"frame {frame}")
+
+        # Only the first frame draws the whole board
+        assert (stream.getvalue().count("\x1b[2J") == 1)
+        assert emulate_terminal(stream.getvalue()) == str(grid).split("\n")[:-1] + [f"frame {frame}"]
+
+def test_invalidate_draws_whole_board():
+    grid = Grid.from_altitudes(4, 4, array('i', [0]) * 16)
+    stream = io.StringIO()
+    renderer = GridRenderer(grid, stream)
+
+    renderer.render()
+    grid.move_drone(0, 1, 1)
+    renderer.invalidate()
+    renderer.render()
+
+    assert stream.getvalue().count("\x1b[2J") == 2
+    assert len(grid.dirty_cells) == 0
+
+def test_viewer_moves_drones_along_legs(monkeypatch, capsys):
+    grid = Grid.from_altitudes(5, 5, array('i', [0]) * 25)
+    steps = []
+    monkeypatch.setattr("builtins.input", lambda prompt: steps.append(prompt))
+    viewer = TerminalViewer(grid, [], [], incremental=True)
+
+    viewer({"event": "returning_to_base"})
+    viewer({"event": "leg_flown", "drone": 7, "path": [[0, 0], [1, 1], [2, 1]]})
+
+    assert len(steps) == 3
+    assert grid.drone_cells == {7: {(2 * 5) + 1}}
+    assert emulate_terminal(capsys.readouterr().out)[:6] == str(grid).split("\n")[:6]
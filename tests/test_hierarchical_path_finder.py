@@ -0,0 +1,64 @@
+from Grid import Grid
+from HierarchicalPathFinder import HierarchicalPathFinder
+from PathFinder import PathFinder
+
+from array import array
+import os
+import random
+
+import pytest
+
+# HPA* routes cross clusters through their entrances, so they may be longer than A*'s. Never by more than this factor here
+SUBOPTIMALITY_BOUND = 1.5
+
+@pytest.mark.parametrize("altitude_aware", [False, True])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_routes_are_valid_and_near_optimal(seed, altitude_aware, make_path_finder, route_cost):
+    rng = random.Random(seed)
+    height, width = 40, 48
+    grid = Grid.from_altitudes(height, width, array('i', [rng.choice((0, 500, 1000, 1500, 2500)) for _ in range(height * width)]))
+
+    path_finder = make_path_finder(grid, altitude_aware)
+    hierarchical_path_finder = HierarchicalPathFinder(path_finder, 8, use_disk_cache=False)
+    reference = make_path_finder(grid, altitude_aware)
+
+    for _ in range(60):
+        start, goal = rng.randrange(height * width), rng.randrange(height * width)
+        expected = reference.search(start, goal, 1.0)
+        path = hierarchical_path_finder.search(start, goal, 1.0)
+
+        assert (path is None) == (expected is None)
+        if path is None:
+            continue
+
+        assert (path[0], path[-1]) == (start, goal)
+        assert not any(path_finder.is_no_fly(cell) for cell in path[1:])
+        assert route_cost(path_finder, path) <= SUBOPTIMALITY_BOUND * route_cost(reference, expected) + 1e-9
+
+    assert hierarchical_path_finder.abstract_searches > 0
+
+def write_altitudes(path, rng, size):
+    path.write_text("".join(f"{rng.randint(0, 3000)}\n" for _ in range(size)))
+
+def test_cache_file_follows_altitudes(tmp_path):
+    rng = random.Random(2)
+    height, width = 20, 20
+    altitude_path = tmp_path / "altitude.txt"
+    write_altitudes(altitude_path, rng, height * width)
+
+    def load():
+        return HierarchicalPathFinder(PathFinder(Grid(height, width, str(altitude_path))), 5)
+
+    first = load()
+    assert not first.loaded_from_disk
+    assert os.path.exists(first.get_cache_path())
+
+    second = load()
+    assert second.loaded_from_disk
+    assert (list(second.node_cells), list(second.edge_targets), list(second.edge_costs)) == (list(first.node_cells), list(first.edge_targets), list(first.edge_costs))
+
+    # Different altitudes, so a different CRC: the stale file is rebuilt, then reused
+    write_altitudes(altitude_path, rng, height * width)
+    third = load()
+    assert not third.loaded_from_disk
+    assert load().loaded_from_disk
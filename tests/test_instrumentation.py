@@ -0,0 +1,39 @@
+from Drone import Drone
+from HierarchicalPathFinder import HierarchicalPathFinder
+from Instrumentation import Instrumentation
+from RouteCache import RouteCache
+
+import random
+
+import pytest
+
+@pytest.mark.parametrize("engine", ["a_star", "hpa"])
+def test_queries_report_their_own_search(simulation, monkeypatch, tmp_path, engine):
+    rng = random.Random(0)
+    height = width = 24
+
+    altitude_path = tmp_path / "altitude.txt"
+    altitude_path.write_text("".join(f"{rng.randint(0, 3000)}\n" for _ in range(height * width)))
+    simulation.setup(height, width, str(altitude_path), (0, 0))
+    if engine == "hpa":
+        simulation.route_cache = RouteCache(HierarchicalPathFinder(simulation.path_finder, 4, use_disk_cache=False))
+    monkeypatch.setattr(simulation, "instrumentation", Instrumentation(True))
+
+    grid = simulation.grid
+    drone = Drone(2000.0, 20.0, 50.0)
+    start = grid.get_position_in_grid(0, 0)
+    goal = grid.get_position_in_grid(height - 1, width - 1)
+
+    simulation.a_star(start, goal, drone)
+    simulation.a_star(start, goal, drone)
+    first, second = simulation.instrumentation.queries
+
+    engine_searches = simulation.route_cache.path_finder
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert (first["expansions"], first["heap_pushes"]) == (engine_searches.expansions, engine_searches.heap_pushes)
+    assert (second["expansions"], second["heap_pushes"]) == (0, 0)
+
+    if engine == "hpa":
+        # Every refinement is counted, not only the last one
+        assert engine_searches.abstract_searches == 1
+        assert first["expansions"] > simulation.path_finder.expansions
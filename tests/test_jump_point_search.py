@@ -0,0 +1,56 @@
+from Grid import Grid
+
+from array import array
+import random
+
+import pytest
+
+# Uniform terrain, sparse peaks (mostly uniform regions) and fully random terrain (mostly irregular cells)
+TERRAINS = {
+    "uniform": lambda rng: 0,
+    "sparse": lambda rng: 2500 if rng.random() < 0.1 else 0,
+    "random": lambda rng: rng.choice((0, 500, 1000, 1500, 2500)),
+}
+
+@pytest.mark.parametrize("altitude_aware", [False, True])
+@pytest.mark.parametrize("terrain", sorted(TERRAINS))
+def test_routes_are_valid_and_optimal(terrain, altitude_aware, make_path_finder, route_cost):
+    rng = random.Random(terrain)
+    height, width = 30, 36
+    grid = Grid.from_altitudes(height, width, array('i', [TERRAINS[terrain](rng) for _ in range(height * width)]))
+
+    path_finder = make_path_finder(grid, altitude_aware, jump_points=True)
+    reference = make_path_finder(grid, altitude_aware)
+
+    for _ in range(80):
+        start, goal = rng.randrange(height * width), rng.randrange(height * width)
+        expected = reference.search(start, goal, 1.0)
+        path = path_finder.search(start, goal, 1.0)
+
+        assert (path is None) == (expected is None)
+        if path is None:
+            continue
+
+        assert (path[0], path[-1]) == (start, goal)
+        assert not any(path_finder.is_no_fly(cell) for cell in path[1:])
+        assert route_cost(path_finder, path) == pytest.approx(route_cost(reference, expected))
+
+def test_terrain_change_rebuilds_jump_tables(make_path_finder, route_cost):
+    height, width = 12, 12
+    grid = Grid.from_altitudes(height, width, array('i', [0] * (height * width)))
+    path_finder = make_path_finder(grid, altitude_aware=True, jump_points=True)
+
+    start, goal = 5 * width, 5 * width + width - 1
+    assert path_finder.search(start, goal, 1.0) == list(range(start, goal + 1))
+
+    # A no-fly wall with a single gap: the uniform region the jump tables were built for is gone
+    for x in range(1, height):
+        grid.set_altitude(x, width // 2, 2500)
+
+    path = path_finder.search(start, goal, 1.0)
+    assert (path[0], path[-1]) == (start, goal)
+    assert all(grid.altitudes[cell] <= path_finder.drone_class for cell in path)
+
+    # Same cost as an A* search built after the edit
+    reference = make_path_finder(grid, altitude_aware=True)
+    assert route_cost(path_finder, path) == pytest.approx(route_cost(reference, reference.search(start, goal, 1.0)))
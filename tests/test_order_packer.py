@@ -0,0 +1,93 @@
+from Client import Client
+from Grid import Position
+from Order import Order
+from OrderPacker import OrderPacker
+from Product import Product
+
+import random
+
+import pytest
+
+def make_orders(rng, count, maximum_weight):
+    """
+    Makes "count" single Product orders of random weights up to "maximum_weight", for clients around a base at (5, 5).
+    """
+
+    clients = [Client(f"C{i}", Position(rng.randrange(11), rng.randrange(11), 0)) for i in range(10)]
+    return [Order(rng.choice(clients), [Product("P", 1.0, round(rng.uniform(0.1, maximum_weight), 2))]) for _ in range(count)]
+
+def baseline_best_fit(orders, capacity):
+    """
+    Best fit by a linear scan over every open load: each order goes in the load it leaves with the least room (the first one, on ties).
+    """
+
+    loads = []
+    room = []
+    for order in orders:
+        best = None
+        for load_index, remaining in enumerate(room):
+            if (remaining >= order.total_weight - OrderPacker.TOLERANCE) and ((best is None) or (remaining < room[best])):
+                best = load_index
+        if best is None:
+            best = len(loads)
+            loads.append([])
+            room.append(capacity)
+        loads[best].append(order)
+        room[best] -= order.total_weight
+    return loads
+
+@pytest.mark.parametrize("seed", range(5))
+def test_best_fit_matches_baseline(seed):
+    rng = random.Random(seed)
+    orders = sorted(make_orders(rng, 300, 12.0), key=lambda order: order.total_weight, reverse=True)
+
+    assert OrderPacker("best_fit").pack_best_fit(orders, 10.0) == baseline_best_fit(orders, 10.0)
+
+@pytest.mark.parametrize("strategy", OrderPacker.STRATEGIES)
+def test_loads_fit_capacity(strategy):
+    rng = random.Random(2)
+    orders = make_orders(rng, 200, 12.0)
+    packer = OrderPacker(strategy, Position(5, 5, 0))
+
+    loads, oversized = packer.pack(orders, 10.0)
+
+    assert all(sum(order.total_weight for order in load) <= 10.0 + OrderPacker.TOLERANCE for load in loads)
+    assert sorted(map(id, oversized + [order for load in loads for order in load])) == sorted(map(id, orders))
+    assert all(order.total_weight > 10.0 for order in oversized)
+
+def test_next_load_alternating_capacities(monkeypatch):
+    rng = random.Random(3)
+    orders = make_orders(rng, 200, 6.0)
+    packer = OrderPacker()
+    packer.add_orders(orders)
+
+    packed = []
+    pack = packer.pack
+    monkeypatch.setattr(packer, "pack", lambda orders, capacity: packed.append(capacity) or pack(orders, capacity))
+
+    handed_out = []
+    capacities = [20.0, 7.5]
+    while len(packer) > 0:
+        capacity = capacities[len(handed_out) % 2]
+        load = packer.next_load(capacity)
+        assert 0 < sum(order.total_weight for order in load) <= capacity + OrderPacker.TOLERANCE
+        handed_out.extend(load)
+
+    # Each capacity is packed once, and every order is handed out exactly once
+    assert packed == capacities
+    assert sorted(map(id, handed_out)) == sorted(map(id, orders))
+    assert packer.next_load(20.0) == []
+
+def test_next_load_repacks_new_orders():
+    rng = random.Random(4)
+    packer = OrderPacker()
+    packer.add_orders(make_orders(rng, 10, 6.0))
+    packer.next_load(10.0)
+
+    new_orders = make_orders(rng, 10, 6.0)
+    packer.add_orders(new_orders)
+    handed_out = []
+    while len(packer) > 0:
+        handed_out.extend(packer.next_load(10.0))
+
+    assert set(map(id, new_orders)) <= set(map(id, handed_out))
@@ -0,0 +1,45 @@
+from Grid import Grid
+from ParallelPlanner import ParallelPlanner
+from PathFinder import PathFinder
+
+from array import array
+import random
+
+import pytest
+
+def search_sequentially(path_finder, queries):
+    paths = []
+    for start, goal, velocity in queries:
+        path = path_finder.search(start, goal, velocity)
+        paths.append(tuple(path) if path is not None else None)
+    return paths
+
+@pytest.mark.parametrize("settings", [("manhattan", 1.0, "index", False), ("octile", 1.0, "deepest", False), ("octile", 1.0, "deepest", True)])
+def test_parallel_routes_match_sequential(settings):
+    rng = random.Random(0)
+    height, width = 30, 35
+    grid = Grid.from_altitudes(height, width, array('i', [rng.randint(0, 3000) for _ in range(height * width)]))
+    path_finder = PathFinder(grid)
+    path_finder.configure(*settings)
+
+    queries = [(rng.randrange(height * width), rng.randrange(height * width), rng.choice((10.0, 37.5))) for _ in range(60)]
+
+    with ParallelPlanner(grid, workers=2, chunk_size=7, path_finder=path_finder) as planner:
+        assert planner.search_many(queries) == search_sequentially(path_finder, queries)
+        assert planner.search_many([]) == []
+        assert planner.get_planner_info() == {"workers": 2, "batches": 1, "queries": 60}
+
+def test_workers_follow_path_finder_settings():
+    rng = random.Random(1)
+    height, width = 20, 20
+    grid = Grid.from_altitudes(height, width, array('i', [0]) * (height * width))
+    path_finder = PathFinder(grid)
+    queries = [(rng.randrange(height * width), rng.randrange(height * width), 20.0) for _ in range(40)]
+
+    with ParallelPlanner(grid, workers=2, path_finder=path_finder) as planner:
+        assert planner.search_many(queries) == search_sequentially(path_finder, queries)
+
+        # Workers are restarted with the new settings
+        path_finder.configure("octile", 1.0, "deepest")
+        assert planner.search_many(queries) == search_sequentially(path_finder, queries)
+        assert planner.settings == ("octile", 1.0, "deepest", False)
@@ -0,0 +1,101 @@
+from Grid import Grid
+from ParallelPlanner import ParallelPlanner
+from PathFinder import PathFinder
+from RouteCache import RouteCache
+
+from array import array
+import random
+
+import pytest
+
+HEIGHT, WIDTH = 20, 24
+
+@pytest.fixture
+def path_finder():
+    rng = random.Random(0)
+    return PathFinder(Grid.from_altitudes(HEIGHT, WIDTH, array('i', [rng.randint(0, 3000) for _ in range(HEIGHT * WIDTH)])))
+
+def get_search_counters(path_finder, queries):
+    """
+    Cells expanded and entries pushed by a PathFinder like "path_finder", searching every query from scratch.
+    """
+
+    reference = PathFinder(path_finder.grid)
+    reference.configure(path_finder.heuristic, path_finder.heuristic_weight, path_finder.tie_breaking, path_finder.jump_points)
+    for query in queries:
+        reference.search(*query)
+    return reference.total_expansions, reference.total_heap_pushes
+
+def test_least_recently_used_route_is_evicted(path_finder):
+    route_cache = RouteCache(path_finder, maximum_size=2)
+    first, second, third = (0, 100, 1.0), (5, 300, 1.0), (17, 470, 1.0)
+
+    route_cache.search(*first)
+    route_cache.search(*second)
+    route_cache.search(*first)
+    route_cache.search(*third)
+
+    # "first" was used after "second", so "second" made room for "third"
+    assert list(route_cache.routes) == [first + (None,), third + (None,)]
+    assert (route_cache.hits, route_cache.misses) == (1, 3)
+
+    route_cache.search(*second)
+    assert (route_cache.hits, route_cache.misses) == (1, 4)
+    assert len(route_cache.routes) == 2
+
+def test_terrain_change_drops_every_route(path_finder):
+    route_cache = RouteCache(path_finder)
+    route_cache.search(0, 100, 1.0)
+    route_cache.search(0, 100, 1.0)
+    assert (route_cache.hits, route_cache.invalidations) == (1, 0)
+
+    path_finder.grid.set_altitude(3, 3, 42)
+    route_cache.search(0, 100, 1.0)
+    assert route_cache.get_route_cache_info() == {"size": 1, "hits": 1, "misses": 2, "invalidations": 1}
+
+def test_cost_model_change_drops_every_route(path_finder):
+    route_cache = RouteCache(path_finder)
+    route_cache.search(0, 100, 1.0)
+
+    path_finder.configure(heuristic="octile")
+    assert route_cache.search(0, 100, 1.0) == tuple(path_finder.search(0, 100, 1.0))
+    assert route_cache.get_route_cache_info() == {"size": 1, "hits": 0, "misses": 2, "invalidations": 1}
+
+    # Configuring the same settings again keeps them
+    path_finder.configure(heuristic="octile")
+    route_cache.search(0, 100, 1.0)
+    assert route_cache.get_route_cache_info()["invalidations"] == 1
+
+def test_search_counters(path_finder):
+    route_cache = RouteCache(path_finder)
+    queries = [(0, 100, 1.0), (5, 300, 1.0)]
+
+    route_cache.search(*queries[0])
+    assert (route_cache.expansions, route_cache.heap_pushes) == get_search_counters(path_finder, queries[:1])
+    route_cache.search(*queries[0])
+    assert (route_cache.expansions, route_cache.heap_pushes) == (0, 0)
+
+    # A batch reports every search it made, the cached route costing nothing
+    route_cache.search_many(queries)
+    assert (route_cache.expansions, route_cache.heap_pushes) == get_search_counters(path_finder, queries[1:])
+
+@pytest.mark.parametrize("maximum_size", [4096, 1])
+def test_parallel_batch_counters(path_finder, maximum_size):
+    rng = random.Random(1)
+    route_cache = RouteCache(path_finder, maximum_size)
+    queries = [(rng.randrange(HEIGHT * WIDTH), rng.randrange(HEIGHT * WIDTH), 1.0) for _ in range(12)]
+
+    with ParallelPlanner(path_finder.grid, workers=2, chunk_size=5, path_finder=path_finder) as planner:
+        paths = route_cache.search_many(queries, planner)
+        assert paths == [tuple(path) if path is not None else None for path in map(path_finder.search, *zip(*queries))]
+
+        # Routes evicted by the batch itself are searched again here, and counted too
+        expansions, heap_pushes = get_search_counters(path_finder, queries)
+        if maximum_size == 1:
+            evicted = get_search_counters(path_finder, queries[:-1])
+            expansions, heap_pushes = expansions + evicted[0], heap_pushes + evicted[1]
+        assert (route_cache.expansions, route_cache.heap_pushes) == (expansions, heap_pushes)
+
+        if maximum_size > 1:
+            route_cache.search_many(queries, planner)
+            assert (route_cache.expansions, route_cache.heap_pushes) == (0, 0)
@@ -0,0 +1,41 @@
+from Drone import Drone
+from Grid import Grid
+from PathFinder import PathFinder
+from TourPlanner import TourPlanner
+
+from array import array
+from itertools import permutations
+import random
+
+import pytest
+
+@pytest.mark.parametrize("seed", range(4))
+def test_tour_is_close_to_best_order(seed):
+    rng = random.Random(seed)
+    height, width = 20, 20
+    grid = Grid.from_altitudes(height, width, array('i', [rng.randint(0, 3000) for _ in range(height * width)]))
+    tour_planner = TourPlanner(PathFinder(grid))
+    drone = Drone(2000.0, 20.0, 50.0)
+
+    base = rng.randrange(height * width)
+    stops = rng.sample([cell for cell in range(height * width) if cell != base], 6)
+    weights = [rng.uniform(0.5, 3.0) for _ in stops]
+
+    tour = tour_planner.plan(drone, base, stops, weights)
+    assert sorted(tour) == list(range(len(stops)))
+
+    distances, altitude_distances = tour_planner.build_cost_matrix([base] + stops)
+    def cost(order):
+        return tour_planner.evaluate(list(order), distances, altitude_distances, weights, drone)
+
+    best = min(cost(order) for order in permutations(range(len(stops))))
+    assert cost(tour)[0] <= 1.05 * best[0]
+    assert cost(tour) <= cost(range(len(stops)))
+
+def test_short_loads_keep_their_order():
+    grid = Grid.from_altitudes(3, 3, array('i', [0]) * 9)
+    tour_planner = TourPlanner(PathFinder(grid))
+    drone = Drone(2000.0, 20.0, 50.0)
+
+    assert tour_planner.plan(drone, 4, [], []) == []
+    assert tour_planner.plan(drone, 4, [8], [1.0]) == [0]